@@ -1,5 +1,5 @@
 """DNS Science Tracker - Flask Application"""
-from flask import Flask, request, jsonify, render_template, send_from_directory, session, redirect
+from flask import Flask, Response, request, jsonify, render_template, send_from_directory, session, redirect, stream_with_context
 import json
 import os
 import logging
@@ -7,7 +7,7 @@ import psycopg2
 import psycopg2.extras
 from werkzeug.utils import secure_filename
 from database import Database
-from checkers import DomainScanner
+from checkers import DomainScanner, get_resolver_cache_stats
 # from async_scanner import get_async_scanner  # Disabled - using synchronous scanning
 from browser import DataBrowser
 from custom_scanners import CustomScannerManager
@@ -163,6 +163,12 @@ def health():
     return jsonify({'status': 'healthy'}), 200
 
 
+@app.route('/health/dns-cache')
+def health_dns_cache():
+    """Hit/miss counters for the checkers' shared DNS answer cache"""
+    return jsonify(get_resolver_cache_stats()), 200
+
+
 @app.route('/tools')
 def tools_page():
     """DNS Tools page with certificate chain resolver, DNS comparison, etc."""
@@ -2980,7 +2986,7 @@ def get_valuation_history(domain):
 # ============================================================================
 
 # Import IP intelligence engine
-from ip_intelligence import IPIntelligenceEngine
+from ip_intelligence import IPIntelligenceEngine, PrefixDataCache
 
 # Initialize IP intelligence engine
 ip_engine = IPIntelligenceEngine({
@@ -3480,6 +3486,9 @@ def scan_ip_range(cidr):
 
     Query Parameters:
         max_ips: Maximum IPs to scan (default: 256, max: 1024)
+        concurrency: Addresses scanned at once (default: engine setting, max: 64)
+        stream: If true, stream application/x-ndjson: one {"type": "ip", ...}
+            line per address as it completes, then a {"type": "summary", ...} line
 
     Returns:
         JSON with range scan results
@@ -3525,8 +3534,18 @@ def scan_ip_range(cidr):
                     'max_allowed': max_ips
                 }), 400
 
+        concurrency = request.args.get('concurrency', type=int)
+        if concurrency is not None:
+            concurrency = max(1, min(concurrency, 64))
+
+        if request.args.get('stream', 'false').lower() == 'true':
+            return Response(
+                stream_with_context(_stream_range_scan(cidr, max_ips, concurrency)),
+                mimetype='application/x-ndjson'
+            )
+
         # Perform range scan
-        scan_result = ip_engine.scan_ip_range(cidr, max_ips=max_ips)
+        scan_result = ip_engine.scan_ip_range(cidr, max_ips=max_ips, concurrency=concurrency)
 
         if 'error' in scan_result:
             return jsonify(scan_result), 400
@@ -3537,6 +3556,25 @@ def scan_ip_range(cidr):
         return jsonify({'error': str(e), 'cidr': cidr}), 500
 
 
+def _stream_range_scan(cidr: str, max_ips: int, concurrency):
+    """Yield one NDJSON line per scanned address, then a summary line."""
+    prefix_cache = PrefixDataCache(ip_engine)
+    summary = ip_engine.new_range_summary()
+    scanned = 0
+    for scan_result in ip_engine.iter_ip_range(cidr, max_ips, concurrency, prefix_cache):
+        scanned += 1
+        ip_engine.update_range_summary(summary, scan_result)
+        yield json.dumps({'type': 'ip', **scan_result}, default=str) + '\n'
+
+    yield json.dumps({
+        'type': 'summary',
+        'cidr': cidr,
+        'scanned_ips': scanned,
+        'summary': summary,
+        'prefixes': prefix_cache.describe()
+    }, default=str) + '\n'
+
+
 @app.route('/api/asn/<int:asn>', methods=['GET'])
 def get_asn_info(asn):
     """
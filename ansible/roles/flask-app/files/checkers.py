@@ -1,4 +1,6 @@
 """Security checkers for DNS, email, and TLS validation"""
+import asyncio
+import dns.asyncresolver
 import dns.resolver
 import dns.dnssec
 import dns.message
@@ -10,23 +12,41 @@ import requests
 import json
 import re
 import os
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from config import Config
 
 
-def get_resolver():
+# Process-wide resolvers and answer cache, created on first use
+_resolver_lock = threading.Lock()
+_shared_resolver = None
+_shared_async_resolver = None
+_answer_cache = None
+
+
+def get_answer_cache():
     """
-    Get a configured DNS resolver instance.
+    Get the process-wide DNS answer cache shared by every checker.
 
-    Uses environment variables to configure custom DNS resolver (e.g., Unbound):
-    - DNS_RESOLVER: hostname or IP of DNS server (default: system resolver)
-    - DNS_RESOLVER_PORT: port number (default: 53)
+    dnspython's LRUCache is bounded, thread-safe and expires entries by TTL.
+    The resolver also stores NXDOMAIN and NoAnswer responses in it (negative
+    caching, using the SOA minimum TTL).
 
     Returns:
-        dns.resolver.Resolver: Configured resolver instance
+        dns.resolver.LRUCache or None if caching is disabled (DNS_CACHE_SIZE=0)
     """
-    resolver = dns.resolver.Resolver()
+    global _answer_cache
+    if _answer_cache is None and Config.DNS_CACHE_SIZE > 0:
+        with _resolver_lock:
+            if _answer_cache is None:
+                _answer_cache = dns.resolver.LRUCache(max_size=Config.DNS_CACHE_SIZE)
+    return _answer_cache
+
 
-    # Configure custom DNS resolver if specified
+def _configure_resolver(resolver):
+    """Apply DNS_RESOLVER / DNS_RESOLVER_PORT, timeouts and the shared cache"""
     dns_server = os.getenv('DNS_RESOLVER')
     dns_port = int(os.getenv('DNS_RESOLVER_PORT', '53'))
 
@@ -39,8 +59,87 @@ def get_resolver():
     resolver.timeout = Config.DNS_TIMEOUT
     resolver.lifetime = Config.DNS_TIMEOUT
 
+    resolver.cache = get_answer_cache()
     return resolver
 
+
+def get_resolver():
+    """
+    Get the shared, configured DNS resolver instance.
+
+    Uses environment variables to configure custom DNS resolver (e.g., Unbound):
+    - DNS_RESOLVER: hostname or IP of DNS server (default: system resolver)
+    - DNS_RESOLVER_PORT: port number (default: 53)
+
+    The resolver is built once per process (so /etc/resolv.conf and the
+    environment are read once) and answers are cached in get_answer_cache().
+    It must be treated as read-only by callers.
+
+    Returns:
+        dns.resolver.Resolver: Configured resolver instance
+    """
+    global _shared_resolver
+    if _shared_resolver is None:
+        resolver = _configure_resolver(dns.resolver.Resolver())
+        with _resolver_lock:
+            if _shared_resolver is None:
+                _shared_resolver = resolver
+    return _shared_resolver
+
+
+def get_async_resolver():
+    """
+    Get the shared, configured asyncio DNS resolver instance.
+
+    Uses the same DNS_RESOLVER / DNS_RESOLVER_PORT settings and answer cache
+    as get_resolver().
+
+    Returns:
+        dns.asyncresolver.Resolver: Configured resolver instance
+    """
+    global _shared_async_resolver
+    if _shared_async_resolver is None:
+        resolver = _configure_resolver(dns.asyncresolver.Resolver())
+        with _resolver_lock:
+            if _shared_async_resolver is None:
+                _shared_async_resolver = resolver
+    return _shared_async_resolver
+
+
+def reset_resolver():
+    """Drop the shared resolvers and answer cache (e.g. after changing DNS_RESOLVER)"""
+    global _shared_resolver, _shared_async_resolver, _answer_cache
+    with _resolver_lock:
+        _shared_resolver = None
+        _shared_async_resolver = None
+        _answer_cache = None
+
+
+def get_resolver_cache_stats():
+    """
+    Get hit/miss counters for the shared DNS answer cache.
+
+    Returns: dict with enabled, hits, misses, hit_rate, size and max_size
+    """
+    cache = get_answer_cache()
+    if cache is None:
+        return {'enabled': False, 'hits': 0, 'misses': 0, 'hit_rate': 0.0,
+                'size': 0, 'max_size': 0}
+
+    stats = cache.get_statistics_snapshot()
+    lookups = stats.hits + stats.misses
+    with cache.lock:
+        size = len(cache.data)
+
+    return {
+        'enabled': True,
+        'hits': stats.hits,
+        'misses': stats.misses,
+        'hit_rate': round(stats.hits / lookups, 4) if lookups else 0.0,
+        'size': size,
+        'max_size': cache.max_size
+    }
+
 class DNSSECChecker:
     """Check DNSSEC validation for a domain"""
 
@@ -142,13 +241,55 @@ class SPFChecker:
         return result
 
 
+class DKIMSelectorMemory:
+    """Bounded, thread-safe LRU of DKIM selectors previously found per domain"""
+
+    def __init__(self, max_domains=None):
+        self.max_domains = max_domains or Config.DKIM_KNOWN_SELECTORS_MAX
+        self._selectors = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, domain):
+        with self._lock:
+            selectors = self._selectors.get(domain)
+            if selectors is not None:
+                self._selectors.move_to_end(domain)
+            return list(selectors or [])
+
+    def remember(self, domain, selectors):
+        with self._lock:
+            if selectors:
+                self._selectors[domain] = list(selectors)
+                self._selectors.move_to_end(domain)
+                while len(self._selectors) > self.max_domains:
+                    self._selectors.popitem(last=False)
+            else:
+                self._selectors.pop(domain, None)
+
+
 class DKIMChecker:
     """Check DKIM records for a domain"""
 
+    # Selectors found on earlier scans, checked first on rescans
+    known_selectors = DKIMSelectorMemory()
+
     @staticmethod
-    def check(domain):
+    def check(domain, known_selectors=None, stop_at_known=False):
         """
         Check for DKIM records using common selectors.
+
+        All selector TXT queries are fired concurrently under one shared
+        deadline. Selectors found on earlier scans (remembered in-process,
+        plus any passed in from stored results) are queued ahead of the
+        rest of the common selectors, so selectors added since the last
+        scan (rotated keys, new senders) are still found.
+
+        Args:
+            domain: Domain to check
+            known_selectors: Optional selectors from a previous scan of this domain
+            stop_at_known: Skip the sweep of the remaining selectors when a
+                known selector still resolves
+
         Returns: dict with selectors, valid, and details
         """
         result = {
@@ -157,32 +298,83 @@ class DKIMChecker:
             'details': ''
         }
 
+        remembered = DKIMChecker.known_selectors.get(domain)
+        known = list(dict.fromkeys(remembered + list(known_selectors or [])))
+
         found_selectors = []
-        resolver = get_resolver()
+        checked = 0
 
-        for selector in Config.DKIM_SELECTORS:
-            dkim_domain = f"{selector}._domainkey.{domain}"
-            try:
-                txt_records = resolver.resolve(dkim_domain, 'TXT')
-                for rdata in txt_records:
-                    txt_string = b''.join(rdata.strings).decode('utf-8')
-                    if 'v=DKIM1' in txt_string or 'k=' in txt_string:
-                        found_selectors.append(selector)
-                        break
-            except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.exception.Timeout):
-                continue
-            except Exception:
-                continue
+        remaining = [sel for sel in Config.DKIM_SELECTORS if sel not in known]
+
+        try:
+            if stop_at_known and known:
+                found_selectors = DKIMChecker._probe(domain, known)
+                checked = len(known)
+                if not found_selectors:
+                    found_selectors = DKIMChecker._probe(domain, remaining)
+                    checked += len(remaining)
+            else:
+                # One batch, known selectors first so they get the first slots
+                found_selectors = DKIMChecker._probe(domain, known + remaining)
+                checked = len(known) + len(remaining)
+        except Exception as e:
+            result['details'] = f"Error: {str(e)}"
+            return result
+
+        DKIMChecker.known_selectors.remember(domain, found_selectors)
 
         if found_selectors:
             result['selectors'] = found_selectors
             result['valid'] = True
             result['details'] = f"Found DKIM selector(s): {', '.join(found_selectors)}"
         else:
-            result['details'] = f"No DKIM records found (checked {len(Config.DKIM_SELECTORS)} common selectors)"
+            result['details'] = f"No DKIM records found (checked {checked} common selectors)"
 
         return result
 
+    @staticmethod
+    def _probe(domain, selectors):
+        """
+        Query <selector>._domainkey.<domain> TXT for every selector at once.
+
+        Returns: list of selectors with a DKIM record, in input order
+        """
+        if not selectors:
+            return []
+        return asyncio.run(DKIMChecker._probe_async(domain, selectors))
+
+    @staticmethod
+    async def _probe_async(domain, selectors):
+        resolver = get_async_resolver()
+        semaphore = asyncio.Semaphore(Config.DKIM_PROBE_CONCURRENCY)
+
+        async def probe(selector):
+            async with semaphore:
+                try:
+                    txt_records = await resolver.resolve(f"{selector}._domainkey.{domain}", 'TXT')
+                except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.exception.Timeout):
+                    return False
+                except Exception:
+                    return False
+
+            for rdata in txt_records:
+                txt_string = b''.join(rdata.strings).decode('utf-8', errors='replace')
+                if 'v=DKIM1' in txt_string or 'k=' in txt_string:
+                    return True
+            return False
+
+        tasks = {asyncio.ensure_future(probe(sel)): sel for sel in selectors}
+
+        # Shared deadline for the whole batch; returns as soon as every probe is done
+        done, pending = await asyncio.wait(tasks, timeout=Config.DKIM_PROBE_DEADLINE)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        found = {tasks[task] for task in done if not task.cancelled() and task.result()}
+        return [sel for sel in selectors if sel in found]
+
 
 class DMARCChecker:
     """Check DMARC policy for a domain"""
@@ -638,7 +830,13 @@ class SMTPSTARTTLSChecker:
 class DomainScanner:
     """Main scanner that orchestrates all checks"""
 
-    def __init__(self, check_ssl=True):
+    def __init__(self, check_ssl=True, concurrent=None, max_workers=None):
+        """
+        Args:
+            check_ssl: Whether to collect SSL certificates by default
+            concurrent: Run independent checks in parallel (default: Config.SCAN_CONCURRENT)
+            max_workers: Thread pool size for concurrent mode (default: Config.SCAN_CHECK_WORKERS)
+        """
         self.dnssec_checker = DNSSECChecker()
         self.spf_checker = SPFChecker()
         self.dkim_checker = DKIMChecker()
@@ -649,6 +847,11 @@ class DomainScanner:
         self.mta_sts_checker = MTASTSChecker()
         self.smtp_checker = SMTPSTARTTLSChecker()
         self.check_ssl = check_ssl
+        self.concurrent = Config.SCAN_CONCURRENT if concurrent is None else concurrent
+        self.max_workers = max_workers or Config.SCAN_CHECK_WORKERS
+
+        # Shared by all concurrent scans on this scanner, created on first use
+        self._executor = None
 
         # Import SSL checker only if needed (lazy loading)
         if self.check_ssl:
@@ -657,18 +860,80 @@ class DomainScanner:
         else:
             self.ssl_checker = None
 
-    def scan_domain(self, domain, check_ssl=None):
+    def _get_executor(self):
+        """Return the bounded thread pool used for concurrent scans"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='domain-scan'
+            )
+        return self._executor
+
+    def _build_checks(self, domain, should_check_ssl):
+        """Return (name, callable) pairs for every independent check to run"""
+        checks = [
+            ('dnssec', lambda: self.dnssec_checker.check(domain)),
+            ('spf', lambda: self.spf_checker.check(domain)),
+            ('dkim', lambda: self.dkim_checker.check(domain)),
+            ('dmarc', lambda: self.dmarc_checker.check(domain)),
+            ('caa', lambda: self.caa_checker.check(domain)),
+            ('bimi', lambda: self.bimi_checker.check(domain)),
+            # DANE/TLSA (check port 25 for email)
+            ('tlsa', lambda: self.tlsa_checker.check(domain, port=25)),
+            ('mta_sts', lambda: self.mta_sts_checker.check(domain)),
+            ('smtp', lambda: self.smtp_checker.check(domain)),
+        ]
+
+        # SSL Certificates (optional)
+        if should_check_ssl:
+            if not self.ssl_checker:
+                from ssl_checker import SSLCertificateChecker
+                self.ssl_checker = SSLCertificateChecker()
+            checks.append(('ssl', lambda: self.ssl_checker.check_domain(domain)))
+
+        return checks
+
+    @staticmethod
+    def _timed(check):
+        """Run a check and return (result, elapsed milliseconds)"""
+        start = time.time()
+        check_result = check()
+        return check_result, round((time.time() - start) * 1000, 2)
+
+    def _run_checks(self, checks, concurrent):
+        """
+        Run checks sequentially or fanned out on the thread pool.
+
+        Returns: (dict of name -> check result, dict of name -> elapsed ms)
+        """
+        check_results = {}
+        timings = {}
+
+        if concurrent:
+            executor = self._get_executor()
+            futures = [(name, executor.submit(self._timed, check)) for name, check in checks]
+            for name, future in futures:
+                check_results[name], timings[name] = future.result()
+        else:
+            for name, check in checks:
+                check_results[name], timings[name] = self._timed(check)
+
+        return check_results, timings
+
+    def scan_domain(self, domain, check_ssl=None, concurrent=None):
         """
         Perform a complete scan of a domain.
 
         Args:
             domain: Domain to scan
             check_ssl: Override instance setting for SSL checking
+            concurrent: Override instance setting for parallel check execution
 
         Returns: dict with all check results
         """
         # Use parameter override if provided, otherwise use instance setting
         should_check_ssl = check_ssl if check_ssl is not None else self.check_ssl
+        run_concurrent = concurrent if concurrent is not None else self.concurrent
 
         result = {
             'domain': domain,
@@ -677,26 +942,30 @@ class DomainScanner:
         }
 
         try:
+            scan_start = time.time()
+            checks = self._build_checks(domain, should_check_ssl)
+            check_results, timings = self._run_checks(checks, run_concurrent)
+
             # DNSSEC
-            dnssec_result = self.dnssec_checker.check(domain)
+            dnssec_result = check_results['dnssec']
             result['dnssec_enabled'] = dnssec_result['enabled']
             result['dnssec_valid'] = dnssec_result['valid']
             result['dnssec_details'] = dnssec_result['details']
 
             # SPF
-            spf_result = self.spf_checker.check(domain)
+            spf_result = check_results['spf']
             result['spf_record'] = spf_result['record']
             result['spf_valid'] = spf_result['valid']
             result['spf_details'] = spf_result['details']
 
             # DKIM
-            dkim_result = self.dkim_checker.check(domain)
+            dkim_result = check_results['dkim']
             result['dkim_selectors'] = dkim_result['selectors']
             result['dkim_valid'] = dkim_result['valid']
             result['dkim_details'] = dkim_result['details']
 
             # DMARC
-            dmarc_result = self.dmarc_checker.check(domain)
+            dmarc_result = check_results['dmarc']
             result['dmarc_enabled'] = dmarc_result['enabled']
             result['dmarc_policy'] = dmarc_result['policy']
             result['dmarc_subdomain_policy'] = dmarc_result['subdomain_policy']
@@ -705,49 +974,50 @@ class DomainScanner:
             result['dmarc_details'] = dmarc_result['details']
 
             # CAA
-            caa_result = self.caa_checker.check(domain)
+            caa_result = check_results['caa']
             result['caa_enabled'] = caa_result['enabled']
             result['caa_records'] = json.dumps(caa_result['records'])
             result['caa_details'] = caa_result['details']
 
             # BIMI
-            bimi_result = self.bimi_checker.check(domain)
+            bimi_result = check_results['bimi']
             result['bimi_enabled'] = bimi_result['enabled']
             result['bimi_record'] = bimi_result['record']
             result['bimi_logo_url'] = bimi_result['logo_url']
             result['bimi_details'] = bimi_result['details']
 
-            # DANE/TLSA (check port 25 for email)
-            tlsa_result = self.tlsa_checker.check(domain, port=25)
+            # DANE/TLSA
+            tlsa_result = check_results['tlsa']
             result['tlsa_enabled'] = tlsa_result['enabled']
             result['tlsa_records'] = json.dumps(tlsa_result['records'])
             result['tlsa_details'] = tlsa_result['details']
 
             # MTA-STS
-            mta_sts_result = self.mta_sts_checker.check(domain)
+            mta_sts_result = check_results['mta_sts']
             result['mta_sts_enabled'] = mta_sts_result['enabled']
             result['mta_sts_policy'] = mta_sts_result['policy']
             result['mta_sts_details'] = mta_sts_result['details']
 
             # SMTP STARTTLS
-            smtp_result = self.smtp_checker.check(domain)
+            smtp_result = check_results['smtp']
             result['smtp_starttls_25'] = smtp_result['starttls_25']
             result['smtp_starttls_587'] = smtp_result['starttls_587']
             result['smtp_details'] = smtp_result['details']
 
             # SSL Certificates (optional)
-            if should_check_ssl:
-                if not self.ssl_checker:
-                    from ssl_checker import SSLCertificateChecker
-                    self.ssl_checker = SSLCertificateChecker()
-
-                ssl_result = self.ssl_checker.check_domain(domain)
+            if 'ssl' in check_results:
+                ssl_result = check_results['ssl']
                 result['ssl_certificates'] = ssl_result.get('certificates', [])
                 result['ssl_ports_checked'] = ssl_result.get('ports_checked', [])
                 result['ssl_ports_with_ssl'] = ssl_result.get('ports_with_ssl', [])
                 result['ssl_has_expired'] = ssl_result.get('has_expired_certs', False)
                 result['ssl_expiring_soon'] = ssl_result.get('expiring_soon', [])
 
+            # Per-check wall-clock timings (ms)
+            result['check_timings'] = timings
+            result['scan_mode'] = 'concurrent' if run_concurrent else 'sequential'
+            result['scan_duration_ms'] = round((time.time() - scan_start) * 1000, 2)
+
             # Calculate Security Score (0-100)
             result['security_score'] = self._calculate_security_score(result)
             result['security_grade'] = self._score_to_grade(result['security_score'])
@@ -159,12 +159,15 @@ def main():
         epilog='Examples:\n'
                '  %(prog)s scan example.com\n'
                '  %(prog)s import domains.txt\n'
-               '  %(prog)s rescan --days 7\n'
+               '  %(prog)s --concurrent rescan --days 7\n'
                '  %(prog)s export results.json\n'
                '  %(prog)s stats\n',
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
 
+    parser.add_argument('--concurrent', action='store_true',
+                        help='Run each domain\'s checks in parallel (default: SCAN_CONCURRENT env)')
+
     subparsers = parser.add_subparsers(dest='command', help='Command to execute')
 
     # Scan command
@@ -207,7 +210,7 @@ def main():
 
     # Initialize
     db = Database()
-    scanner = DomainScanner()
+    scanner = DomainScanner(concurrent=True if args.concurrent else None)
 
     # Execute command
     if args.command == 'scan':
@@ -66,6 +66,13 @@ class Config:
     DEFAULT_DNS_TIMEOUT = 5
     MAX_CONCURRENT_SCANS = 10
 
+    # Shared resolver answer cache (entries; 0 disables caching)
+    DNS_CACHE_SIZE = int(os.getenv('DNS_CACHE_SIZE', '50000'))
+
+    # Run a domain's independent checks (DNSSEC, SPF, DKIM, ... SSL) in parallel
+    SCAN_CONCURRENT = os.getenv('SCAN_CONCURRENT', 'False').lower() == 'true'
+    SCAN_CHECK_WORKERS = int(os.getenv('SCAN_CHECK_WORKERS', '16'))
+
     # Common DKIM selectors to check (expanded brute-force list)
     DKIM_SELECTORS = [
         # Generic/Default
@@ -119,10 +126,44 @@ class Config:
         'prod', 'production', 'live', 'primary', 'main'
     ]
 
+    # DKIM selector probing: all selectors are queried concurrently under one deadline
+    DKIM_PROBE_CONCURRENCY = int(os.getenv('DKIM_PROBE_CONCURRENCY', '64'))
+    DKIM_PROBE_DEADLINE = float(os.getenv('DKIM_PROBE_DEADLINE', str(DNS_TIMEOUT)))
+    DKIM_KNOWN_SELECTORS_MAX = int(os.getenv('DKIM_KNOWN_SELECTORS_MAX', '100000'))
+
     # SSL/TLS settings
     SSL_VERIFY = True
     SSL_TIMEOUT = 10
 
+    # SSL port sweep: ports are probed in parallel, closed/filtered ports are
+    # abandoned after SSL_PROBE_TIMEOUT, the whole sweep ends at SSL_SWEEP_DEADLINE
+    SSL_CONCURRENT_SWEEP = os.getenv('SSL_CONCURRENT_SWEEP', 'True').lower() == 'true'
+    SSL_PROBE_TIMEOUT = float(os.getenv('SSL_PROBE_TIMEOUT', '3'))
+    SSL_SWEEP_DEADLINE = float(os.getenv('SSL_SWEEP_DEADLINE', '15'))
+
+    # Enrichment daemon pipeline: long-lived workers fed from a bounded prefetch
+    # queue, results written in batches by a single writer stage
+    ENRICHMENT_PREFETCH = int(os.getenv('ENRICHMENT_PREFETCH', '0'))  # 0 = 2x workers
+    ENRICHMENT_WRITE_BATCH = int(os.getenv('ENRICHMENT_WRITE_BATCH', '100'))
+    ENRICHMENT_FLUSH_INTERVAL = float(os.getenv('ENRICHMENT_FLUSH_INTERVAL', '2'))
+    ENRICHMENT_METRICS_INTERVAL = float(os.getenv('ENRICHMENT_METRICS_INTERVAL', '30'))
+    # Claimed-but-unsaved domains return to their queue after this many seconds
+    ENRICHMENT_VISIBILITY_TIMEOUT = float(os.getenv('ENRICHMENT_VISIBILITY_TIMEOUT', '300'))
+
+    # Domain discovery ingestion: domains are queued and stored in batches
+    DISCOVERY_WRITE_BATCH = int(os.getenv('DISCOVERY_WRITE_BATCH', '10000'))
+    DISCOVERY_FLUSH_INTERVAL = float(os.getenv('DISCOVERY_FLUSH_INTERVAL', '5'))
+    # Discovery dedup: scalable Bloom filter persisted across restarts; keys are
+    # forgotten after one to two windows so domains are periodically re-queued
+    DISCOVERY_DEDUP_PATH = os.getenv('DISCOVERY_DEDUP_PATH', '/var/lib/dnsscience/discovery_dedup.bloom')
+    DISCOVERY_DEDUP_CAPACITY = int(os.getenv('DISCOVERY_DEDUP_CAPACITY', '10000000'))
+    DISCOVERY_DEDUP_ERROR_RATE = float(os.getenv('DISCOVERY_DEDUP_ERROR_RATE', '0.001'))
+    DISCOVERY_DEDUP_WINDOW_HOURS = float(os.getenv('DISCOVERY_DEDUP_WINDOW_HOURS', '168'))  # 0 = never
+    # Zone snapshots: downloaded <tld>.zone[.gz] files are diffed against the
+    # previous snapshot index and only the delta is queued
+    DISCOVERY_ZONE_DIR = os.getenv('DISCOVERY_ZONE_DIR', '/var/lib/dnsscience/zonefiles')
+    DISCOVERY_ZONE_SNAPSHOT_DIR = os.getenv('DISCOVERY_ZONE_SNAPSHOT_DIR', '/var/lib/dnsscience/zone_snapshots')
+
     # SMTP settings
     SMTP_TIMEOUT = 10
 
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+DNS Science - Bloom Filters
+
+Compact probabilistic set membership for deduplicating discovered domains:
+
+- BloomFilter: fixed-capacity filter sized for a target false-positive rate
+- ScalableBloomFilter: grows by adding filters with tightening error rates,
+  so the overall false-positive rate stays bounded as the set grows
+- DedupFilter: two rotating ScalableBloomFilter generations (optional time
+  window) with atomic save/load so restarts keep what was already seen
+"""
+
+import os
+import json
+import math
+import time
+import struct
+import hashlib
+from typing import List, Optional
+
+FILE_MAGIC = b'DNSBLOOM1'
+
+
+def key_hashes(key: str):
+    """Two 64-bit hashes of a key; computed once and shared by every filter checked"""
+    h1, h2 = struct.unpack('<QQ', hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest())
+    return h1, h2 | 1  # Odd step so all indexes differ
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over one blake2b digest"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Initialize bloom filter
+
+        Args:
+            capacity: Number of items the filter is sized for
+            error_rate: Target false-positive rate at capacity
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def add(self, key: str) -> bool:
+        """
+        Add a key
+
+        Returns:
+            True if the key was not (probably) present before
+        """
+        return self.add_hashed(*key_hashes(key))
+
+    def add_hashed(self, h1: int, h2: int) -> bool:
+        """add() for a key already hashed with key_hashes()"""
+        added = False
+        bits, num_bits = self.bits, self.num_bits
+        for i in range(self.num_hashes):
+            index = (h1 + i * h2) % num_bits
+            byte, mask = index >> 3, 1 << (index & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                added = True
+
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, key: str) -> bool:
+        return self.contains_hashed(*key_hashes(key))
+
+    def contains_hashed(self, h1: int, h2: int) -> bool:
+        """Membership test for a key already hashed with key_hashes()"""
+        bits, num_bits = self.bits, self.num_bits
+        for i in range(self.num_hashes):
+            index = (h1 + i * h2) % num_bits
+            if not bits[index >> 3] & (1 << (index & 7)):
+                return False
+        return True
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def is_full(self) -> bool:
+        return self.count >= self.capacity
+
+    @property
+    def fill_ratio(self) -> float:
+        """Estimated share of bits set (from the item count, without scanning the bit array)"""
+        return 1 - math.exp(-self.num_hashes * self.count / self.num_bits)
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Estimated current false-positive rate"""
+        return self.fill_ratio ** self.num_hashes
+
+
+class ScalableBloomFilter:
+    """Bloom filter that grows without exceeding its overall false-positive bound"""
+
+    def __init__(self, initial_capacity: int = 1000000, error_rate: float = 0.001,
+                 growth: int = 2, tightening: float = 0.5):
+        """
+        Initialize scalable bloom filter
+
+        Args:
+            initial_capacity: Capacity of the first filter
+            error_rate: Overall false-positive bound
+            growth: Capacity multiplier for each new filter
+            tightening: Error-rate multiplier for each new filter
+        """
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.filters: List[BloomFilter] = []
+
+    def _new_filter(self) -> BloomFilter:
+        n = len(self.filters)
+        return BloomFilter(
+            self.initial_capacity * self.growth ** n,
+            # Geometric series keeps the sum of error rates under error_rate
+            self.error_rate * (1 - self.tightening) * self.tightening ** n
+        )
+
+    def add(self, key: str) -> bool:
+        """
+        Add a key
+
+        Returns:
+            True if the key was not (probably) present before
+        """
+        return self.add_hashed(*key_hashes(key))
+
+    def add_hashed(self, h1: int, h2: int) -> bool:
+        """add() for a key already hashed with key_hashes()"""
+        if self.contains_hashed(h1, h2):
+            return False
+
+        if not self.filters or self.filters[-1].is_full:
+            self.filters.append(self._new_filter())
+        return self.filters[-1].add_hashed(h1, h2)
+
+    def __contains__(self, key: str) -> bool:
+        return self.contains_hashed(*key_hashes(key))
+
+    def contains_hashed(self, h1: int, h2: int) -> bool:
+        # Newest filter first: recent keys are the most likely repeats
+        return any(bloom.contains_hashed(h1, h2) for bloom in reversed(self.filters))
+
+    def __len__(self):
+        return sum(len(bloom) for bloom in self.filters)
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Estimated current false-positive rate across all filters"""
+        miss = 1.0
+        for bloom in self.filters:
+            miss *= 1 - bloom.false_positive_rate
+        return 1 - miss
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(len(bloom.bits) for bloom in self.filters)
+
+
+class DedupFilter:
+    """
+    Rotating, persistable dedup filter
+
+    Keys are remembered for between one and two windows: lookups check the
+    current and previous generation, and when the window elapses the
+    previous generation is dropped. A key is not refreshed by being seen
+    again, so keys that keep turning up are still reported as new once every
+    one to two windows. A window of None or 0 never rotates.
+    """
+
+    def __init__(self, initial_capacity: int = 1000000, error_rate: float = 0.001,
+                 window_seconds: Optional[float] = None):
+        """
+        Initialize dedup filter
+
+        Args:
+            initial_capacity: Initial capacity of each generation
+            error_rate: False-positive bound of each generation
+            window_seconds: Rotation window (None or 0 to never forget keys)
+        """
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.window_seconds = window_seconds
+
+        self.current = ScalableBloomFilter(initial_capacity, error_rate)
+        self.previous: Optional[ScalableBloomFilter] = None
+        self.generation_started = time.time()
+
+    def _maybe_rotate(self):
+        if self.window_seconds and time.time() - self.generation_started >= self.window_seconds:
+            self.previous = self.current
+            self.current = ScalableBloomFilter(self.initial_capacity, self.error_rate)
+            self.generation_started = time.time()
+
+    def add(self, key: str) -> bool:
+        """
+        Add a key
+
+        Returns:
+            True if the key was not (probably) seen within the window
+        """
+        self._maybe_rotate()
+        h1, h2 = key_hashes(key)
+
+        if self.previous is not None and self.previous.contains_hashed(h1, h2):
+            return False
+        return self.current.add_hashed(h1, h2)
+
+    def __contains__(self, key: str) -> bool:
+        h1, h2 = key_hashes(key)
+        return (self.current.contains_hashed(h1, h2) or
+                (self.previous is not None and self.previous.contains_hashed(h1, h2)))
+
+    def __len__(self):
+        return len(self.current)
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Estimated probability that an unseen key is reported as seen"""
+        miss = 1 - self.current.false_positive_rate
+        if self.previous is not None:
+            miss *= 1 - self.previous.false_positive_rate
+        return 1 - miss
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.current.memory_bytes + (self.previous.memory_bytes if self.previous else 0)
+
+    def save(self, path: str):
+        """Atomically write the filter to disk"""
+        generations = [('current', self.current)]
+        if self.previous is not None:
+            generations.append(('previous', self.previous))
+
+        header = {
+            'initial_capacity': self.initial_capacity,
+            'error_rate': self.error_rate,
+            'window_seconds': self.window_seconds,
+            'generation_started': self.generation_started,
+            'generations': {
+                name: {
+                    'growth': scalable.growth,
+                    'tightening': scalable.tightening,
+                    'filters': [
+                        {'capacity': bloom.capacity, 'error_rate': bloom.error_rate, 'count': bloom.count}
+                        for bloom in scalable.filters
+                    ]
+                }
+                for name, scalable in generations
+            }
+        }
+        header_bytes = json.dumps(header).encode('utf-8')
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(FILE_MAGIC)
+            f.write(struct.pack('<I', len(header_bytes)))
+            f.write(header_bytes)
+            for _, scalable in generations:
+                for bloom in scalable.filters:
+                    f.write(bloom.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, window_seconds: Optional[float] = None) -> 'DedupFilter':
+        """
+        Read a filter written by save()
+
+        Args:
+            path: File to read
+            window_seconds: Rotation window to use from now on (0 disables rotation,
+                None keeps the saved one)
+        """
+        with open(path, 'rb') as f:
+            if f.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                raise ValueError(f"{path} is not a saved dedup filter")
+            header_len = struct.unpack('<I', f.read(4))[0]
+            header = json.loads(f.read(header_len).decode('utf-8'))
+
+            dedup = cls(
+                header['initial_capacity'],
+                header['error_rate'],
+                window_seconds if window_seconds is not None else header['window_seconds']
+            )
+            dedup.generation_started = header['generation_started']
+
+            for name in ('current', 'previous'):
+                spec = header['generations'].get(name)
+                if spec is None:
+                    continue
+
+                scalable = ScalableBloomFilter(
+                    header['initial_capacity'], header['error_rate'], spec['growth'], spec['tightening']
+                )
+                for bloom_spec in spec['filters']:
+                    bloom = BloomFilter(bloom_spec['capacity'], bloom_spec['error_rate'])
+                    bloom.count = bloom_spec['count']
+                    data = f.read(len(bloom.bits))
+                    if len(data) != len(bloom.bits):
+                        raise ValueError(f"{path} is truncated")
+                    bloom.bits[:] = data
+                    scalable.filters.append(bloom)
+                setattr(dedup, name, scalable)
+
+        return dedup
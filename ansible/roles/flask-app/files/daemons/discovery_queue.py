@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+DNS Science - Discovery Queue
+
+Reliable consumer side of the discovery_queue:priority_N sorted sets.
+
+Items are claimed in batches by a server-side Lua script, so one round-trip
+atomically takes up to N items across all priority levels in priority (then
+FIFO) order. Claimed items move to a processing set with a visibility
+deadline; consumers ack them once their results are saved. Items whose
+deadline passes (the worker or node died) are moved back to their original
+queue with their original score, so several enrichment nodes can share one
+queue without duplicate or lost work.
+"""
+
+import time
+from typing import List, Optional, Tuple
+
+QUEUE_PREFIX = 'discovery_queue:priority_'
+PROCESSING_KEY = 'discovery_queue:processing'
+CLAIMS_KEY = 'discovery_queue:claims'
+
+# KEYS: processing zset, claims hash, priority queues (highest priority first)
+# ARGV: max items, visibility deadline
+# Returns a flat list of payloads
+CLAIM_SCRIPT = """
+local remaining = tonumber(ARGV[1])
+local deadline = ARGV[2]
+local claimed = {}
+for i = 3, #KEYS do
+    if remaining <= 0 then break end
+    local items = redis.call('ZRANGE', KEYS[i], 0, remaining - 1, 'WITHSCORES')
+    for j = 1, #items, 2 do
+        local payload = items[j]
+        redis.call('ZREM', KEYS[i], payload)
+        redis.call('ZADD', KEYS[1], deadline, payload)
+        redis.call('HSET', KEYS[2], payload, KEYS[i] .. '|' .. items[j + 1])
+        claimed[#claimed + 1] = payload
+        remaining = remaining - 1
+    end
+end
+return claimed
+"""
+
+# KEYS: processing zset, claims hash
+# ARGV: now, max items
+# Returns the number of items requeued
+REQUEUE_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, payload in ipairs(expired) do
+    local origin = redis.call('HGET', KEYS[2], payload)
+    if origin then
+        local sep = string.find(origin, '|', 1, true)
+        redis.call('ZADD', string.sub(origin, 1, sep - 1), string.sub(origin, sep + 1), payload)
+    end
+    redis.call('ZREM', KEYS[1], payload)
+    redis.call('HDEL', KEYS[2], payload)
+end
+return #expired
+"""
+
+
+class DiscoveryQueue:
+    """Batched, at-least-once consumer for the discovery priority queues"""
+
+    def __init__(self, redis_client, visibility_timeout: float = 300, priorities: int = 10):
+        """
+        Initialize the queue consumer
+
+        Args:
+            redis_client: Redis client (decode_responses=True)
+            visibility_timeout: Seconds a claimed item may stay unacked before it is requeued
+            priorities: Number of priority levels (1 is highest)
+        """
+        self.redis_client = redis_client
+        self.visibility_timeout = visibility_timeout
+        self.queue_names = [f"{QUEUE_PREFIX}{priority}" for priority in range(1, priorities + 1)]
+
+        self._claim = redis_client.register_script(CLAIM_SCRIPT)
+        self._requeue = redis_client.register_script(REQUEUE_SCRIPT)
+
+    def claim(self, count: int, visibility_timeout: Optional[float] = None) -> List[str]:
+        """
+        Atomically claim up to count items across all priority levels
+
+        Args:
+            count: Maximum number of items to claim
+            visibility_timeout: Override of the default visibility timeout
+
+        Returns:
+            Raw JSON payloads in priority order (ack each once processed)
+        """
+        if count <= 0:
+            return []
+
+        deadline = time.time() + (visibility_timeout or self.visibility_timeout)
+        return self._claim(
+            keys=[PROCESSING_KEY, CLAIMS_KEY] + self.queue_names,
+            args=[count, deadline]
+        )
+
+    def ack(self, payloads: List[str]):
+        """Mark claimed items as done"""
+        if not payloads:
+            return
+
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.zrem(PROCESSING_KEY, *payloads)
+        pipe.hdel(CLAIMS_KEY, *payloads)
+        pipe.execute()
+
+    def requeue_expired(self, limit: int = 1000) -> int:
+        """
+        Return items whose visibility deadline passed to their original queue
+
+        Returns:
+            Number of items requeued
+        """
+        return int(self._requeue(keys=[PROCESSING_KEY, CLAIMS_KEY], args=[time.time(), limit]))
+
+    def depths(self) -> Tuple[int, int]:
+        """
+        Returns:
+            (items waiting across all priorities, items claimed but not acked)
+        """
+        pipe = self.redis_client.pipeline(transaction=False)
+        for queue_name in self.queue_names:
+            pipe.zcard(queue_name)
+        pipe.zcard(PROCESSING_KEY)
+        counts = pipe.execute()
+        return sum(counts[:-1]), counts[-1]
@@ -15,6 +15,7 @@ Queue Management: Redis-based with 10M domain buffer
 """
 
 import os
+import io
 import sys
 import json
 import time
@@ -34,6 +35,8 @@ import re
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import Config
+from bloom_filter import DedupFilter
+from zonefile_downloader import ZoneSnapshotStore
 
 # Configure logging
 logging.basicConfig(
@@ -81,6 +84,151 @@ class RateLimiter:
             time.sleep(0.1)
 
 
+class DiscoveryBatchWriter:
+    """
+    Buffered ingestion stage for discovered domains
+
+    Accumulates domains and flushes them in large batches: one pipelined
+    round-trip of ZADDs per batch, and one COPY into a temporary staging
+    table followed by a single set-based upsert into discovered_domains.
+    """
+
+    UPSERT_SQL = """
+        INSERT INTO discovered_domains
+            (domain_name, tld, source, discovered_at, queued_for_enrichment, times_seen)
+        SELECT domain_name, MIN(tld), (ARRAY_AGG(source ORDER BY seq))[1], NOW(), TRUE, COUNT(*)
+        FROM discovery_staging
+        GROUP BY domain_name
+        ON CONFLICT (domain_name)
+        DO UPDATE SET
+            last_seen = NOW(),
+            times_seen = discovered_domains.times_seen + EXCLUDED.times_seen
+    """
+
+    def __init__(self, db_conn, redis_client, batch_size: int = 10000, flush_interval: float = 5.0):
+        """
+        Initialize batch writer
+
+        Args:
+            db_conn: PostgreSQL connection
+            redis_client: Redis client for the discovery priority queues
+            batch_size: Flush once this many domains are buffered
+            flush_interval: Flush buffered domains at least this often (seconds)
+        """
+        self.db_conn = db_conn
+        self.redis_client = redis_client
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.buffer = []
+        self.last_flush = time.monotonic()
+
+        self.stats = {
+            'rows_written': 0,
+            'rows_failed': 0,
+            'batches': 0,
+            'write_seconds': 0.0,
+            'errors': 0
+        }
+
+    def add(self, domain: str, tld: str, source: str, priority: int):
+        """Buffer one discovered domain, flushing when the batch is full or stale"""
+        self.buffer.append((domain, tld, source, priority, datetime.utcnow().isoformat(), time.time()))
+
+        if (len(self.buffer) >= self.batch_size or
+                time.monotonic() - self.last_flush >= self.flush_interval):
+            self.flush()
+
+    @staticmethod
+    def _copy_field(value: str) -> str:
+        """Escape a value for COPY text format"""
+        return value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+    def _queue_batch(self, batch: List[tuple]):
+        """Add the batch to the Redis priority queues in one pipelined round-trip"""
+        by_queue: Dict[str, Dict[str, float]] = {}
+        for domain, _, source, priority, discovered_at, score in batch:
+            domain_data = {
+                'domain': domain,
+                'source': source,
+                'discovered_at': discovered_at,
+                'priority': priority
+            }
+            by_queue.setdefault(f"discovery_queue:priority_{priority}", {})[json.dumps(domain_data)] = score
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        for queue_name, members in by_queue.items():
+            pipe.zadd(queue_name, members)
+        pipe.execute()
+
+    def _store_batch(self, batch: List[tuple]):
+        """COPY the batch into a staging table and upsert it in one statement"""
+        buf = io.StringIO()
+        for seq, (domain, tld, source, _, _, _) in enumerate(batch):
+            buf.write(f"{seq}\t{self._copy_field(domain)}\t{self._copy_field(tld)}\t{self._copy_field(source)}\n")
+        buf.seek(0)
+
+        with self.db_conn.cursor() as cur:
+            cur.execute("""
+                CREATE TEMP TABLE discovery_staging (
+                    seq INTEGER,
+                    domain_name VARCHAR(255),
+                    tld VARCHAR(63),
+                    source VARCHAR(100)
+                ) ON COMMIT DROP
+            """)
+            cur.copy_expert("COPY discovery_staging (seq, domain_name, tld, source) FROM STDIN", buf)
+            cur.execute(self.UPSERT_SQL)
+        self.db_conn.commit()
+
+    def flush(self) -> int:
+        """
+        Write all buffered domains
+
+        Returns:
+            Number of domains stored (0 if the batch failed)
+        """
+        batch, self.buffer = self.buffer, []
+        self.last_flush = time.monotonic()
+        if not batch:
+            return 0
+
+        start = time.monotonic()
+
+        try:
+            self._store_batch(batch)
+        except Exception as e:
+            self.db_conn.rollback()
+            self.stats['errors'] += 1
+            self.stats['rows_failed'] += len(batch)
+            logger.error(f"Failed to store batch of {len(batch):,} domains "
+                         f"after {time.monotonic() - start:.2f}s: {e}")
+            return 0
+
+        # Queue for enrichment only once the domains are in discovered_domains
+        try:
+            self._queue_batch(batch)
+        except Exception as e:
+            logger.error(f"Error queueing batch of {len(batch)} domains: {e}")
+            self.stats['errors'] += 1
+
+        elapsed = time.monotonic() - start
+        self.stats['rows_written'] += len(batch)
+        self.stats['batches'] += 1
+        self.stats['write_seconds'] += elapsed
+
+        logger.info(f"Flushed {len(batch):,} domains in {elapsed:.2f}s "
+                    f"({len(batch) / elapsed if elapsed > 0 else 0:,.0f} rows/sec)")
+        return len(batch)
+
+    @property
+    def rows_per_sec(self) -> float:
+        """Average write throughput across all flushes"""
+        if not self.stats['write_seconds']:
+            return 0.0
+        return self.stats['rows_written'] / self.stats['write_seconds']
+
+
 class DomainDiscoveryDaemon:
     """
     Internet-scale domain discovery daemon
@@ -134,9 +282,48 @@ class DomainDiscoveryDaemon:
             r'^(?:[a-zA-Z0-9](?:[a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}$'
         )
 
-        # Cache for already discovered domains (in-memory bloom filter alternative)
-        self.discovered_cache = set()
-        self.cache_max_size = 1000000  # Keep last 1M domains in cache
+        # Buffered writer for the discovery queues and discovered_domains table
+        self.writer = DiscoveryBatchWriter(
+            self.db_conn,
+            self.redis_client,
+            batch_size=Config.DISCOVERY_WRITE_BATCH,
+            flush_interval=Config.DISCOVERY_FLUSH_INTERVAL
+        )
+
+        # Probabilistic dedup of already discovered "domain:source" keys,
+        # persisted so restarts don't re-queue everything
+        self.dedup_path = Config.DISCOVERY_DEDUP_PATH
+        self.discovered_cache = self._load_dedup_filter()
+
+    def _load_dedup_filter(self) -> DedupFilter:
+        """Load the persisted dedup filter, or start an empty one"""
+        # 0 disables rotation (and overrides a window saved with the filter)
+        window = Config.DISCOVERY_DEDUP_WINDOW_HOURS * 3600
+
+        if self.dedup_path and os.path.exists(self.dedup_path):
+            try:
+                dedup = DedupFilter.load(self.dedup_path, window_seconds=window)
+                logger.info(f"Loaded dedup filter from {self.dedup_path}: ~{len(dedup):,} keys, "
+                            f"FP rate {dedup.false_positive_rate:.5f}")
+                return dedup
+            except Exception as e:
+                logger.error(f"Could not load dedup filter {self.dedup_path}: {e}")
+
+        return DedupFilter(
+            initial_capacity=Config.DISCOVERY_DEDUP_CAPACITY,
+            error_rate=Config.DISCOVERY_DEDUP_ERROR_RATE,
+            window_seconds=window
+        )
+
+    def save_dedup_filter(self):
+        """Persist the dedup filter to disk"""
+        if not self.dedup_path:
+            return
+
+        try:
+            self.discovered_cache.save(self.dedup_path)
+        except Exception as e:
+            logger.error(f"Could not save dedup filter {self.dedup_path}: {e}")
 
     def is_valid_domain(self, domain: str) -> bool:
         """
@@ -163,57 +350,29 @@ class DomainDiscoveryDaemon:
             return parts[-1].lower()
         return ''
 
-    def queue_domain(self, domain: str, source: str, priority: int = 5):
+    def queue_domain(self, domain: str, source: str, priority: int = 5, dedup: bool = True):
         """
         Queue domain for enrichment
 
+        Domains are buffered; call flush_queued() to write out the remainder.
+
         Args:
             domain: Domain name
             source: Discovery source
             priority: Priority level (1-10, lower is higher priority)
+            dedup: Skip domains already seen from this source (off for exact deltas)
         """
         # Check cache to avoid duplicates
-        domain_key = f"{domain}:{source}"
-        if domain_key in self.discovered_cache:
+        if not self.discovered_cache.add(f"{domain}:{source}") and dedup:
             return
 
-        # Add to cache
-        self.discovered_cache.add(domain_key)
-        if len(self.discovered_cache) > self.cache_max_size:
-            # Clear 10% of cache when full
-            to_remove = list(self.discovered_cache)[:100000]
-            for key in to_remove:
-                self.discovered_cache.remove(key)
-
-        # Queue domain for enrichment
-        domain_data = {
-            'domain': domain,
-            'source': source,
-            'discovered_at': datetime.utcnow().isoformat(),
-            'priority': priority
-        }
-
-        # Use sorted sets for priority queue
-        queue_name = f"discovery_queue:priority_{priority}"
-        self.redis_client.zadd(queue_name, {json.dumps(domain_data): time.time()})
-
+        # Queue domain for enrichment and persist it (buffered, written in batches)
+        self.writer.add(domain, self.extract_tld(domain), source, priority)
         self.stats['domains_queued'] += 1
 
-        # Also store in database for persistence
-        try:
-            with self.db_conn.cursor() as cur:
-                cur.execute("""
-                    INSERT INTO discovered_domains (domain_name, tld, source, discovered_at, queued_for_enrichment)
-                    VALUES (%s, %s, %s, NOW(), TRUE)
-                    ON CONFLICT (domain_name)
-                    DO UPDATE SET
-                        last_seen = NOW(),
-                        times_seen = discovered_domains.times_seen + 1
-                """, (domain, self.extract_tld(domain), source))
-            self.db_conn.commit()
-        except Exception as e:
-            logger.error(f"Error storing domain {domain}: {e}")
-            self.db_conn.rollback()
+    def flush_queued(self) -> int:
+        """Write out domains buffered by queue_domain()"""
+        return self.writer.flush()
 
     def fetch_tranco_list(self, top_n: int = 1000000):
         """
@@ -547,6 +706,65 @@ class DomainDiscoveryDaemon:
 
         logger.warning(f"Zone file access not configured for .{tld}")
 
+    def process_zone_snapshots(self):
+        """
+        Diff new zone files against their previous snapshot and queue the delta
+
+        A zone file is processed when it is newer than its TLD's snapshot
+        index. Added delegations and delegations whose nameservers changed
+        are queued; removed delegations are only counted.
+        """
+        zone_dir = Config.DISCOVERY_ZONE_DIR
+        if not zone_dir or not os.path.isdir(zone_dir):
+            logger.info(f"No zone file directory at {zone_dir}, skipping zone snapshots")
+            return
+
+        store = ZoneSnapshotStore(Config.DISCOVERY_ZONE_SNAPSHOT_DIR)
+
+        for name in sorted(os.listdir(zone_dir)):
+            if '.zone' not in name:
+                continue
+
+            zone_file = os.path.join(zone_dir, name)
+            tld = name.split('.zone', 1)[0].lower()
+            index_file = store.index_path(tld)
+            if index_file.exists() and os.path.getmtime(zone_file) <= os.path.getmtime(index_file):
+                continue
+
+            try:
+                delta = store.update(tld, zone_file)
+                queued = self.queue_zone_delta(delta['delta_file'])
+
+                self.stats['sources_processed'][f"zone_{tld}"] = queued
+                self.stats['domains_discovered'] += delta['added']
+                logger.info(f"✓ Queued {queued:,} domains from .{tld} zone delta "
+                            f"({delta['removed']:,} delegations removed)")
+
+            except Exception as e:
+                logger.error(f"Error processing .{tld} zone snapshot: {e}")
+                self.stats['errors'] += 1
+
+    def queue_zone_delta(self, delta_file: str) -> int:
+        """
+        Queue added and NS-changed domains from a zone delta file
+
+        Returns:
+            Number of domains queued
+        """
+        queued = 0
+        for change, domain, _, _ in ZoneSnapshotStore.iter_delta(delta_file):
+            if change == 'removed' or not self.is_valid_domain(domain):
+                continue
+
+            # Deltas are exact, so repeat NS changes of a known domain still get through
+            if change == 'added':
+                self.queue_domain(domain, 'zone_file', priority=3, dedup=False)
+            else:
+                self.queue_domain(domain, 'zone_ns_change', priority=4, dedup=False)
+            queued += 1
+
+        return queued
+
     def get_statistics(self) -> Dict:
         """Get daemon statistics"""
         uptime = datetime.utcnow() - self.stats['start_time']
@@ -566,7 +784,13 @@ class DomainDiscoveryDaemon:
             'sources_processed': self.stats['sources_processed'],
             'errors': self.stats['errors'],
             'queue_depths': queue_depths,
-            'cache_size': len(self.discovered_cache)
+            'cache_size': len(self.discovered_cache),
+            'cache_false_positive_rate': self.discovered_cache.false_positive_rate,
+            'cache_memory_bytes': self.discovered_cache.memory_bytes,
+            'rows_written': self.writer.stats['rows_written'],
+            'rows_failed': self.writer.stats['rows_failed'],
+            'write_batches': self.writer.stats['batches'],
+            'write_rows_per_sec': self.writer.rows_per_sec
         }
 
     def run(self):
@@ -588,24 +812,35 @@ class DomainDiscoveryDaemon:
                 # Phase 1: Fetch public domain lists (high priority, fast)
                 logger.info("\n[Phase 1] Fetching public domain lists...")
                 self.fetch_tranco_list(top_n=1000000)
+                self.flush_queued()
                 time.sleep(10)
 
                 self.fetch_umbrella_list(top_n=1000000)
+                self.flush_queued()
                 time.sleep(10)
 
                 self.fetch_majestic_million()
+                self.flush_queued()
                 time.sleep(10)
 
                 # Phase 2: Parse Certificate Transparency logs
                 logger.info("\n[Phase 2] Parsing Certificate Transparency logs...")
                 self.parse_ct_logs_crtsh(hours_back=24)
+                self.flush_queued()
                 time.sleep(10)
 
                 # Phase 3: Fetch Common Crawl domains
                 logger.info("\n[Phase 3] Fetching Common Crawl domains...")
                 self.fetch_common_crawl_domains(limit=100000)
+                self.flush_queued()
                 time.sleep(10)
 
+                # Phase 4: Diff downloaded zone files against previous snapshots
+                logger.info("\n[Phase 4] Diffing zone file snapshots...")
+                self.process_zone_snapshots()
+                self.flush_queued()
+                self.save_dedup_filter()
+
                 # Print statistics
                 stats = self.get_statistics()
                 logger.info("\n" + "="*80)
@@ -614,8 +849,14 @@ class DomainDiscoveryDaemon:
                 logger.info(f"Uptime: {stats['uptime_seconds']:.0f} seconds")
                 logger.info(f"Domains Discovered: {stats['domains_discovered']:,}")
                 logger.info(f"Domains Queued: {stats['domains_queued']:,}")
+                logger.info(f"Rows Written: {stats['rows_written']:,} in {stats['write_batches']:,} batches "
+                            f"({stats['write_rows_per_sec']:,.0f} rows/sec)")
+                if stats['rows_failed']:
+                    logger.info(f"Rows Failed: {stats['rows_failed']:,}")
                 logger.info(f"Errors: {stats['errors']}")
-                logger.info(f"Cache Size: {stats['cache_size']:,}")
+                logger.info(f"Cache Size: ~{stats['cache_size']:,} keys "
+                            f"({stats['cache_memory_bytes'] / 1048576:.1f} MB, "
+                            f"FP rate {stats['cache_false_positive_rate']:.5f})")
                 logger.info("\nSources Processed:")
                 for source, count in stats['sources_processed'].items():
                     logger.info(f"  {source}: {count:,}")
@@ -637,6 +878,8 @@ class DomainDiscoveryDaemon:
 
             except KeyboardInterrupt:
                 logger.info("\nShutting down gracefully...")
+                self.flush_queued()
+                self.save_dedup_filter()
                 break
             except Exception as e:
                 logger.error(f"Error in main loop: {e}", exc_info=True)
@@ -12,8 +12,12 @@ Phase 5: Blacklist Checks (Spamhaus, SURBL, URIBL, PhishTank)
 Phase 6: GeoIP & ASN (IP Location, ASN Info, Hosting Provider)
 
 Processing Rate: 1,000 domains/second
-Workers: 100 parallel workers
+Workers: 100 long-lived parallel workers, continuously fed
 Queue: Redis with 10M domain buffer
+
+Pipeline: feeder -> bounded prefetch queue -> workers -> result queue -> batched DB writer
+Domains are claimed from Redis in atomic batches and acked only once saved,
+so several enrichment nodes can share one queue (see discovery_queue.py).
 """
 
 import os
@@ -24,8 +28,10 @@ import logging
 import ssl
 import socket
 import hashlib
+import queue
+import threading
 import requests
-import concurrent.futures
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import dns.resolver
@@ -42,6 +48,8 @@ import ipaddress
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import Config
+from discovery_queue import DiscoveryQueue
+from dnsbl import get_dnsbl_engine
 
 # Configure logging
 logging.basicConfig(
@@ -55,16 +63,30 @@ logging.basicConfig(
 logger = logging.getLogger('Enrichment')
 
 
+GEOIP_CITY_DB = '/usr/share/GeoIP/GeoLite2-City.mmdb'
+
+
+def open_geoip_reader():
+    """Open the GeoLite2 City database, or return None if unavailable"""
+    try:
+        if os.path.exists(GEOIP_CITY_DB):
+            return geoip2.database.Reader(GEOIP_CITY_DB)
+    except Exception as e:
+        logger.warning(f"GeoIP database not available: {e}")
+    return None
+
+
 class EnrichmentWorker:
     """Worker that enriches a single domain with complete security data"""
 
-    def __init__(self, worker_id: int, db_config: Dict):
+    def __init__(self, worker_id: int, db_config: Dict, geoip_reader=None):
         """
         Initialize enrichment worker
 
         Args:
             worker_id: Unique worker identifier
             db_config: Database configuration
+            geoip_reader: Shared GeoIP reader (opened here if not given)
         """
         self.worker_id = worker_id
         self.db_config = db_config
@@ -83,12 +105,7 @@ class EnrichmentWorker:
         self.resolver.lifetime = 5
 
         # GeoIP database (if available)
-        self.geoip_reader = None
-        try:
-            if os.path.exists('/usr/share/GeoIP/GeoLite2-City.mmdb'):
-                self.geoip_reader = geoip2.database.Reader('/usr/share/GeoIP/GeoLite2-City.mmdb')
-        except Exception as e:
-            logger.warning(f"GeoIP database not available: {e}")
+        self.geoip_reader = geoip_reader if geoip_reader is not None else open_geoip_reader()
 
         # Statistics
         self.stats = {
@@ -460,37 +477,22 @@ class EnrichmentWorker:
                 'multi.surbl.org',
                 'multi.uribl.com'
             ]
-
-            for bl in domain_blacklists:
-                try:
-                    query = f'{domain}.{bl}'
-                    answers = self.resolver.resolve(query, 'A')
-                    if answers:
-                        blacklist_data['is_blacklisted'] = True
-                        blacklist_data['blacklists'].append(bl)
-                except Exception:
-                    pass
+            pairs = [(domain, bl) for bl in domain_blacklists]
 
             # IP blacklists (check first A record if available)
             if ip_addresses:
-                ip = ip_addresses[0]
-                reversed_ip = '.'.join(reversed(ip.split('.')))
-
                 ip_blacklists = [
                     'zen.spamhaus.org',
                     'b.barracudacentral.org',
                     'bl.spamcop.net'
                 ]
+                pairs += [(ip_addresses[0], bl) for bl in ip_blacklists]
 
-                for bl in ip_blacklists:
-                    try:
-                        query = f'{reversed_ip}.{bl}'
-                        answers = self.resolver.resolve(query, 'A')
-                        if answers:
-                            blacklist_data['is_blacklisted'] = True
-                            blacklist_data['blacklists'].append(f'{bl} (IP)')
-                    except Exception:
-                        pass
+            # All lookups at once through the shared, caching DNSBL engine
+            for (target, bl), verdict in get_dnsbl_engine().lookup_many(pairs).items():
+                if verdict['listed']:
+                    blacklist_data['is_blacklisted'] = True
+                    blacklist_data['blacklists'].append(bl if target == domain else f'{bl} (IP)')
 
             self.stats['blacklist_checks'] += 1
 
@@ -607,19 +609,73 @@ class EnrichmentWorker:
         return enrichment_data
 
 
+ENRICHMENT_UPSERT_SQL = """
+    INSERT INTO domains (
+        domain_name, tld, last_checked, last_enriched,
+        dnssec_enabled, spf_valid, dmarc_enabled,
+        ssl_enabled, ssl_expired, security_score,
+        is_malicious, is_blacklisted
+    ) VALUES (
+        %s, %s, NOW(), NOW(),
+        %s, %s, %s,
+        %s, %s, %s,
+        %s, %s
+    ) ON CONFLICT (domain_name)
+    DO UPDATE SET
+        last_enriched = NOW(),
+        dnssec_enabled = EXCLUDED.dnssec_enabled,
+        spf_valid = EXCLUDED.spf_valid,
+        dmarc_enabled = EXCLUDED.dmarc_enabled,
+        ssl_enabled = EXCLUDED.ssl_enabled,
+        ssl_expired = EXCLUDED.ssl_expired,
+        security_score = EXCLUDED.security_score,
+        is_malicious = EXCLUDED.is_malicious,
+        is_blacklisted = EXCLUDED.is_blacklisted
+"""
+
+
+def enrichment_row(enrichment_data: Dict) -> Tuple:
+    """Build the domains upsert parameters for one enrichment result"""
+    return (
+        enrichment_data['domain'],
+        enrichment_data['domain'].split('.')[-1],
+        enrichment_data['dns'].get('dnssec_enabled', False),
+        enrichment_data['email_security'].get('spf_valid', False),
+        bool(enrichment_data['email_security'].get('dmarc_record')),
+        bool(enrichment_data.get('ssl')),
+        (enrichment_data.get('ssl') or {}).get('expired', False),
+        enrichment_data.get('security_score', 0),
+        enrichment_data['threat_intel'].get('is_malicious', False),
+        enrichment_data['blacklists'].get('is_blacklisted', False)
+    )
+
+
 class EnrichmentDaemon:
     """
     Main enrichment daemon that manages workers and queue
+
+    Runs a continuous pipeline instead of lock-step batches: a feeder thread
+    keeps a bounded prefetch queue topped up from Redis, a fixed pool of
+    long-lived workers pull from it as soon as they are free (so one slow
+    domain only occupies one worker), and a single writer thread saves
+    results to PostgreSQL in batches as they arrive.
     """
 
-    def __init__(self, num_workers: int = 100):
+    def __init__(self, num_workers: int = 100, prefetch_size: Optional[int] = None,
+                 write_batch_size: Optional[int] = None):
         """
         Initialize enrichment daemon
 
         Args:
             num_workers: Number of parallel workers
+            prefetch_size: Max domains claimed from Redis but not yet started (default 2x workers)
+            write_batch_size: Max results saved per database transaction
         """
         self.num_workers = num_workers
+        self.prefetch_size = prefetch_size or Config.ENRICHMENT_PREFETCH or num_workers * 2
+        self.write_batch_size = write_batch_size or Config.ENRICHMENT_WRITE_BATCH
+        self.flush_interval = Config.ENRICHMENT_FLUSH_INTERVAL
+        self.metrics_interval = Config.ENRICHMENT_METRICS_INTERVAL
 
         # Database configuration - Use Config class
         self.db_config = {
@@ -630,7 +686,7 @@ class EnrichmentDaemon:
             'password': Config.DB_PASS
         }
 
-        # Database connection for main thread
+        # Database connection, used only by the writer thread
         self.db_conn = psycopg2.connect(**self.db_config)
 
         # Redis connection - Use Config class
@@ -641,16 +697,53 @@ class EnrichmentDaemon:
             decode_responses=True
         )
 
-        # Thread pool for workers
-        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=num_workers)
+        # Batched, at-least-once consumer of the discovery priority queues
+        self.discovery_queue = DiscoveryQueue(
+            self.redis_client,
+            visibility_timeout=Config.ENRICHMENT_VISIBILITY_TIMEOUT
+        )
+        self.requeue_interval = max(5, Config.ENRICHMENT_VISIBILITY_TIMEOUT / 4)
+
+        # GeoIP reader shared by all workers (opened once)
+        self.geoip_reader = open_geoip_reader()
+
+        # Pipeline stages
+        self.work_queue: queue.Queue = queue.Queue(maxsize=self.prefetch_size)
+        self.result_queue: queue.Queue = queue.Queue(maxsize=self.write_batch_size * 4)
+        self.stop_event = threading.Event()
+        self.threads: List[threading.Thread] = []
 
         # Statistics
+        self.stats_lock = threading.Lock()
+        self.in_flight = 0
+        self.completions = deque()  # completion times within the rate window
+        self.rate_window = 60
         self.stats = {
             'total_processed': 0,
             'total_errors': 0,
             'start_time': datetime.utcnow()
         }
 
+    def get_next_domains(self, count: int) -> List[Tuple[str, Dict, str]]:
+        """
+        Claim up to count domains from the priority queues in one round-trip
+
+        Returns:
+            (domain, metadata, payload) tuples; ack payload once the result is saved
+        """
+        claimed = []
+        malformed = []
+        for payload in self.discovery_queue.claim(count):
+            try:
+                domain_data = json.loads(payload)
+                claimed.append((domain_data['domain'], domain_data, payload))
+            except (ValueError, KeyError, TypeError):
+                logger.warning(f"Dropping malformed queue item: {payload[:200]}")
+                malformed.append(payload)
+
+        self.discovery_queue.ack(malformed)
+        return claimed
+
     def get_next_domain(self) -> Optional[Tuple[str, Dict]]:
         """
         Get next domain from priority queues
@@ -658,130 +751,244 @@ class EnrichmentDaemon:
         Returns:
             (domain, metadata) tuple or None
         """
-        # Check queues in priority order (1 = highest priority)
-        for priority in range(1, 11):
-            queue_name = f"discovery_queue:priority_{priority}"
-
-            # Get oldest item from queue
-            items = self.redis_client.zrange(queue_name, 0, 0)
-            if items:
-                # Remove from queue
-                self.redis_client.zrem(queue_name, items[0])
-
-                # Parse domain data
-                domain_data = json.loads(items[0])
-                return domain_data['domain'], domain_data
+        claimed = self.get_next_domains(1)
+        if not claimed:
+            return None
 
-        return None
+        # Single-item callers take ownership immediately (no redelivery)
+        domain, domain_data, payload = claimed[0]
+        self.discovery_queue.ack([payload])
+        return domain, domain_data
 
     def save_enrichment(self, enrichment_data: Dict):
         """Save enrichment data to database"""
+        self.save_enrichments([enrichment_data])
+
+    def save_enrichments(self, batch: List[Dict]) -> bool:
+        """
+        Save a batch of enrichment results in one transaction
+
+        Returns:
+            True if the batch was committed
+        """
         try:
             with self.db_conn.cursor() as cur:
-                # Save to domains table
-                cur.execute("""
-                    INSERT INTO domains (
-                        domain_name, tld, last_checked, last_enriched,
-                        dnssec_enabled, spf_valid, dmarc_enabled,
-                        ssl_enabled, ssl_expired, security_score,
-                        is_malicious, is_blacklisted
-                    ) VALUES (
-                        %s, %s, NOW(), NOW(),
-                        %s, %s, %s,
-                        %s, %s, %s,
-                        %s, %s
-                    ) ON CONFLICT (domain_name)
-                    DO UPDATE SET
-                        last_enriched = NOW(),
-                        dnssec_enabled = EXCLUDED.dnssec_enabled,
-                        spf_valid = EXCLUDED.spf_valid,
-                        dmarc_enabled = EXCLUDED.dmarc_enabled,
-                        ssl_enabled = EXCLUDED.ssl_enabled,
-                        ssl_expired = EXCLUDED.ssl_expired,
-                        security_score = EXCLUDED.security_score,
-                        is_malicious = EXCLUDED.is_malicious,
-                        is_blacklisted = EXCLUDED.is_blacklisted
-                """, (
-                    enrichment_data['domain'],
-                    enrichment_data['domain'].split('.')[-1],
-                    enrichment_data['dns'].get('dnssec_enabled', False),
-                    enrichment_data['email_security'].get('spf_valid', False),
-                    bool(enrichment_data['email_security'].get('dmarc_record')),
-                    bool(enrichment_data.get('ssl')),
-                    enrichment_data.get('ssl', {}).get('expired', False),
-                    enrichment_data.get('security_score', 0),
-                    enrichment_data['threat_intel'].get('is_malicious', False),
-                    enrichment_data['blacklists'].get('is_blacklisted', False)
-                ))
+                execute_batch(cur, ENRICHMENT_UPSERT_SQL, [enrichment_row(data) for data in batch])
 
             self.db_conn.commit()
+            return True
 
         except Exception as e:
-            logger.error(f"Error saving enrichment for {enrichment_data['domain']}: {e}")
+            logger.error(f"Error saving enrichment batch of {len(batch)} "
+                         f"(first: {batch[0]['domain']}): {e}")
             self.db_conn.rollback()
+            return False
 
-    def run(self):
-        """Main daemon loop"""
-        logger.info("=" * 80)
-        logger.info("DNS Science - Enrichment Daemon")
-        logger.info(f"Workers: {self.num_workers}")
-        logger.info("=" * 80)
+    def _put(self, target: queue.Queue, item) -> bool:
+        """Blocking put that gives up when the daemon is stopping"""
+        while not self.stop_event.is_set():
+            try:
+                target.put(item, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
 
-        batch = []
-        batch_size = self.num_workers
+    def _feeder_loop(self):
+        """Keep the prefetch queue topped up from the Redis priority queues"""
+        next_requeue = 0.0
 
-        while True:
+        while not self.stop_event.is_set():
             try:
-                # Get batch of domains
-                for _ in range(batch_size):
-                    result = self.get_next_domain()
-                    if result:
-                        batch.append(result)
+                if time.monotonic() >= next_requeue:
+                    requeued = self.discovery_queue.requeue_expired()
+                    if requeued:
+                        logger.warning(f"Requeued {requeued} domains whose claim expired")
+                    next_requeue = time.monotonic() + self.requeue_interval
+
+                free_slots = self.prefetch_size - self.work_queue.qsize()
+                if free_slots <= 0:
+                    self.stop_event.wait(0.1)
+                    continue
 
-                if not batch:
+                claimed = self.get_next_domains(free_slots)
+            except Exception as e:
+                logger.error(f"Error reading discovery queue: {e}")
+                self.stop_event.wait(5)
+                continue
+
+            if not claimed:
+                if self.work_queue.empty() and not self.in_flight:
                     logger.info("Queue empty, waiting...")
-                    time.sleep(10)
-                    continue
+                self.stop_event.wait(10)
+                continue
 
-                # Process batch in parallel
-                logger.info(f"Processing batch of {len(batch)} domains...")
+            for item in claimed:
+                if not self._put(self.work_queue, item):
+                    break  # Stopping: unstarted claims are requeued after the visibility timeout
 
-                futures = []
-                for domain, metadata in batch:
-                    worker = EnrichmentWorker(len(futures), self.db_config)
-                    future = self.executor.submit(worker.enrich_domain, domain)
-                    futures.append((future, domain))
+    def _worker_loop(self, worker_id: int):
+        """Long-lived worker: one resolver/EnrichmentWorker reused for every domain"""
+        worker = EnrichmentWorker(worker_id, self.db_config, geoip_reader=self.geoip_reader)
 
-                # Wait for results
-                for future, domain in futures:
-                    try:
-                        enrichment_data = future.result(timeout=60)
-                        self.save_enrichment(enrichment_data)
-                        self.stats['total_processed'] += 1
-                    except Exception as e:
-                        logger.error(f"Error processing {domain}: {e}")
-                        self.stats['total_errors'] += 1
+        while not self.stop_event.is_set():
+            try:
+                domain, metadata, payload = self.work_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+
+            with self.stats_lock:
+                self.in_flight += 1
+            try:
+                enrichment_data = worker.enrich_domain(domain)
+            except Exception as e:
+                logger.error(f"Error processing {domain}: {e}")
+                with self.stats_lock:
+                    self.stats['total_errors'] += 1
+                self._ack([payload])  # Don't redeliver domains that crash the worker
+                continue
+            finally:
+                with self.stats_lock:
+                    self.in_flight -= 1
+
+            self._put(self.result_queue, (payload, enrichment_data))
+
+    def _ack(self, payloads: List[str]):
+        try:
+            self.discovery_queue.ack(payloads)
+        except Exception as e:
+            logger.error(f"Error acking {len(payloads)} queue items: {e}")
+
+    def _writer_loop(self):
+        """Save results in batches as they arrive (flushing at least every flush_interval)"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
 
+        while not (self.stop_event.is_set() and self.result_queue.empty()):
+            try:
+                batch.append(self.result_queue.get(timeout=max(0.05, deadline - time.monotonic())))
+            except queue.Empty:
+                pass
+
+            if batch and (len(batch) >= self.write_batch_size or time.monotonic() >= deadline):
+                self._flush(batch)
                 batch = []
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+
+        if batch:
+            self._flush(batch)
+
+    def _flush(self, batch: List[Tuple[str, Dict]]):
+        """Write one batch, ack its queue items and account for it"""
+        saved = self.save_enrichments([enrichment_data for _, enrichment_data in batch])
+        if saved:
+            self._ack([payload for payload, _ in batch])
+        # Unsaved items stay claimed and are retried after the visibility timeout
+        now = time.monotonic()
+        with self.stats_lock:
+            if saved:
+                self.stats['total_processed'] += len(batch)
+                self.completions.extend([now] * len(batch))
+            else:
+                self.stats['total_errors'] += len(batch)
+
+    def get_metrics(self) -> Dict:
+        """
+        Current pipeline metrics
 
-                # Log statistics every 100 domains
-                if self.stats['total_processed'] % 100 == 0:
-                    uptime = (datetime.utcnow() - self.stats['start_time']).total_seconds()
-                    rate = self.stats['total_processed'] / uptime if uptime > 0 else 0
-
-                    logger.info(f"\nStatistics:")
-                    logger.info(f"  Processed: {self.stats['total_processed']:,}")
-                    logger.info(f"  Errors: {self.stats['total_errors']}")
-                    logger.info(f"  Rate: {rate:.1f} domains/sec")
-                    logger.info(f"  Uptime: {uptime:.0f} seconds")
-
-            except KeyboardInterrupt:
-                logger.info("\nShutting down gracefully...")
-                self.executor.shutdown(wait=True)
-                break
-            except Exception as e:
-                logger.error(f"Error in main loop: {e}", exc_info=True)
-                time.sleep(5)
+        Returns:
+            Throughput (recent and overall domains/sec) and queue depths
+        """
+        now = time.monotonic()
+        with self.stats_lock:
+            while self.completions and self.completions[0] < now - self.rate_window:
+                self.completions.popleft()
+            recent = len(self.completions)
+            processed = self.stats['total_processed']
+            errors = self.stats['total_errors']
+            in_flight = self.in_flight
+
+        try:
+            redis_waiting, redis_claimed = self.discovery_queue.depths()
+        except Exception:
+            redis_waiting = redis_claimed = None
+
+        uptime = (datetime.utcnow() - self.stats['start_time']).total_seconds()
+        window = min(self.rate_window, uptime) or 1
+        return {
+            'processed': processed,
+            'errors': errors,
+            'domains_per_sec': round(recent / window, 2),
+            'avg_domains_per_sec': round(processed / uptime, 2) if uptime > 0 else 0,
+            'prefetch_depth': self.work_queue.qsize(),
+            'prefetch_capacity': self.prefetch_size,
+            'write_queue_depth': self.result_queue.qsize(),
+            'in_flight': in_flight,
+            'redis_queue_depth': redis_waiting,
+            'redis_claimed': redis_claimed,
+            'workers': self.num_workers,
+            'uptime': round(uptime)
+        }
+
+    def report_metrics(self):
+        """Log metrics and publish them to Redis for dashboards"""
+        metrics = self.get_metrics()
+
+        logger.info(f"\nStatistics:")
+        logger.info(f"  Processed: {metrics['processed']:,}")
+        logger.info(f"  Errors: {metrics['errors']}")
+        logger.info(f"  Rate: {metrics['domains_per_sec']:.1f} domains/sec "
+                    f"(avg {metrics['avg_domains_per_sec']:.1f})")
+        logger.info(f"  Prefetch queue: {metrics['prefetch_depth']}/{metrics['prefetch_capacity']} | "
+                    f"In flight: {metrics['in_flight']}/{metrics['workers']} | "
+                    f"Write queue: {metrics['write_queue_depth']}")
+        logger.info(f"  Redis queue: {metrics['redis_queue_depth']} waiting, "
+                    f"{metrics['redis_claimed']} claimed")
+        logger.info(f"  Uptime: {metrics['uptime']} seconds")
+
+        try:
+            self.redis_client.hset('enrichment:metrics', mapping={
+                **{key: value for key, value in metrics.items() if value is not None},
+                'updated_at': datetime.utcnow().isoformat()
+            })
+        except Exception as e:
+            logger.debug(f"Could not publish metrics: {e}")
+
+    def _start_thread(self, target, name: str, *args):
+        thread = threading.Thread(target=target, args=args, name=name, daemon=True)
+        thread.start()
+        self.threads.append(thread)
+
+    def stop(self):
+        """Stop all pipeline stages, flushing results that already finished"""
+        self.stop_event.set()
+        deadline = time.monotonic() + 30
+        for thread in self.threads:
+            thread.join(timeout=max(0, deadline - time.monotonic()))
+        self.threads = []
+
+    def run(self):
+        """Main daemon loop"""
+        logger.info("=" * 80)
+        logger.info("DNS Science - Enrichment Daemon")
+        logger.info(f"Workers: {self.num_workers} | Prefetch: {self.prefetch_size} | "
+                    f"Write batch: {self.write_batch_size}")
+        logger.info("=" * 80)
+
+        self._start_thread(self._feeder_loop, 'enrichment-feeder')
+        for worker_id in range(self.num_workers):
+            self._start_thread(self._worker_loop, f'enrichment-worker-{worker_id}', worker_id)
+        self._start_thread(self._writer_loop, 'enrichment-writer')
+
+        try:
+            while not self.stop_event.wait(self.metrics_interval):
+                self.report_metrics()
+        except KeyboardInterrupt:
+            logger.info("\nShutting down gracefully...")
+        finally:
+            self.stop()
+            self.report_metrics()
 
 
 def main():
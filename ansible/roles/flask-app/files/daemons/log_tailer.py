@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+DNS Science - Durable Log Tailer
+
+Rotation-aware `tail -f` for sensor logs (Zeek *.log, Suricata eve.json):
+
+- Reads in large blocks and hands back complete lines only
+- Persists (inode, offset) checkpoints so restarts resume exactly where the
+  last committed batch ended - no replay, no gap
+- Detects rotation (path now points at a new inode) and drains the rotated
+  file to EOF before switching; after a restart the rotated file is found
+  again by inode in the log directory
+- Detects truncation (file shorter than the read position) and restarts at 0
+
+Callers commit() only after the lines they were given have been stored, so
+delivery is at-least-once across crashes.
+"""
+
+import os
+import json
+import time
+import logging
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+
+
+class LogTailer:
+    """Follows one log path across rotations with durable checkpoints"""
+
+    def __init__(self, path: str, checkpoint_path: Optional[str] = None,
+                 block_size: int = DEFAULT_BLOCK_SIZE, encoding: str = 'utf-8'):
+        """
+        Initialize tailer
+
+        Args:
+            path: Log file to follow
+            checkpoint_path: JSON file holding the committed (inode, offset); None to not persist
+            block_size: Bytes read per os.read() call
+            encoding: Text encoding of the log
+        """
+        self.path = path
+        self.checkpoint_path = checkpoint_path
+        self.block_size = block_size
+        self.encoding = encoding
+
+        self.fd = None
+        self.inode = None
+        self.position = 0        # Bytes consumed from fd
+        self.buffer = b''        # Trailing partial line
+        self.start_offset = 0    # Offset the current file was opened at
+        self.generation = 0      # Incremented whenever a different file is opened
+
+        self.stats = {'bytes_read': 0, 'lines_read': 0, 'rotations': 0, 'truncations': 0}
+
+    @property
+    def offset(self) -> int:
+        """Byte offset just past the last complete line handed out"""
+        return self.position - len(self.buffer)
+
+    def open_file(self, path: str, offset: int = 0) -> bool:
+        """Open a specific file at a byte offset (no checkpoint lookup)"""
+        self.close()
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            return False
+
+        st = os.fstat(fd)
+        if offset > st.st_size:
+            logger.warning(f"{path} is shorter than checkpoint offset {offset}, treating as truncated")
+            self.stats['truncations'] += 1
+            offset = 0
+        os.lseek(fd, offset, os.SEEK_SET)
+
+        self.fd = fd
+        self.inode = st.st_ino
+        self.position = offset
+        self.start_offset = offset
+        self.buffer = b''
+        self.generation += 1
+        return True
+
+    def load_checkpoint(self) -> Optional[dict]:
+        """Read the persisted checkpoint (None if absent or unreadable)"""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return None
+        try:
+            with open(self.checkpoint_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable checkpoint {self.checkpoint_path}: {e}")
+            return None
+
+    def _find_by_inode(self, inode: int) -> Optional[str]:
+        """Locate a rotated log by inode in the log's directory"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False) and entry.inode() == inode:
+                        return entry.path
+        except OSError:
+            pass
+        return None
+
+    def open(self) -> bool:
+        """
+        Open the log at the committed checkpoint
+
+        Returns:
+            True if a file is open
+        """
+        checkpoint = self.load_checkpoint()
+        if not checkpoint:
+            return self.open_file(self.path)
+
+        try:
+            current_inode = os.stat(self.path).st_ino
+        except FileNotFoundError:
+            current_inode = None
+
+        inode, offset = checkpoint.get('inode'), checkpoint.get('offset', 0)
+        if inode == current_inode:
+            return self.open_file(self.path, offset)
+
+        # Rotated while we were down: finish the old file, then move on
+        rotated = self._find_by_inode(inode) if inode is not None else None
+        if rotated and self.open_file(rotated, offset):
+            logger.info(f"Resuming rotated log {rotated} at offset {offset} before {self.path}")
+            return True
+
+        logger.warning(f"Checkpointed file for {self.path} (inode {inode}) is gone; "
+                       f"starting the current file from the beginning")
+        return self.open_file(self.path)
+
+    def read_lines(self) -> List[str]:
+        """
+        Read up to one block and return the complete lines in it
+
+        Returns an empty list when no new data is available; rotation and
+        truncation are handled transparently.
+        """
+        if self.fd is None and not self.open():
+            return []
+
+        data = os.read(self.fd, self.block_size)
+        if data:
+            self.position += len(data)
+            self.stats['bytes_read'] += len(data)
+
+            *lines, self.buffer = (self.buffer + data).split(b'\n')
+            self.stats['lines_read'] += len(lines)
+            return [line.decode(self.encoding, errors='replace') for line in lines]
+
+        return self._at_eof()
+
+    def _at_eof(self) -> List[str]:
+        try:
+            current_inode = os.stat(self.path).st_ino
+        except FileNotFoundError:
+            current_inode = None
+
+        if current_inode is not None and current_inode != self.inode:
+            # Rotated: writes may have landed in the old file after our last
+            # read, so drain it to EOF before switching
+            chunks = [self.buffer]
+            while True:
+                data = os.read(self.fd, self.block_size)
+                if not data:
+                    break
+                self.stats['bytes_read'] += len(data)
+                chunks.append(data)
+
+            lines = b''.join(chunks).split(b'\n')
+            if not lines[-1]:
+                lines.pop()
+
+            self.stats['rotations'] += 1
+            self.stats['lines_read'] += len(lines)
+            logger.info(f"{self.path} rotated, switching to new file")
+            self.open_file(self.path)
+            return [line.decode(self.encoding, errors='replace') for line in lines]
+
+        if os.fstat(self.fd).st_size < self.position:
+            logger.warning(f"{self.path} truncated, restarting from the beginning")
+            self.stats['truncations'] += 1
+            self.open_file(self.path)
+
+        return []
+
+    def read_prefix(self, size: int = 65536) -> str:
+        """Read the start of the open file (e.g. a header) without moving the read position"""
+        if self.fd is None:
+            return ''
+        return os.pread(self.fd, size, 0).decode(self.encoding, errors='replace')
+
+    def checkpoint(self) -> Optional[dict]:
+        """Current (inode, offset), to commit later once the lines read so far are stored"""
+        if self.inode is None:
+            return None
+        return {'path': self.path, 'inode': self.inode, 'offset': self.offset}
+
+    def commit(self, checkpoint: Optional[dict] = None):
+        """
+        Persist a checkpoint (call once the returned lines are stored)
+
+        Args:
+            checkpoint: Position taken earlier with checkpoint() (default: the current one),
+                so a writer thread can commit what it stored while reading continues
+        """
+        checkpoint = checkpoint or self.checkpoint()
+        if not self.checkpoint_path or checkpoint is None:
+            return
+
+        checkpoint = dict(checkpoint, updated=time.time())
+        os.makedirs(os.path.dirname(os.path.abspath(self.checkpoint_path)), exist_ok=True)
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def follow(self, poll_interval: float = 0.5):
+        """
+        Generate batches of lines forever, sleeping only when idle
+
+        Yields:
+            Non-empty lists of lines
+        """
+        while True:
+            lines = self.read_lines()
+            if lines:
+                yield lines
+            else:
+                time.sleep(poll_interval)
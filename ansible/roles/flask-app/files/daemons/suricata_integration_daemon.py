@@ -10,7 +10,7 @@ This daemon processes Suricata IDS/IPS events in real-time:
 - TLS events
 
 Features:
-- Real-time EVE JSON log parsing
+- Real-time EVE JSON log parsing (streaming reader, separate batch writer)
 - Threat correlation with domain database
 - Automatic reputation score updates
 - Alert severity classification
@@ -26,6 +26,8 @@ import os
 import sys
 import json
 import time
+import queue
+import threading
 from datetime import datetime, timedelta
 from collections import defaultdict
 from typing import Dict, List, Optional
@@ -35,8 +37,9 @@ import logging
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from base_daemon import BaseDaemon
+from log_tailer import LogTailer
 import psycopg2
-from psycopg2.extras import execute_batch
+from psycopg2.extras import execute_batch, execute_values
 
 
 class SuricataEVEParser:
@@ -56,37 +59,95 @@ class SuricataEVEParser:
         self.eve_log_path = eve_log_path
         self.last_position = 0
 
-    def tail_follow(self, callback, start_offset=None):
+    @staticmethod
+    def decode_lines(lines: List[str]) -> List[Dict]:
+        """
+        Decode a block of EVE lines
+
+        The whole block is parsed as one JSON array, which is much cheaper
+        than a json.loads() call per line; if any line is malformed the block
+        is decoded line by line and the bad lines are skipped.
+
+        Args:
+            lines: Complete lines from the log
+
+        Returns:
+            Event dictionaries in log order
+        """
+        lines = [line for line in lines if line]
+        if not lines:
+            return []
+
+        try:
+            events = json.loads('[' + ','.join(lines) + ']')
+            if len(events) == len(lines) and all(isinstance(event, dict) for event in events):
+                return events
+        except ValueError:
+            pass
+
+        events = []
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                # Skip malformed JSON but continue
+                continue
+            if isinstance(event, dict):
+                events.append(event)
+        return events
+
+    def read_events(self, tailer: LogTailer, callback, max_lines: int = 100000) -> int:
+        """
+        Parse whatever the tailer has available (up to about max_lines lines)
+
+        Args:
+            tailer: LogTailer following the EVE log
+            callback: Function to call for each event
+            max_lines: Stop after roughly this many lines
+
+        Returns:
+            Number of lines consumed
+        """
+        consumed = 0
+        while consumed < max_lines:
+            lines = tailer.read_lines()
+            if not lines:
+                break
+
+            for event in self.decode_lines(lines):
+                callback(event)
+            consumed += len(lines)
+
+        self.last_position = tailer.offset
+        return consumed
+
+    def tail_follow(self, callback, start_offset=None, tailer: Optional[LogTailer] = None,
+                    poll_interval: float = 0.5):
         """
         Follow EVE log file and parse JSON events
 
         Args:
             callback: Function to call for each event
-            start_offset: File offset to resume from
+            start_offset: File offset to resume from (ignored when tailer has a checkpoint)
+            tailer: LogTailer to read through (default: an unpersisted one for the EVE log)
+            poll_interval: Seconds to sleep when no new data is available
+
+        Yields:
+            Offset after each block of events (commit the tailer to persist it)
         """
         if not os.path.exists(self.eve_log_path):
             raise FileNotFoundError(f"EVE log not found: {self.eve_log_path}")
 
-        with open(self.eve_log_path, 'r') as f:
-            # Seek to start offset if resuming
-            if start_offset:
-                f.seek(start_offset)
+        tailer = tailer or LogTailer(self.eve_log_path)
+        if start_offset and tailer.load_checkpoint() is None:
+            tailer.open_file(self.eve_log_path, start_offset)
 
-            # Read and parse lines
-            while True:
-                line = f.readline()
-
-                if line:
-                    try:
-                        event = json.loads(line.strip())
-                        callback(event)
-                    except json.JSONDecodeError as e:
-                        # Log malformed JSON but continue
-                        pass
-                else:
-                    # No new data, remember position and sleep
-                    yield f.tell()
-                    time.sleep(0.1)
+        while True:
+            if self.read_events(tailer, callback):
+                yield tailer.offset
+            else:
+                yield tailer.offset
+                time.sleep(poll_interval)
 
 
 class ThreatCorrelator:
@@ -301,11 +362,174 @@ class ThreatCorrelator:
         return score
 
 
+class BatchedThreatCorrelator(ThreatCorrelator):
+    """
+    Set-based alert correlation
+
+    Alerts are collected for a short window and correlated together: missing
+    domains are upserted in one statement, threat rows are bulk-inserted and
+    each domain's summed score delta is applied in one UPDATE, all in a
+    single transaction per batch instead of four round-trips per alert.
+    """
+
+    def __init__(self, db_conn, max_batch: int = 2000, max_delay: float = 1.0):
+        """
+        Initialize batched correlator
+
+        Args:
+            db_conn: PostgreSQL database connection
+            max_batch: Flush once this many alerts are pending
+            max_delay: Flush once the oldest pending alert is this many seconds old
+        """
+        super().__init__(db_conn)
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+
+        # (domain, alert, row) waiting for correlation; row gets the threat_intel_id
+        self.pending = []
+        self.pending_since = None
+
+        self.stats = {'alerts': 0, 'batches': 0, 'domains': 0, 'seconds': 0.0,
+                      'batch_failures': 0, 'errors': 0}
+
+    def add(self, alert: Dict, row: Optional[Dict] = None) -> bool:
+        """
+        Queue an alert for correlation
+
+        Args:
+            alert: Parsed alert dictionary
+            row: Record to receive 'threat_intel_id' when the batch is flushed
+
+        Returns:
+            True if the alert has a domain and was queued
+        """
+        domain = self.extract_domain(alert)
+        if not domain:
+            return False
+
+        if not self.pending:
+            self.pending_since = time.monotonic()
+        self.pending.append((domain, alert, row))
+        return True
+
+    def due(self) -> bool:
+        """Whether the pending batch is full or its window has elapsed"""
+        return bool(self.pending) and (
+            len(self.pending) >= self.max_batch or
+            time.monotonic() - self.pending_since >= self.max_delay
+        )
+
+    def flush(self) -> List[int]:
+        """
+        Correlate every pending alert in one transaction
+
+        If the set-based transaction fails, the batch is correlated again one
+        alert at a time with correlate_alert(), so a bad alert only loses its
+        own correlation.
+
+        Returns:
+            threat_intel_ids in the order the alerts were queued (None for
+            alerts that could not be correlated; their rows keep threat_intel_id None)
+        """
+        if not self.pending:
+            return []
+
+        pending, self.pending = self.pending, []
+        start = time.monotonic()
+
+        threat_rows = []
+        score_deltas = defaultdict(int)
+        for domain, alert, _ in pending:
+            alert_data = alert.get('alert', {})
+            threat_rows.append((
+                domain,
+                alert.get('src_ip') or alert.get('dest_ip'),
+                self.classify_threat_type(alert),
+                self.classify_severity(alert),
+                'suricata',
+                alert_data.get('signature', 'Unknown'),
+                alert.get('timestamp'),
+                json.dumps({
+                    'signature_id': alert_data.get('signature_id'),
+                    'category': alert_data.get('category'),
+                    'severity': alert_data.get('severity')
+                })
+            ))
+            score_deltas[domain] += self.calculate_score_delta(alert)
+
+        # Sorted so concurrent writers lock domain rows in the same order
+        domains = sorted(score_deltas)
+
+        try:
+            cursor = self.db_conn.cursor()
+
+            execute_values(cursor, """
+                INSERT INTO domains (domain_name, tld) VALUES %s
+                ON CONFLICT (domain_name) DO NOTHING
+            """, [(domain, domain.split('.')[-1]) for domain in domains], page_size=len(domains))
+
+            ids = execute_values(cursor, """
+                INSERT INTO threat_intelligence (
+                    domain_name, ip_address, threat_type, severity,
+                    source, description, detected_at, metadata
+                ) VALUES %s
+                RETURNING id
+            """, threat_rows, page_size=len(threat_rows), fetch=True)
+
+            # Deltas are never positive, so clamping the sum once matches
+            # clamping after each alert
+            execute_values(cursor, """
+                UPDATE domains AS d
+                SET security_score = GREATEST(0, LEAST(100, COALESCE(d.security_score, 100) + v.delta)),
+                    is_malicious = TRUE,
+                    last_threat_detected = NOW()
+                FROM (VALUES %s) AS v(domain_name, delta)
+                WHERE d.domain_name = v.domain_name
+            """, [(domain, score_deltas[domain]) for domain in domains], page_size=len(domains))
+
+            self.db_conn.commit()
+            cursor.close()
+
+            threat_intel_ids = [row[0] for row in ids]
+
+        except Exception:
+            self.db_conn.rollback()
+            self.stats['batch_failures'] += 1
+            threat_intel_ids = []
+            for _, alert, _ in pending:
+                try:
+                    threat_intel_ids.append(self.correlate_alert(alert))
+                except Exception:
+                    self.stats['errors'] += 1
+                    threat_intel_ids.append(None)
+
+        for (_, _, row), threat_intel_id in zip(pending, threat_intel_ids):
+            if row is not None:
+                row['threat_intel_id'] = threat_intel_id
+
+        self.stats['alerts'] += len(pending)
+        self.stats['batches'] += 1
+        self.stats['domains'] += len(domains)
+        self.stats['seconds'] += time.monotonic() - start
+
+        return threat_intel_ids
+
+    def throughput(self) -> float:
+        """Alerts correlated per second of database time"""
+        return self.stats['alerts'] / self.stats['seconds'] if self.stats['seconds'] else 0.0
+
+
 class SuricataIntegrationDaemon(BaseDaemon):
     """
     Suricata Integration Daemon
 
     Processes Suricata EVE JSON logs in real-time
+
+    By default runs as a streaming pipeline: the main thread keeps the EVE
+    log open, reads it in large blocks, decodes each block in one pass and
+    routes events by type to a writer thread, which stores them in batches
+    flushed by size or age. SURICATA_STREAMING=false falls back to the
+    iterate-and-sleep loop of BaseDaemon.
     """
 
     def __init__(self):
@@ -314,8 +538,11 @@ class SuricataIntegrationDaemon(BaseDaemon):
         # Suricata EVE log path
         self.eve_log_path = os.getenv('SURICATA_EVE_LOG', '/var/log/suricata/eve.json')
 
-        # Threat correlator
+        # Threat correlator: alerts are correlated in sets of up to
+        # correlation_batch_size, at most correlation_window seconds after arrival
         self.correlator = None  # Lazy initialized
+        self.correlation_batch_size = int(os.getenv('SURICATA_CORRELATION_BATCH', '2000'))
+        self.correlation_window = float(os.getenv('SURICATA_CORRELATION_WINDOW', '1.0'))
 
         # Batch processing
         self.alert_batch = []
@@ -323,6 +550,8 @@ class SuricataIntegrationDaemon(BaseDaemon):
         self.dns_batch = []
         self.http_batch = []
         self.batch_size = 500
+        # Writing the alert batch correlates it first, so it holds a full correlation batch
+        self.alert_batch_size = max(self.batch_size, self.correlation_batch_size)
 
         # Statistics
         self.stats = {
@@ -335,17 +564,67 @@ class SuricataIntegrationDaemon(BaseDaemon):
             'errors': 0
         }
 
-        # File offset for resuming
-        self.file_offset = 0
+        # Durable tailer: (inode, offset) checkpoint survives restarts and rotation
+        checkpoint_dir = os.getenv('SENSOR_CHECKPOINT_DIR', '/var/lib/dnsscience/checkpoints')
+        self.max_lines_per_iteration = int(os.getenv('SURICATA_MAX_LINES_PER_ITERATION', '100000'))
+        self.parser = SuricataEVEParser(self.eve_log_path)
+        self.tailer = LogTailer(
+            self.eve_log_path, os.path.join(checkpoint_dir, 'suricata_eve.json'),
+            block_size=int(os.getenv('SURICATA_READ_BLOCK_SIZE', str(4 * 1024 * 1024)))
+        )
+
+        # Streaming mode: reader -> bounded queue of routed blocks -> writer thread
+        self.streaming = os.getenv('SURICATA_STREAMING', 'true').lower() in ('1', 'true', 'yes')
+        self.flush_rows = int(os.getenv('SURICATA_FLUSH_ROWS', '5000'))
+        self.flush_interval = float(os.getenv('SURICATA_FLUSH_INTERVAL', '2.0'))
+        self.poll_interval = float(os.getenv('SURICATA_POLL_INTERVAL', '0.2'))
+        self.ingest_queue: queue.Queue = queue.Queue(maxsize=int(os.getenv('SURICATA_INGEST_QUEUE', '16')))
+        self.stop_event = threading.Event()
+        self.writer_thread = None
+
+        self.event_handlers = {
+            'alert': self.process_alert,
+            'flow': self.process_flow,
+            'dns': self.process_dns,
+            'http': self.process_http,
+            'tls': self.process_tls
+        }
+        self.stats_interval = 60
+        self.last_stats_log = time.monotonic()
 
         self.logger.info("Suricata Integration Daemon initialized")
 
     def get_correlator(self):
-        """Lazy initialize threat correlator with DB connection"""
+        """Lazy initialize threat correlator (connected at flush time)"""
         if not self.correlator:
-            self.correlator = ThreatCorrelator(self.get_db_connection())
+            self.correlator = BatchedThreatCorrelator(
+                None, self.correlation_batch_size, self.correlation_window
+            )
         return self.correlator
 
+    def flush_correlations(self):
+        """Correlate pending alerts so their rows carry threat_intel_id"""
+        if not self.correlator or not self.correlator.pending:
+            return
+
+        failures = self.correlator.stats['batch_failures']
+        try:
+            # The daemon may have reconnected since the last batch
+            self.correlator.db_conn = self.get_db_connection()
+            threat_intel_ids = self.correlator.flush()
+            self.stats['threats_correlated'] += sum(1 for tid in threat_intel_ids if tid)
+        except Exception as e:
+            self.logger.error(f"Error correlating alerts: {e}")
+            return
+
+        if self.correlator.stats['batch_failures'] > failures:
+            uncorrelated = threat_intel_ids.count(None)
+            self.logger.warning(
+                f"Batched correlation of {len(threat_intel_ids)} alerts failed, correlated per alert "
+                f"({uncorrelated} could not be correlated)"
+            )
+            self.stats['errors'] += uncorrelated
+
     def process_event(self, event: Dict):
         """
         Process a single EVE event
@@ -354,18 +633,9 @@ class SuricataIntegrationDaemon(BaseDaemon):
             event: Parsed EVE JSON event
         """
         try:
-            event_type = event.get('event_type')
-
-            if event_type == 'alert':
-                self.process_alert(event)
-            elif event_type == 'flow':
-                self.process_flow(event)
-            elif event_type == 'dns':
-                self.process_dns(event)
-            elif event_type == 'http':
-                self.process_http(event)
-            elif event_type == 'tls':
-                self.process_tls(event)
+            handler = self.event_handlers.get(event.get('event_type'))
+            if handler:
+                handler(event)
 
         except Exception as e:
             self.logger.error(f"Error processing event: {e}")
@@ -376,18 +646,7 @@ class SuricataIntegrationDaemon(BaseDaemon):
         try:
             alert_data = event.get('alert', {})
 
-            # Correlate with domain database
-            threat_intel_id = None
-            try:
-                correlator = self.get_correlator()
-                threat_intel_id = correlator.correlate_alert(event)
-                if threat_intel_id:
-                    self.stats['threats_correlated'] += 1
-            except Exception as e:
-                self.logger.error(f"Error correlating alert: {e}")
-
-            # Add to alert batch
-            self.alert_batch.append({
+            row = {
                 'timestamp': event.get('timestamp'),
                 'alert_signature': alert_data.get('signature'),
                 'alert_category': alert_data.get('category'),
@@ -410,13 +669,23 @@ class SuricataIntegrationDaemon(BaseDaemon):
                 'tls_subject': event.get('tls', {}).get('subject'),
                 'tls_issuer': event.get('tls', {}).get('issuerdn'),
                 'flow_id': event.get('flow_id'),
-                'threat_intel_id': threat_intel_id
-            })
+                'threat_intel_id': None
+            }
+            self.alert_batch.append(row)
+
+            # Queue for set-based correlation; threat_intel_id is filled in on flush
+            try:
+                correlator = self.get_correlator()
+                correlator.add(event, row)
+                if correlator.due():
+                    self.flush_correlations()
+            except Exception as e:
+                self.logger.error(f"Error correlating alert: {e}")
 
             self.stats['alerts_processed'] += 1
 
             # Flush if batch is full
-            if len(self.alert_batch) >= self.batch_size:
+            if len(self.alert_batch) >= self.alert_batch_size:
                 self.flush_alert_batch()
 
         except Exception as e:
@@ -521,6 +790,9 @@ class SuricataIntegrationDaemon(BaseDaemon):
         if not self.alert_batch:
             return
 
+        # Alert rows reference their threat_intelligence records
+        self.flush_correlations()
+
         try:
             conn = self.get_db_connection()
             cursor = conn.cursor()
@@ -642,47 +914,196 @@ class SuricataIntegrationDaemon(BaseDaemon):
             self.logger.error(f"Error flushing HTTP batch: {e}")
             conn.rollback()
 
+    def flush_all(self) -> bool:
+        """
+        Flush every batch
+
+        Returns:
+            True if nothing read so far is left unstored
+        """
+        try:
+            self.flush_alert_batch()
+            self.flush_flow_batch()
+            self.flush_dns_batch()
+            self.flush_http_batch()
+        except Exception as e:
+            self.logger.error(f"Error flushing batches: {e}")
+            self.stats['errors'] += 1
+            self.close_db_connection()
+
+        return not (self.alert_batch or self.flow_batch or self.dns_batch or self.http_batch)
+
+    def log_stats(self):
+        """Log statistics (at most every stats_interval seconds)"""
+        now = time.monotonic()
+        if now - self.last_stats_log < self.stats_interval:
+            return
+        self.last_stats_log = now
+
+        self.logger.info(
+            f"Stats: Alerts={self.stats['alerts_processed']}, "
+            f"Flows={self.stats['flows_processed']}, "
+            f"DNS={self.stats['dns_events']}, "
+            f"HTTP={self.stats['http_events']}, "
+            f"TLS={self.stats['tls_events']}, "
+            f"Threats={self.stats['threats_correlated']}, "
+            f"Errors={self.stats['errors']}, "
+            f"Read={self.tailer.stats['lines_read']} lines, "
+            f"Queue={self.ingest_queue.qsize()}/{self.ingest_queue.maxsize}"
+        )
+        if self.correlator and self.correlator.stats['batches']:
+            self.logger.info(
+                f"Correlation: {self.correlator.stats['alerts']} alerts in "
+                f"{self.correlator.stats['batches']} batches, "
+                f"{self.correlator.throughput():,.0f} alerts/sec"
+            )
+
+    def stream_events(self):
+        """
+        Reader side of streaming mode: read, decode and route EVE blocks until shutdown
+
+        Each block is handed to the writer with the checkpoint just past it; the
+        queue is bounded, so a slow database makes the reader wait instead of
+        buffering the log in memory.
+        """
+        missing_logged = False
+
+        while self.running and self.writer_thread.is_alive():
+            # A rotated file may still be open and draining
+            if self.tailer.fd is None and not os.path.exists(self.eve_log_path):
+                if not missing_logged:
+                    self.logger.warning(f"EVE log not found: {self.eve_log_path}")
+                    missing_logged = True
+                time.sleep(5)
+                continue
+            missing_logged = False
+
+            lines = self.tailer.read_lines()
+            if not lines:
+                time.sleep(self.poll_interval)
+                continue
+
+            routed = defaultdict(list)
+            for event in self.parser.decode_lines(lines):
+                event_type = event.get('event_type')
+                if event_type in self.event_handlers:
+                    routed[event_type].append(event)
+
+            block = (routed, self.tailer.checkpoint())
+            while self.running and self.writer_thread.is_alive():
+                try:
+                    self.ingest_queue.put(block, timeout=1)
+                    break
+                except queue.Full:
+                    continue
+
+    def _writer_loop(self):
+        """
+        Writer side of streaming mode: store routed blocks, flushing once
+        flush_rows events are pending or flush_interval has passed, and commit
+        the checkpoint after everything up to it has been stored
+        """
+        pending = 0
+        checkpoint = None
+        retrying = False
+        deadline = time.monotonic() + self.flush_interval
+
+        # On shutdown, drain the queue unless the database is failing (unstored
+        # blocks are not checkpointed, so they are read again after a restart)
+        while not (self.stop_event.is_set() and (retrying or self.ingest_queue.empty())):
+            # Take no more blocks until what is buffered has been stored, so a
+            # stalled database fills the queue and the reader waits
+            if retrying:
+                self.stop_event.wait(5)
+            else:
+                try:
+                    routed, checkpoint = self.ingest_queue.get(timeout=max(0.05, deadline - time.monotonic()))
+                    for event_type, events in routed.items():
+                        handler = self.event_handlers[event_type]
+                        for event in events:
+                            handler(event)
+                        pending += len(events)
+                except queue.Empty:
+                    pass
+
+            now = time.monotonic()
+            if checkpoint and (retrying or pending >= self.flush_rows or now >= deadline):
+                retrying = not self.flush_all()
+                if not retrying:
+                    self.tailer.commit(checkpoint)
+                    pending = 0
+                    checkpoint = None
+
+            if now >= deadline:
+                deadline = now + self.flush_interval
+                self.log_stats()
+                try:
+                    self.get_redis_connection().set(
+                        f'daemon:{self.daemon_name}:last_run',
+                        datetime.utcnow().isoformat()
+                    )
+                except:
+                    pass  # Don't fail if Redis is down
+
+        if self.flush_all() and checkpoint:
+            self.tailer.commit(checkpoint)
+
+    def run(self):
+        """Run the streaming pipeline (or the BaseDaemon loop when streaming is disabled)"""
+        if not self.streaming:
+            return super().run()
+
+        self.write_pid_file()
+        self.running = True
+        self.logger.info(f"{self.daemon_name} daemon started in streaming mode (PID: {os.getpid()})")
+
+        self.writer_thread = threading.Thread(target=self._writer_loop, name='suricata-writer', daemon=True)
+        self.writer_thread.start()
+
+        try:
+            self.stream_events()
+        except KeyboardInterrupt:
+            self.logger.info("Keyboard interrupt received")
+        except Exception as e:
+            self.logger.error(f"Error reading EVE log: {e}", exc_info=True)
+        finally:
+            # Let the writer drain the queue and store what was read; the tailer
+            # and database connection stay open until it has finished
+            self.stop_event.set()
+            while self.writer_thread.is_alive():
+                self.writer_thread.join(timeout=30)
+                if self.writer_thread.is_alive():
+                    self.logger.info("Waiting for the writer to store buffered events...")
+            self.cleanup()
+
+    def get_sleep_duration(self, work_done):
+        """Keep reading while there is backlog; poll every second when caught up"""
+        return 0 if work_done else 1
+
+    def cleanup(self):
+        """Close the tailed log before the base cleanup"""
+        self.tailer.close()
+        super().cleanup()
+
     def process_iteration(self):
-        """Main processing iteration"""
+        """Main processing iteration (when streaming is disabled)"""
         work_done = False
 
         try:
-            # Check if EVE log exists
-            if not os.path.exists(self.eve_log_path):
+            # Check if EVE log exists (a rotated file may still be open and draining)
+            if self.tailer.fd is None and not os.path.exists(self.eve_log_path):
                 self.logger.warning(f"EVE log not found: {self.eve_log_path}")
                 return False
 
             # Process events
-            parser = SuricataEVEParser(self.eve_log_path)
+            if self.parser.read_events(self.tailer, self.process_event, self.max_lines_per_iteration):
+                work_done = True
 
-            try:
-                for offset in parser.tail_follow(self.process_event, self.file_offset):
-                    self.file_offset = offset
-                    work_done = True
+            # Only advance the checkpoint once everything read has been stored
+            if self.flush_all():
+                self.tailer.commit()
 
-                    # Break after processing some events
-                    if self.stats['alerts_processed'] % 100 == 0:
-                        break
-            except StopIteration:
-                pass
-
-            # Flush all batches
-            self.flush_alert_batch()
-            self.flush_flow_batch()
-            self.flush_dns_batch()
-            self.flush_http_batch()
-
-            # Log statistics every 1000 alerts
-            if self.stats['alerts_processed'] % 1000 == 0 and self.stats['alerts_processed'] > 0:
-                self.logger.info(
-                    f"Stats: Alerts={self.stats['alerts_processed']}, "
-                    f"Flows={self.stats['flows_processed']}, "
-                    f"DNS={self.stats['dns_events']}, "
-                    f"HTTP={self.stats['http_events']}, "
-                    f"TLS={self.stats['tls_events']}, "
-                    f"Threats={self.stats['threats_correlated']}, "
-                    f"Errors={self.stats['errors']}"
-                )
+            self.log_stats()
 
         except Exception as e:
             self.logger.error(f"Error in process_iteration: {e}", exc_info=True)
@@ -690,7 +1111,6 @@ class SuricataIntegrationDaemon(BaseDaemon):
 
         return work_done
 
-
 def main():
     """Main entry point"""
     daemon = SuricataIntegrationDaemon()
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+DNS Science - Sliding-Window Sketches
+
+Memory-bounded, time-bucketed aggregation of DNS traffic for anomaly
+detection:
+
+- CountMinSketch: fixed-size frequency estimates (never under-counts)
+- HyperLogLog: fixed-size distinct-count estimates that merge by register max
+- SlidingWindowAggregator: a ring of time buckets tracking, per registrable
+  domain, the query count (one count-min sketch per bucket), distinct
+  subdomains and distinct answer IPs (HyperLogLog per bucket), plus distinct
+  NXDOMAIN domains per client
+
+Buckets are keyed by event time, so replayed logs aggregate the same way as
+live traffic; events older than the window are not counted. Per-key state is
+capped with LRU eviction, and the window-wide count-min table and
+HyperLogLog unions are maintained incrementally, so observe() stays
+constant time per record.
+"""
+
+import math
+import operator
+from array import array
+from collections import OrderedDict, namedtuple
+from typing import List, Optional, Tuple
+
+from bloom_filter import key_hashes
+
+MASK64 = (1 << 64) - 1
+
+# Second-level labels under which registrations happen one level deeper (example.co.uk)
+SECOND_LEVEL_LABELS = {'co', 'com', 'net', 'org', 'gov', 'edu', 'ac', 'ne', 'or', 'go'}
+
+WindowStats = namedtuple('WindowStats', [
+    'domain',               # Registrable domain of the query
+    'queries',              # Queries for the domain within the window
+    'distinct_subdomains',  # Distinct query names under the domain
+    'distinct_ips',         # Distinct answer IPs for the domain
+    'nxdomain_domains',     # Distinct NXDOMAIN domains queried by the client (NXDOMAIN answers only)
+    'window_seconds',
+])
+
+
+def registrable_domain(name: str) -> str:
+    """
+    Reduce a query name to its registrable domain (example.com, example.co.uk)
+
+    A lightweight heuristic rather than a full public suffix lookup: two
+    labels, or three when the second-level label is a common registry
+    namespace under a two-letter ccTLD.
+    """
+    labels = name.rstrip('.').lower().split('.')
+    if len(labels) <= 2:
+        return '.'.join(labels)
+    if len(labels[-1]) == 2 and labels[-2] in SECOND_LEVEL_LABELS:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+
+class CountMinSketch:
+    """Count-min sketch using double hashing over one blake2b digest"""
+
+    def __init__(self, width: int = 4096, depth: int = 4):
+        """
+        Initialize sketch
+
+        Args:
+            width: Counters per row (error ~ total / width)
+            depth: Rows (error probability ~ e ** -depth)
+        """
+        self.width = width
+        self.depth = depth
+        self.table = array('I', bytes(4 * width * depth))
+        self.total = 0
+
+    def add_hashed(self, h1: int, h2: int, count: int = 1) -> int:
+        """
+        Count a key already hashed with key_hashes()
+
+        Returns:
+            The key's new estimated count
+        """
+        table, width = self.table, self.width
+        estimate = None
+        for i in range(self.depth):
+            index = i * width + (h1 + i * h2) % width
+            value = table[index] + count
+            table[index] = value
+            if estimate is None or value < estimate:
+                estimate = value
+        self.total += count
+        return estimate
+
+    def estimate_hashed(self, h1: int, h2: int) -> int:
+        """Estimated count of a key already hashed with key_hashes()"""
+        table, width = self.table, self.width
+        return min(table[i * width + (h1 + i * h2) % width] for i in range(self.depth))
+
+    def add(self, key: str, count: int = 1) -> int:
+        return self.add_hashed(*key_hashes(key), count)
+
+    def estimate(self, key: str) -> int:
+        return self.estimate_hashed(*key_hashes(key))
+
+    def subtract(self, other: 'CountMinSketch'):
+        """Remove another sketch's counts (same dimensions) - count-min sketches are linear"""
+        self.table = array('I', map(operator.sub, self.table, other.table))
+        self.total -= other.total
+
+    def clear(self):
+        self.table = array('I', bytes(4 * self.width * self.depth))
+        self.total = 0
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter over 64-bit hashes"""
+
+    # 2 ** -rank for every possible register value
+    INVERSE_POWERS = [2.0 ** -rank for rank in range(66)]
+
+    def __init__(self, precision: int = 7, registers: Optional[bytearray] = None):
+        """
+        Initialize counter
+
+        Args:
+            precision: log2 of the register count (standard error ~ 1.04 / sqrt(2 ** precision))
+            registers: Existing registers to wrap
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+
+        self.precision = precision
+        self.registers = registers if registers is not None else bytearray(1 << precision)
+
+    @staticmethod
+    def position(h: int, precision: int) -> Tuple[int, int]:
+        """(register index, rank) of a 64-bit hash"""
+        rest = h & (MASK64 >> precision)
+        return h >> (64 - precision), (64 - precision) - rest.bit_length() + 1
+
+    def add_hash(self, h: int) -> bool:
+        """
+        Add a 64-bit hash
+
+        Returns:
+            True if a register changed (the estimate may have moved)
+        """
+        index, rank = self.position(h, self.precision)
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+            return True
+        return False
+
+    def add(self, key: str) -> bool:
+        return self.add_hash(key_hashes(key)[0])
+
+    def count(self) -> int:
+        return self.estimate(self.registers)
+
+    @staticmethod
+    def merge(registers: List[bytearray]) -> bytes:
+        """Union of several register arrays of the same precision"""
+        if len(registers) == 1:
+            return bytes(registers[0])
+        return bytes(map(max, *registers))
+
+    @classmethod
+    def estimate(cls, registers) -> int:
+        """Distinct-count estimate for a register array"""
+        inverse = cls.INVERSE_POWERS
+        return cls.estimate_from(len(registers), sum(inverse[rank] for rank in registers), registers.count(0))
+
+    @staticmethod
+    def estimate_from(m: int, inverse_sum: float, zeros: int) -> int:
+        """Estimate from register count, sum of 2 ** -register and zero registers (small-range corrected)"""
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / inverse_sum
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+class DistinctWindow:
+    """
+    Ring of per-bucket HyperLogLog registers for one key
+
+    The union of the live buckets is maintained incrementally (with its
+    running 2 ** -register sum and zero count), so counting is O(1); it is
+    rebuilt from the ring only when its oldest bucket leaves the window.
+    """
+
+    __slots__ = ('buckets', 'registers', 'union', 'inverse_sum', 'zeros', 'union_oldest')
+
+    def __init__(self, num_buckets: int):
+        self.buckets = [-1] * num_buckets
+        self.registers: List[Optional[bytearray]] = [None] * num_buckets
+        self.union = None
+        self.inverse_sum = 0.0
+        self.zeros = 0
+        self.union_oldest = None
+
+    def _rebuild(self, current_bucket: int):
+        oldest = current_bucket - len(self.buckets)
+        live = [(bucket, registers) for bucket, registers in zip(self.buckets, self.registers)
+                if bucket > oldest and registers is not None]
+        if not live:
+            self.union = None
+            self.union_oldest = None
+            return
+
+        self.union = bytearray(HyperLogLog.merge([registers for _, registers in live]))
+        inverse = HyperLogLog.INVERSE_POWERS
+        self.inverse_sum = sum(inverse[rank] for rank in self.union)
+        self.zeros = self.union.count(0)
+        self.union_oldest = min(bucket for bucket, _ in live)
+
+    def add_hash(self, h: int, bucket: int, current_bucket: int, precision: int):
+        """Add a hash to the bucket's registers (ignored if the bucket is outside the window)"""
+        num_buckets = len(self.buckets)
+        if bucket <= current_bucket - num_buckets:
+            return
+        if self.union_oldest is not None and self.union_oldest <= current_bucket - num_buckets:
+            self._rebuild(current_bucket)
+
+        slot = bucket % num_buckets
+        if self.buckets[slot] != bucket:
+            if self.buckets[slot] > bucket:
+                return
+            # The slot held a bucket that has already left the window (and the union)
+            self.buckets[slot] = bucket
+            self.registers[slot] = bytearray(1 << precision)
+
+        index, rank = HyperLogLog.position(h, precision)
+        registers = self.registers[slot]
+        if rank > registers[index]:
+            registers[index] = rank
+
+        if self.union is None:
+            self.union = bytearray(1 << precision)
+            self.inverse_sum = float(len(self.union))
+            self.zeros = len(self.union)
+        previous = self.union[index]
+        if rank > previous:
+            self.union[index] = rank
+            self.inverse_sum += HyperLogLog.INVERSE_POWERS[rank] - HyperLogLog.INVERSE_POWERS[previous]
+            if not previous:
+                self.zeros -= 1
+        if self.union_oldest is None or bucket < self.union_oldest:
+            self.union_oldest = bucket
+
+    def count(self, current_bucket: int) -> int:
+        """Distinct estimate over the buckets inside the window ending at current_bucket"""
+        if self.union_oldest is not None and self.union_oldest <= current_bucket - len(self.buckets):
+            self._rebuild(current_bucket)
+        if self.union is None:
+            return 0
+        return HyperLogLog.estimate_from(len(self.union), self.inverse_sum, self.zeros)
+
+
+class DomainWindow:
+    """Per-domain window state: distinct subdomains and distinct answer IPs"""
+
+    __slots__ = ('subdomains', 'ips')
+
+    def __init__(self, num_buckets: int):
+        self.subdomains = DistinctWindow(num_buckets)
+        self.ips = DistinctWindow(num_buckets)
+
+
+class SlidingWindowAggregator:
+    """
+    Time-bucketed, memory-bounded DNS traffic aggregation
+
+    Memory is fixed by configuration: num_buckets count-min sketches, plus
+    at most max_domains domain windows and max_sources client windows of
+    HyperLogLog registers (allocated only for buckets that saw traffic).
+    """
+
+    def __init__(self, window_seconds: float = 300, bucket_seconds: float = 30,
+                 max_domains: int = 20000, max_sources: int = 20000,
+                 cms_width: int = 4096, cms_depth: int = 4, hll_precision: int = 7):
+        """
+        Initialize aggregator
+
+        Args:
+            window_seconds: Length of the sliding window
+            bucket_seconds: Granularity the window slides by
+            max_domains: Registrable domains with distinct-count state (LRU beyond this)
+            max_sources: Client IPs with NXDOMAIN distinct-count state (LRU beyond this)
+            cms_width: Count-min sketch width
+            cms_depth: Count-min sketch depth
+            hll_precision: HyperLogLog precision for every distinct counter
+        """
+        if bucket_seconds <= 0 or window_seconds < bucket_seconds:
+            raise ValueError("need 0 < bucket_seconds <= window_seconds")
+
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = int(math.ceil(window_seconds / bucket_seconds))
+        self.window_seconds = self.num_buckets * bucket_seconds
+        self.max_domains = max_domains
+        self.max_sources = max_sources
+        self.hll_precision = hll_precision
+
+        # Per-bucket sketches plus their running sum over the live buckets
+        self.sketches = [CountMinSketch(cms_width, cms_depth) for _ in range(self.num_buckets)]
+        self.sketch_buckets = [-1] * self.num_buckets
+        self.window_counts = CountMinSketch(cms_width, cms_depth)
+        self.current_bucket = -1
+
+        self.domains: 'OrderedDict[str, DomainWindow]' = OrderedDict()
+        self.sources: 'OrderedDict[str, DistinctWindow]' = OrderedDict()
+
+        self.stats = {'observed': 0, 'late_events': 0, 'domains_evicted': 0, 'sources_evicted': 0}
+
+    def _advance(self, bucket: int):
+        """Slide the window to end at bucket, subtracting buckets that left it"""
+        self.current_bucket = bucket
+        oldest = bucket - self.num_buckets
+        for slot, sketch_bucket in enumerate(self.sketch_buckets):
+            if 0 <= sketch_bucket <= oldest:
+                self.window_counts.subtract(self.sketches[slot])
+                self.sketches[slot].clear()
+                self.sketch_buckets[slot] = -1
+
+    def _count(self, h1: int, h2: int, bucket: int):
+        """Count a domain in its bucket and the window"""
+        if bucket <= self.current_bucket - self.num_buckets:
+            return
+        slot = bucket % self.num_buckets
+        if self.sketch_buckets[slot] != bucket:
+            # Slots are emptied when their bucket expires, so this one is free
+            self.sketch_buckets[slot] = bucket
+        self.sketches[slot].add_hashed(h1, h2)
+        self.window_counts.add_hashed(h1, h2)
+
+    def _lru_get(self, table: OrderedDict, key: str, limit: int, factory, evicted_stat: str):
+        entry = table.get(key)
+        if entry is None:
+            entry = table[key] = factory(self.num_buckets)
+            if len(table) > limit:
+                table.popitem(last=False)
+                self.stats[evicted_stat] += 1
+        else:
+            table.move_to_end(key)
+        return entry
+
+    def query_count(self, h1: int, h2: int) -> int:
+        """Window query estimate for a domain hashed with key_hashes()"""
+        return self.window_counts.estimate_hashed(h1, h2)
+
+    def observe(self, query: str, ts: float, answers: Optional[List[str]] = None,
+                nxdomain: bool = False, source_ip: Optional[str] = None) -> WindowStats:
+        """
+        Account one DNS record and return the window statistics around it
+
+        Args:
+            query: Query name
+            ts: Event time (epoch seconds)
+            answers: Answer values; only IP addresses count toward distinct_ips
+            nxdomain: Whether the response was NXDOMAIN
+            source_ip: Querying client, for per-client NXDOMAIN spread
+
+        Returns:
+            WindowStats for the query's registrable domain
+        """
+        self.stats['observed'] += 1
+        name = query.rstrip('.').lower()
+        domain = registrable_domain(name)
+        bucket = int(ts // self.bucket_seconds)
+
+        if bucket > self.current_bucket:
+            self._advance(bucket)
+        elif bucket <= self.current_bucket - self.num_buckets:
+            self.stats['late_events'] += 1
+        current = self.current_bucket
+
+        h1, h2 = key_hashes(domain)
+        self._count(h1, h2, bucket)
+
+        precision = self.hll_precision
+        window = self._lru_get(self.domains, domain, self.max_domains, DomainWindow, 'domains_evicted')
+        window.subdomains.add_hash(key_hashes(name)[0], bucket, current, precision)
+        for answer in answers or ():
+            # Zeek answer vectors mix IPs with CNAME/MX/TXT targets
+            if answer and (answer[0].isdigit() or ':' in answer):
+                window.ips.add_hash(key_hashes(answer)[0], bucket, current, precision)
+
+        nxdomain_domains = 0
+        if nxdomain and source_ip:
+            spread = self._lru_get(self.sources, source_ip, self.max_sources, DistinctWindow, 'sources_evicted')
+            spread.add_hash(h1, bucket, current, precision)
+            nxdomain_domains = spread.count(current)
+
+        return WindowStats(
+            domain=domain,
+            queries=self.query_count(h1, h2),
+            distinct_subdomains=window.subdomains.count(current),
+            distinct_ips=window.ips.count(current),
+            nxdomain_domains=nxdomain_domains,
+            window_seconds=self.window_seconds,
+        )
+
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by sketches and registers"""
+        total = sum(sketch.table.itemsize * len(sketch.table) for sketch in self.sketches + [self.window_counts])
+        distincts = [distinct for window in self.domains.values() for distinct in (window.subdomains, window.ips)]
+        for distinct in distincts + list(self.sources.values()):
+            total += sum(len(r) for r in distinct.registers if r is not None)
+            total += len(distinct.union) if distinct.union is not None else 0
+        return total
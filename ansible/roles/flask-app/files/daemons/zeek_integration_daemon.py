@@ -30,7 +30,7 @@ import re
 import math
 import hashlib
 from datetime import datetime, timedelta
-from collections import defaultdict, Counter
+from collections import Counter, OrderedDict, namedtuple
 from typing import Dict, List, Optional, Tuple
 import logging
 
@@ -38,6 +38,8 @@ import logging
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from base_daemon import BaseDaemon
+from log_tailer import LogTailer
+from window_sketch import SlidingWindowAggregator, WindowStats, registrable_domain
 import psycopg2
 from psycopg2.extras import execute_batch
 
@@ -63,40 +65,60 @@ class ZeekLogParser:
         self.set_separator = ','
         self.empty_field = '(empty)'
         self.unset_field = '-'
+        self._header_generation = 0
 
-    def parse_header(self, file_handle):
-        """Parse Zeek log header to extract field definitions"""
-        for line in file_handle:
-            line = line.strip()
+        # Decoders compiled for the current header, keyed by (columnar, epoch_times)
+        self._decoders = {}
+        self._decoder = None
 
-            if line.startswith('#separator'):
-                # Extract separator (usually tab)
-                sep_hex = line.split()[-1]
-                self.separator = bytes.fromhex(sep_hex.replace('\\x', '')).decode('utf-8')
+    def parse_header_line(self, line: str) -> bool:
+        """
+        Apply one '#' header line (#separator, #fields, #types, ...)
 
-            elif line.startswith('#set_separator'):
-                # Extract set separator (for array fields)
-                self.set_separator = line.split()[-1]
+        Returns:
+            True if the line was a header/comment line
+        """
+        line = line.strip()
+        if not line.startswith('#'):
+            return False
 
-            elif line.startswith('#empty_field'):
-                self.empty_field = line.split()[-1]
+        # Any header change invalidates the compiled decoders
+        self._decoders = {}
+        self._decoder = None
 
-            elif line.startswith('#unset_field'):
-                self.unset_field = line.split()[-1]
+        if line.startswith('#separator'):
+            # Extract separator (usually tab)
+            sep_hex = line.split()[-1]
+            self.separator = bytes.fromhex(sep_hex.replace('\\x', '')).decode('utf-8')
 
-            elif line.startswith('#fields'):
-                # Extract field names
-                parts = line.split(self.separator)
-                self.fields = parts[1:]
+        elif line.startswith('#set_separator'):
+            # Extract set separator (for array fields)
+            self.set_separator = line.split()[-1]
 
-            elif line.startswith('#types'):
-                # Extract field types
-                parts = line.split(self.separator)
-                self.types = parts[1:]
+        elif line.startswith('#empty_field'):
+            self.empty_field = line.split()[-1]
 
-            elif not line.startswith('#'):
+        elif line.startswith('#unset_field'):
+            self.unset_field = line.split()[-1]
+
+        elif line.startswith('#fields'):
+            # Extract field names
+            parts = line.split(self.separator)
+            self.fields = parts[1:]
+
+        elif line.startswith('#types'):
+            # Extract field types
+            parts = line.split(self.separator)
+            self.types = parts[1:]
+
+        return True
+
+    def parse_header(self, file_handle):
+        """Parse Zeek log header to extract field definitions"""
+        for line in file_handle:
+            if not self.parse_header_line(line):
                 # End of header, return to start of data
-                return line
+                return line.strip()
 
         return None
 
@@ -104,6 +126,8 @@ class ZeekLogParser:
         """
         Parse a single log line into a dictionary
 
+        Uses the decoder compiled for the current header (see compile_decoder).
+
         Args:
             line: Raw log line
 
@@ -113,11 +137,15 @@ class ZeekLogParser:
         if line.startswith('#') or not line.strip():
             return None
 
-        parts = line.strip().split(self.separator)
+        return (self._decoder or self.compile_decoder())(line)
 
-        if len(parts) != len(self.fields):
-            return None
+    def parse_parts(self, parts: List[str]) -> Dict:
+        """
+        Interpret split field values one by one
 
+        Reference implementation of the type rules; compiled decoders fall
+        back to it for lines whose values don't convert cleanly.
+        """
         record = {}
         for i, field in enumerate(self.fields):
             value = parts[i]
@@ -161,42 +189,239 @@ class ZeekLogParser:
 
         return record
 
-    def tail_follow(self, callback, start_offset=None):
+    def _value_expression(self, i: int, epoch_times: bool) -> str:
+        """Python expression converting local v{i} per the field's type"""
+        field_type = self.types[i] if i < len(self.types) else 'string'
+        v = f"v{i}"
+
+        if field_type in ('count', 'int', 'port'):
+            converted = f"int({v})"
+        elif field_type in ('double', 'interval'):
+            converted = f"float({v})"
+        elif field_type == 'time':
+            converted = f"float({v})" if epoch_times else f"fromtimestamp(float({v}))"
+        elif field_type == 'bool':
+            converted = f"({v} == 't' or {v} == 'T')"
+        elif 'vector' in field_type or 'set' in field_type:
+            converted = f"({v}.split(SET_SEP) if {v} else [])"
+        else:
+            converted = v
+
+        return f"(None if {v} == UNSET else '' if {v} == EMPTY else {converted})"
+
+    def compile_decoder(self, columnar: bool = False, epoch_times: bool = False):
+        """
+        Compile the current #fields/#types header into a specialized decoder
+
+        The type dispatch is resolved once per header: the generated function
+        unpacks the split line into locals and converts each with an inline
+        expression. A line whose values fail to convert is re-decoded with
+        parse_parts(), so results match it exactly.
+
+        Args:
+            columnar: Build a block decoder returning (columns, rows) where
+                columns maps each field to a list of values
+            epoch_times: Keep 'time' fields as epoch floats instead of
+                datetimes (columnar decoders only)
+
+        Returns:
+            The decoder; the row decoder is also cached for parse_line()
+        """
+        key = (columnar, epoch_times)
+        decoder = self._decoders.get(key)
+        if decoder is not None:
+            return decoder
+
+        count = len(self.fields)
+        if not count:
+            # No #fields header yet: nothing can be decoded
+            decoder = (lambda lines: ({}, 0)) if columnar else (lambda line: None)
+            self._decoders[key] = decoder
+            return decoder
+
+        names = ', '.join(f"v{i}" for i in range(count)) + (',' if count == 1 else '')
+        values = [self._value_expression(i, epoch_times and columnar) for i in range(count)]
+
+        if not columnar:
+            items = ', '.join(f"{field!r}: {value}" for field, value in zip(self.fields, values))
+            source = (
+                "def decode(line):\n"
+                "    parts = line.strip().split(SEP)\n"
+                f"    if len(parts) != {count}:\n"
+                "        return None\n"
+                f"    {names} = parts\n"
+                "    try:\n"
+                f"        return {{{items}}}\n"
+                "    except CONVERSION_ERRORS:\n"
+                "        return parse_parts(parts)\n"
+            )
+        else:
+            source = [
+                "def decode_block(lines):",
+                *(f"    c{i} = []; a{i} = c{i}.append" for i in range(count)),
+                "    rows = 0",
+                "    for line in lines:",
+                "        line = line.strip()",
+                "        if not line or line[0] == '#':",
+                "            continue",
+                "        parts = line.split(SEP)",
+                f"        if len(parts) != {count}:",
+                "            continue",
+                f"        {names} = parts",
+                "        try:",
+                *(f"            r{i} = {value}" for i, value in enumerate(values)),
+                "        except CONVERSION_ERRORS:",
+                "            record = parse_parts(parts)",
+                *(f"            r{i} = record[{field!r}]" for i, field in enumerate(self.fields)),
+            ]
+            if epoch_times:
+                # parse_parts() returns datetimes; keep the column uniform
+                source += [
+                    f"            r{i} = r{i}.timestamp() if r{i} is not None and r{i} != '' else r{i}"
+                    for i in range(count) if i < len(self.types) and self.types[i] == 'time'
+                ]
+            source += [
+                *(f"        a{i}(r{i})" for i in range(count)),
+                "        rows += 1",
+                f"    return {{{', '.join(f'{field!r}: c{i}' for i, field in enumerate(self.fields))}}}, rows",
+            ]
+            source = '\n'.join(source) + '\n'
+
+        namespace = {
+            'SEP': self.separator,
+            'SET_SEP': self.set_separator,
+            'UNSET': self.unset_field,
+            'EMPTY': self.empty_field,
+            'fromtimestamp': datetime.fromtimestamp,
+            'parse_parts': self.parse_parts,
+            'CONVERSION_ERRORS': (ValueError, TypeError, OverflowError, OSError),
+        }
+        exec(compile(source, f"<zeek decoder {os.path.basename(self.log_file)}>", 'exec'), namespace)
+        decoder = namespace['decode_block' if columnar else 'decode']
+
+        self._decoders[key] = decoder
+        if key == (False, False):
+            self._decoder = decoder
+        return decoder
+
+    def decode_block(self, lines: List[str], epoch_times: bool = False) -> Tuple[Dict[str, List], int]:
+        """
+        Decode a block of data lines into columns
+
+        Header and blank lines are skipped, so apply headers before calling
+        this when a block may span a file boundary.
+
+        Args:
+            lines: Raw log lines
+            epoch_times: Keep 'time' fields as epoch floats
+
+        Returns:
+            (columns, rows) where columns maps each field to a list of row values
+        """
+        return self.compile_decoder(columnar=True, epoch_times=epoch_times)(lines)
+
+    def read_records(self, tailer: LogTailer, callback, max_lines: int = 100000) -> int:
+        """
+        Parse whatever the tailer has available (up to about max_lines lines)
+
+        Header lines in the stream (new file after rotation) update the field
+        definitions; when a file is resumed mid-way its header is read once
+        from the start of that file.
+
+        Args:
+            tailer: LogTailer following this log
+            callback: Function to call for each parsed record
+            max_lines: Stop after roughly this many lines so other logs get a turn
+
+        Returns:
+            Number of lines consumed
+        """
+        consumed = 0
+        while consumed < max_lines:
+            lines = tailer.read_lines()
+            if self._header_generation != tailer.generation:
+                self._header_generation = tailer.generation
+                if tailer.start_offset > 0:
+                    self.parse_header(tailer.read_prefix().splitlines())
+
+            if not lines:
+                break
+
+            decode = self._decoder
+            for line in lines:
+                if line.startswith('#'):
+                    self.parse_header_line(line)
+                    decode = None
+                    continue
+                if not line.strip():
+                    continue
+                if decode is None:
+                    decode = self.compile_decoder()
+                record = decode(line)
+                if record:
+                    callback(record)
+            consumed += len(lines)
+
+        return consumed
+
+    def tail_follow(self, callback, start_offset=None, tailer: Optional[LogTailer] = None,
+                    poll_interval: float = 0.5):
         """
         Follow log file like 'tail -f'
 
         Args:
             callback: Function to call for each parsed record
-            start_offset: File offset to start from (for resuming)
+            start_offset: File offset to start from (ignored when tailer has a checkpoint)
+            tailer: LogTailer to read through (default: an unpersisted one for log_file)
+            poll_interval: Seconds to sleep when no new data is available
+
+        Yields:
+            Offset after each block of records (commit the tailer to persist it)
         """
         if not os.path.exists(self.log_file):
             raise FileNotFoundError(f"Log file not found: {self.log_file}")
 
-        with open(self.log_file, 'r') as f:
-            # Parse header
-            first_data_line = self.parse_header(f)
+        tailer = tailer or LogTailer(self.log_file)
+        if start_offset and tailer.load_checkpoint() is None:
+            tailer.open_file(self.log_file, start_offset)
 
-            # Seek to start offset if resuming
-            if start_offset:
-                f.seek(start_offset)
-            elif first_data_line:
-                # Process first data line
-                record = self.parse_line(first_data_line)
-                if record:
-                    callback(record)
+        while True:
+            if self.read_records(tailer, callback):
+                yield tailer.offset
+            else:
+                yield tailer.offset
+                time.sleep(poll_interval)
 
-            # Follow file
-            while True:
-                line = f.readline()
 
-                if line:
-                    record = self.parse_line(line)
-                    if record:
-                        callback(record)
-                else:
-                    # No new data, remember position and sleep
-                    yield f.tell()
-                    time.sleep(0.1)
+# Runs of base64 alphabet characters long enough to look like encoded payload
+BASE64_RUN = re.compile(r'[A-Za-z0-9+/]{20,}')
+
+VOWELS = frozenset('aeiouAEIOU')
+
+# Character statistics of one label, computed from a single histogram
+LabelStats = namedtuple('LabelStats', ['length', 'entropy', 'vowels', 'consonants', 'digits'])
+
+
+def label_stats(label: str) -> LabelStats:
+    """
+    Entropy and vowel/consonant/digit counts of a label in one pass
+
+    Counter builds the character histogram in C; everything else iterates
+    over the distinct characters only.
+    """
+    length = len(label)
+    entropy = 0.0
+    vowels = consonants = digits = 0
+    for char, count in Counter(label).items():
+        p_x = count / length
+        entropy -= p_x * math.log2(p_x)
+        if char in VOWELS:
+            vowels += count
+        elif char.isalpha():
+            consonants += count
+        elif char.isdigit():
+            digits += count
+    return LabelStats(length, entropy, vowels, consonants, digits)
 
 
 class DNSAnomalyDetector:
@@ -209,10 +434,31 @@ class DNSAnomalyDetector:
     - Suspicious TLDs
     """
 
-    def __init__(self):
-        self.query_counts = defaultdict(int)
-        self.subdomain_counts = defaultdict(int)
-        self.last_cleanup = time.time()
+    def __init__(self, window: Optional[SlidingWindowAggregator] = None,
+                 subdomain_threshold: int = 50, query_threshold: int = 1000,
+                 ip_change_threshold: int = 20, nxdomain_threshold: int = 20,
+                 dga_cache_size: int = 100000):
+        """
+        Initialize detector
+
+        Args:
+            window: Sliding-window aggregator feeding the volume indicators
+            subdomain_threshold: Distinct names under one domain per window (tunneling)
+            query_threshold: Queries for one domain per window (excessive queries)
+            ip_change_threshold: Distinct answer IPs for one domain per window (fast-flux)
+            nxdomain_threshold: Distinct NXDOMAIN domains from one client per window (DGA)
+            dga_cache_size: Registrable domains whose DGA score is kept (LRU)
+        """
+        self.window = window or SlidingWindowAggregator()
+        self.subdomain_threshold = subdomain_threshold
+        self.query_threshold = query_threshold
+        self.ip_change_threshold = ip_change_threshold
+        self.nxdomain_threshold = nxdomain_threshold
+
+        # Static (traffic-independent) DGA scores per registrable domain
+        self.dga_cache: 'OrderedDict[str, Tuple[float, Tuple[str, ...]]]' = OrderedDict()
+        self.dga_cache_size = dga_cache_size
+        self.cache_stats = {'dga_hits': 0, 'dga_misses': 0}
 
         # Suspicious TLDs
         self.suspicious_tlds = {
@@ -234,27 +480,32 @@ class DNSAnomalyDetector:
         if len(base_domain) == 0:
             return 0.0
 
-        entropy = 0.0
-        for char in set(base_domain):
-            p_x = float(base_domain.count(char)) / len(base_domain)
-            if p_x > 0:
-                entropy += - p_x * math.log2(p_x)
-
-        return entropy
+        return label_stats(base_domain).entropy
 
-    def check_dns_tunneling(self, query: str, response_size: int = 0) -> Tuple[bool, float, List[str]]:
+    def observe(self, query: str, ts=None, answers: Optional[List[str]] = None,
+                rcode_name: Optional[str] = None, source_ip: Optional[str] = None) -> WindowStats:
         """
-        Check if DNS query might be tunneling
+        Account a DNS record in the sliding window
 
-        Indicators:
-        - Very long domain names
-        - High entropy in labels
-        - Excessive subdomain levels
-        - Large response sizes
+        Args:
+            query: Query name
+            ts: Record time (datetime or epoch seconds; now if missing)
+            answers: Answer values
+            rcode_name: Response code name
+            source_ip: Querying client
 
         Returns:
-            (is_suspicious, confidence, reasons)
+            WindowStats to pass to the check_* methods
         """
+        if isinstance(ts, datetime):
+            ts = ts.timestamp()
+        elif not isinstance(ts, (int, float)):
+            ts = time.time()
+
+        return self.window.observe(query, ts, answers, rcode_name == 'NXDOMAIN', source_ip)
+
+    def _tunneling_score(self, query: str) -> Tuple[float, List[str]]:
+        """Name-only tunneling indicators: one pass over the labels"""
         reasons = []
         confidence = 0.0
 
@@ -269,65 +520,96 @@ class DNSAnomalyDetector:
             reasons.append(f"Excessive subdomains: {len(labels)} levels")
             confidence += 0.3
 
-        # Check entropy of each label
+        # Check entropy of each label (excluding TLD and SLD) and look for
+        # base64-like runs, which never span a '.' so only long labels can hold one
         high_entropy_labels = 0
-        for label in labels[:-2]:  # Exclude TLD and SLD
-            if len(label) > 10:
-                entropy = self.calculate_entropy(label)
-                if entropy > 3.5:  # High randomness
-                    high_entropy_labels += 1
+        base64_like = False
+        last_subdomain = len(labels) - 2
+        for i, label in enumerate(labels):
+            if len(label) <= 10:
+                continue
+            if i < last_subdomain and label_stats(label).entropy > 3.5:  # High randomness
+                high_entropy_labels += 1
+            if not base64_like and len(label) >= 20 and BASE64_RUN.search(label):
+                base64_like = True
 
         if high_entropy_labels >= 2:
             reasons.append(f"High entropy in {high_entropy_labels} labels")
             confidence += 0.4
 
-        # Check for base64-like patterns
-        if re.search(r'[A-Za-z0-9+/]{20,}', query):
+        if base64_like:
             reasons.append("Base64-like encoding detected")
             confidence += 0.3
 
+        return confidence, reasons
+
+    def _finish_tunneling(self, confidence: float, reasons: List[str], response_size: int,
+                          stats: Optional[WindowStats]) -> Tuple[bool, float, List[str]]:
+        """Add response size and window indicators to a name-only tunneling score"""
         # Check response size
         if response_size > 1000:
             reasons.append(f"Large response size: {response_size} bytes")
             confidence += 0.2
 
+        if stats is not None:
+            if stats.distinct_subdomains >= self.subdomain_threshold:
+                reasons.append(f"Subdomain churn: ~{stats.distinct_subdomains} names under "
+                               f"{stats.domain} in {stats.window_seconds:g}s")
+                confidence += 0.3
+
+            if stats.queries >= self.query_threshold:
+                reasons.append(f"Excessive queries: ~{stats.queries} to {stats.domain} "
+                               f"in {stats.window_seconds:g}s")
+                confidence += 0.2
+
         is_suspicious = confidence >= 0.5
 
         return is_suspicious, min(confidence, 1.0), reasons
 
-    def check_dga(self, query: str) -> Tuple[bool, float, List[str]]:
+    def check_dns_tunneling(self, query: str, response_size: int = 0,
+                            stats: Optional[WindowStats] = None) -> Tuple[bool, float, List[str]]:
         """
-        Check if domain matches DGA patterns
+        Check if DNS query might be tunneling
 
-        DGA indicators:
-        - High entropy
-        - Unusual character distribution
-        - No dictionary words
-        - Suspicious TLD
+        Indicators:
+        - Very long domain names
+        - High entropy in labels
+        - Excessive subdomain levels
+        - Large response sizes
+        - Many distinct subdomains of one domain (window)
+        - Excessive queries to one domain (window)
 
         Returns:
-            (is_dga, confidence, reasons)
+            (is_suspicious, confidence, reasons)
         """
+        confidence, reasons = self._tunneling_score(query)
+        return self._finish_tunneling(confidence, reasons, response_size, stats)
+
+    def _dga_score(self, domain: str) -> Tuple[float, Tuple[str, ...]]:
+        """Static DGA score of a registrable domain, cached with LRU eviction"""
+        cached = self.dga_cache.get(domain)
+        if cached is not None:
+            self.dga_cache.move_to_end(domain)
+            self.cache_stats['dga_hits'] += 1
+            return cached
+        self.cache_stats['dga_misses'] += 1
+
         reasons = []
         confidence = 0.0
 
-        # Extract base domain
-        parts = query.split('.')
-        if len(parts) < 2:
-            return False, 0.0, []
-
+        parts = domain.split('.')
         base_domain = parts[0]
         tld = parts[-1]
+        stats = label_stats(base_domain)
 
         # Check length
-        if len(base_domain) > 15:
+        if stats.length > 15:
             reasons.append("Long domain name")
             confidence += 0.2
 
         # Check entropy
-        entropy = self.calculate_entropy(base_domain)
-        if entropy > 4.0:
-            reasons.append(f"High entropy: {entropy:.2f}")
+        if stats.entropy > 4.0:
+            reasons.append(f"High entropy: {stats.entropy:.2f}")
             confidence += 0.4
 
         # Check for suspicious TLD
@@ -336,33 +618,94 @@ class DNSAnomalyDetector:
             confidence += 0.2
 
         # Check vowel/consonant ratio
-        vowels = sum(1 for c in base_domain if c.lower() in 'aeiou')
-        consonants = sum(1 for c in base_domain if c.isalpha() and c.lower() not in 'aeiou')
-
-        if consonants > 0:
-            ratio = vowels / consonants
+        if stats.consonants > 0:
+            ratio = stats.vowels / stats.consonants
             if ratio < 0.2 or ratio > 2.0:
                 reasons.append(f"Unusual vowel/consonant ratio: {ratio:.2f}")
                 confidence += 0.2
 
         # Check for digit heavy domains
-        digits = sum(1 for c in base_domain if c.isdigit())
-        if digits > len(base_domain) * 0.3:
-            reasons.append(f"Heavy digit usage: {digits}/{len(base_domain)}")
+        if stats.digits > stats.length * 0.3:
+            reasons.append(f"Heavy digit usage: {stats.digits}/{stats.length}")
             confidence += 0.2
 
+        cached = self.dga_cache[domain] = (confidence, tuple(reasons))
+        if len(self.dga_cache) > self.dga_cache_size:
+            self.dga_cache.popitem(last=False)
+        return cached
+
+    def check_dga(self, query: str, stats: Optional[WindowStats] = None) -> Tuple[bool, float, List[str]]:
+        """
+        Check if domain matches DGA patterns
+
+        The name is scored on its registrable domain (example.com for
+        www.example.com), since that is what a DGA generates.
+
+        DGA indicators:
+        - High entropy
+        - Unusual character distribution
+        - No dictionary words
+        - Suspicious TLD
+        - Client resolving many distinct nonexistent domains (window)
+
+        Returns:
+            (is_dga, confidence, reasons)
+        """
+        domain = stats.domain if stats is not None else registrable_domain(query)
+        if '.' not in domain:
+            return False, 0.0, []
+
+        confidence, reasons = self._dga_score(domain)
+        reasons = list(reasons)
+
+        if stats is not None and stats.nxdomain_domains >= self.nxdomain_threshold:
+            reasons.append(f"NXDOMAIN spread: client hit ~{stats.nxdomain_domains} nonexistent "
+                           f"domains in {stats.window_seconds:g}s")
+            confidence += 0.3
+
         is_dga = confidence >= 0.6
 
         return is_dga, min(confidence, 1.0), reasons
 
-    def check_fast_flux(self, domain: str, answers: List[str]) -> Tuple[bool, float, List[str]]:
+    def score_batch(self, queries: List[str], response_sizes: Optional[List[int]] = None,
+                    stats: Optional[List[Optional[WindowStats]]] = None) -> List[Tuple[Tuple, Tuple]]:
+        """
+        Score a block of query names for tunneling and DGA in one pass
+
+        Names repeated within the batch are analyzed once, and DGA scores come
+        from the per-domain cache; the window indicators are applied per record.
+
+        Args:
+            queries: Query names
+            response_sizes: Response size per query (default 0)
+            stats: WindowStats per query from observe() (default none)
+
+        Returns:
+            (check_dns_tunneling result, check_dga result) per query
+        """
+        tunneling_scores = {}
+        results = []
+        for i, query in enumerate(queries):
+            window = stats[i] if stats else None
+
+            name_score = tunneling_scores.get(query)
+            if name_score is None:
+                name_score = tunneling_scores[query] = self._tunneling_score(query)
+            tunneling = self._finish_tunneling(name_score[0], list(name_score[1]),
+                                               response_sizes[i] if response_sizes else 0, window)
+
+            results.append((tunneling, self.check_dga(query, window)))
+        return results
+
+    def check_fast_flux(self, domain: str, answers: List[str],
+                        stats: Optional[WindowStats] = None) -> Tuple[bool, float, List[str]]:
         """
         Check for fast-flux DNS patterns
 
         Indicators:
         - Multiple A records
         - Short TTLs
-        - Frequent IP changes
+        - Frequent IP changes (window)
 
         Returns:
             (is_fast_flux, confidence, reasons)
@@ -391,6 +734,11 @@ class DNSAnomalyDetector:
                 reasons.append(f"High IP diversity: {len(networks)} networks")
                 confidence += 0.4
 
+        if stats is not None and stats.distinct_ips >= self.ip_change_threshold:
+            reasons.append(f"Frequent IP changes: ~{stats.distinct_ips} distinct IPs for "
+                           f"{stats.domain} in {stats.window_seconds:g}s")
+            confidence += 0.4
+
         is_fast_flux = confidence >= 0.6
 
         return is_fast_flux, min(confidence, 1.0), reasons
@@ -415,10 +763,22 @@ class ZeekIntegrationDaemon(BaseDaemon):
         self.http_log = os.path.join(self.zeek_log_dir, 'http.log')
         self.conn_log = os.path.join(self.zeek_log_dir, 'conn.log')
 
-        # Anomaly detector
-        self.anomaly_detector = DNSAnomalyDetector()
+        # Anomaly detector with a sliding window over recent DNS traffic
+        self.anomaly_detector = DNSAnomalyDetector(
+            SlidingWindowAggregator(
+                window_seconds=float(os.getenv('ZEEK_WINDOW_SECONDS', '300')),
+                bucket_seconds=float(os.getenv('ZEEK_WINDOW_BUCKET_SECONDS', '30')),
+                max_domains=int(os.getenv('ZEEK_WINDOW_MAX_DOMAINS', '20000')),
+                max_sources=int(os.getenv('ZEEK_WINDOW_MAX_SOURCES', '20000')),
+            ),
+            subdomain_threshold=int(os.getenv('ZEEK_SUBDOMAIN_THRESHOLD', '50')),
+            query_threshold=int(os.getenv('ZEEK_QUERY_THRESHOLD', '1000')),
+            ip_change_threshold=int(os.getenv('ZEEK_IP_CHANGE_THRESHOLD', '20')),
+            nxdomain_threshold=int(os.getenv('ZEEK_NXDOMAIN_THRESHOLD', '20')),
+        )
 
         # Batch processing
+        self.dns_pending = []
         self.dns_batch = []
         self.ssl_batch = []
         self.http_batch = []
@@ -434,111 +794,152 @@ class ZeekIntegrationDaemon(BaseDaemon):
             'errors': 0
         }
 
-        # File offsets for resuming
-        self.offsets = {
-            'dns': 0,
-            'ssl': 0,
-            'http': 0,
-            'conn': 0
-        }
+        # Durable tailers (inode/offset checkpoints) and their parsers, per log
+        self.checkpoint_dir = os.getenv('SENSOR_CHECKPOINT_DIR', '/var/lib/dnsscience/checkpoints')
+        self.max_lines_per_iteration = int(os.getenv('ZEEK_MAX_LINES_PER_ITERATION', '100000'))
+        self.tailers = {}
 
         self.logger.info("Zeek Integration Daemon initialized")
 
     def process_dns_record(self, record: Dict):
-        """Process a DNS log record"""
+        """Queue a DNS log record; records are scored in blocks of batch_size"""
+        if record.get('query'):
+            self.dns_pending.append(record)
+            if len(self.dns_pending) >= self.batch_size:
+                self.process_dns_pending()
+
+    def process_dns_pending(self):
+        """Score queued DNS records in one batch and add them to the DNS/anomaly batches"""
+        records, self.dns_pending = self.dns_pending, []
+        if not records:
+            return
+
+        # Window statistics (query rate, distinct subdomains/IPs) around each record
+        observed, window_stats = [], []
+        for record in records:
+            try:
+                window_stats.append(self.anomaly_detector.observe(
+                    record['query'], record.get('ts'), record.get('answers') or [],
+                    record.get('rcode_name', ''), record.get('id.orig_h')
+                ))
+                observed.append(record)
+            except Exception as e:
+                self.logger.error(f"Error processing DNS record: {e}")
+                self.stats['errors'] += 1
+        records = observed
+
+        queries = [record['query'] for record in records]
+        sizes = [len(str(record.get('answers', []))) for record in records]
+
+        # Tunneling and DGA checks for the whole block
         try:
-            # Extract fields
-            query = record.get('query', '')
-            qtype = record.get('qtype_name', '')
-            rcode = record.get('rcode_name', '')
-            answers = record.get('answers', [])
-            source_ip = record.get('id.orig_h')
-            dest_ip = record.get('id.resp_h')
-
-            if not query:
-                return
-
-            # Check for anomalies
-            is_suspicious = False
-            suspicion_reasons = []
-
-            # DNS tunneling check
-            is_tunnel, tunnel_conf, tunnel_reasons = self.anomaly_detector.check_dns_tunneling(
-                query, len(str(answers))
-            )
-            if is_tunnel:
-                is_suspicious = True
-                suspicion_reasons.extend(tunnel_reasons)
+            scores = self.anomaly_detector.score_batch(queries, sizes, window_stats)
+        except Exception as e:
+            # One bad record must not cost the block: score them one at a time
+            self.logger.error(f"Error scoring DNS batch, scoring per record: {e}")
+            scored = []
+            for record, query, size, stats in zip(records, queries, sizes, window_stats):
+                try:
+                    scored.append((record, stats, self.anomaly_detector.score_batch([query], [size], [stats])[0]))
+                except Exception as e:
+                    self.logger.error(f"Error scoring DNS record: {e}")
+                    self.stats['errors'] += 1
+            records = [record for record, _, _ in scored]
+            window_stats = [stats for _, stats, _ in scored]
+            scores = [score for _, _, score in scored]
+
+        for record, stats, (tunneling, dga) in zip(records, window_stats, scores):
+            try:
+                self.add_dns_record(record, stats, tunneling, dga)
+            except Exception as e:
+                self.logger.error(f"Error processing DNS record: {e}")
+                self.stats['errors'] += 1
+
+        # Flush batch if full
+        if len(self.dns_batch) >= self.batch_size:
+            self.flush_dns_batch()
 
-                # Add to anomaly batch
-                self.anomaly_batch.append({
-                    'anomaly_type': 'dns_tunneling',
-                    'domain': query,
-                    'source_ip': source_ip,
-                    'dest_ip': dest_ip,
-                    'confidence': tunnel_conf,
-                    'reasons': tunnel_reasons
-                })
+    def add_dns_record(self, record: Dict, window_stats: WindowStats, tunneling: Tuple, dga: Tuple):
+        """Add one scored DNS record (and any anomalies) to the batches"""
+        # Extract fields
+        query = record['query']
+        qtype = record.get('qtype_name', '')
+        rcode = record.get('rcode_name', '')
+        answers = record.get('answers') or []
+        source_ip = record.get('id.orig_h')
+        dest_ip = record.get('id.resp_h')
+
+        # Check for anomalies
+        is_suspicious = False
+        suspicion_reasons = []
+
+        # DNS tunneling check
+        is_tunnel, tunnel_conf, tunnel_reasons = tunneling
+        if is_tunnel:
+            is_suspicious = True
+            suspicion_reasons.extend(tunnel_reasons)
+
+            # Add to anomaly batch
+            self.anomaly_batch.append({
+                'anomaly_type': 'dns_tunneling',
+                'domain': query,
+                'source_ip': source_ip,
+                'dest_ip': dest_ip,
+                'confidence': tunnel_conf,
+                'reasons': tunnel_reasons
+            })
+
+        # DGA check
+        is_dga, dga_conf, dga_reasons = dga
+        if is_dga:
+            is_suspicious = True
+            suspicion_reasons.extend(dga_reasons)
+
+            self.anomaly_batch.append({
+                'anomaly_type': 'dga',
+                'domain': query,
+                'source_ip': source_ip,
+                'dest_ip': dest_ip,
+                'confidence': dga_conf,
+                'reasons': dga_reasons
+            })
 
-            # DGA check
-            is_dga, dga_conf, dga_reasons = self.anomaly_detector.check_dga(query)
-            if is_dga:
+        # Fast-flux check
+        if len(answers) > 0:
+            is_ff, ff_conf, ff_reasons = self.anomaly_detector.check_fast_flux(query, answers, window_stats)
+            if is_ff:
                 is_suspicious = True
-                suspicion_reasons.extend(dga_reasons)
+                suspicion_reasons.extend(ff_reasons)
 
                 self.anomaly_batch.append({
-                    'anomaly_type': 'dga',
+                    'anomaly_type': 'fast_flux',
                     'domain': query,
                     'source_ip': source_ip,
                     'dest_ip': dest_ip,
-                    'confidence': dga_conf,
-                    'reasons': dga_reasons
+                    'confidence': ff_conf,
+                    'reasons': ff_reasons
                 })
 
-            # Fast-flux check
-            if len(answers) > 0:
-                is_ff, ff_conf, ff_reasons = self.anomaly_detector.check_fast_flux(query, answers)
-                if is_ff:
-                    is_suspicious = True
-                    suspicion_reasons.extend(ff_reasons)
-
-                    self.anomaly_batch.append({
-                        'anomaly_type': 'fast_flux',
-                        'domain': query,
-                        'source_ip': source_ip,
-                        'dest_ip': dest_ip,
-                        'confidence': ff_conf,
-                        'reasons': ff_reasons
-                    })
-
-            # Add to DNS batch
-            self.dns_batch.append({
-                'timestamp': record.get('ts'),
-                'source_ip': source_ip,
-                'source_port': record.get('id.orig_p'),
-                'dest_ip': dest_ip,
-                'dest_port': record.get('id.resp_p'),
-                'query': query,
-                'query_type': qtype,
-                'answers': answers,
-                'response_code': rcode,
-                'transaction_id': record.get('trans_id'),
-                'authoritative': record.get('AA'),
-                'recursion_desired': record.get('RD'),
-                'recursion_available': record.get('RA'),
-                'is_suspicious': is_suspicious,
-                'suspicion_reasons': suspicion_reasons
-            })
-
-            self.stats['dns_logs_processed'] += 1
-
-            # Flush batch if full
-            if len(self.dns_batch) >= self.batch_size:
-                self.flush_dns_batch()
-
-        except Exception as e:
-            self.logger.error(f"Error processing DNS record: {e}")
-            self.stats['errors'] += 1
+        # Add to DNS batch
+        self.dns_batch.append({
+            'timestamp': record.get('ts'),
+            'source_ip': source_ip,
+            'source_port': record.get('id.orig_p'),
+            'dest_ip': dest_ip,
+            'dest_port': record.get('id.resp_p'),
+            'query': query,
+            'query_type': qtype,
+            'answers': answers,
+            'response_code': rcode,
+            'transaction_id': record.get('trans_id'),
+            'authoritative': record.get('AA'),
+            'recursion_desired': record.get('RD'),
+            'recursion_available': record.get('RA'),
+            'is_suspicious': is_suspicious,
+            'suspicion_reasons': suspicion_reasons
+        })
+
+        self.stats['dns_logs_processed'] += 1
 
     def process_ssl_record(self, record: Dict):
         """Process an SSL log record"""
@@ -749,32 +1150,46 @@ class ZeekIntegrationDaemon(BaseDaemon):
             self.logger.error(f"Error flushing anomaly batch: {e}")
             conn.rollback()
 
+    def get_tailer(self, name: str, log_file: str) -> Tuple[ZeekLogParser, LogTailer]:
+        """Parser and checkpointed tailer for a log, created on first use"""
+        if name not in self.tailers:
+            checkpoint = os.path.join(self.checkpoint_dir, f"zeek_{name}.json")
+            self.tailers[name] = (ZeekLogParser(log_file), LogTailer(log_file, checkpoint))
+        return self.tailers[name]
+
+    def get_sleep_duration(self, work_done):
+        """Keep reading while there is backlog; poll every second when caught up"""
+        return 0 if work_done else 1
+
+    def cleanup(self):
+        """Close tailed logs before the base cleanup"""
+        for _, tailer in self.tailers.values():
+            tailer.close()
+        super().cleanup()
+
     def process_iteration(self):
         """Main processing iteration"""
         work_done = False
 
         try:
             # Process DNS logs
-            if os.path.exists(self.dns_log):
-                parser = ZeekLogParser(self.dns_log)
-
-                try:
-                    for offset in parser.tail_follow(self.process_dns_record, self.offsets['dns']):
-                        self.offsets['dns'] = offset
-                        work_done = True
+            if 'dns' in self.tailers or os.path.exists(self.dns_log):
+                parser, tailer = self.get_tailer('dns', self.dns_log)
+                if parser.read_records(tailer, self.process_dns_record, self.max_lines_per_iteration):
+                    work_done = True
 
-                        # Break after processing some records to allow other logs to be processed
-                        if self.stats['dns_logs_processed'] % 100 == 0:
-                            break
-                except StopIteration:
-                    pass
-
-            # Flush any remaining batches
+            # Score what is still queued, then flush any remaining batches
+            self.process_dns_pending()
             self.flush_dns_batch()
             self.flush_ssl_batch()
             self.flush_http_batch()
             self.flush_anomaly_batch()
 
+            # Only advance checkpoints once everything read has been stored
+            if not (self.dns_batch or self.ssl_batch or self.http_batch or self.anomaly_batch):
+                for _, tailer in self.tailers.values():
+                    tailer.commit()
+
             # Log statistics every 1000 records
             if self.stats['dns_logs_processed'] % 1000 == 0:
                 self.logger.info(
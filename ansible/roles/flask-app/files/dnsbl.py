@@ -0,0 +1,200 @@
+"""
+DNSBL Engine for DNS Science
+Concurrent DNS blocklist checking shared by every caller in the process
+
+Features:
+- Every (target x zone) query runs concurrently on one bounded thread pool
+- IPv4 and IPv6 targets (reversed octets / nibbles) and domain targets
+- Listed and not-listed verdicts cached with per-zone TTLs (errors are not cached)
+- Concurrent callers asking for the same (target, zone) share one lookup
+- Batch API for checking many targets against many zones at once
+"""
+
+import dns.resolver
+import ipaddress
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Any
+
+
+def dnsbl_query_name(target: str, zone: str) -> str:
+    """
+    DNSBL query name for a target
+
+    IPs are reversed (1.2.3.4 -> 4.3.2.1.zone, IPv6 by nibble); anything
+    else is treated as a domain and prepended as-is (example.com.zone).
+    """
+    try:
+        ip_obj = ipaddress.ip_address(target)
+    except ValueError:
+        return f"{target.rstrip('.')}.{zone}"
+
+    if ip_obj.version == 4:
+        return f"{'.'.join(reversed(target.split('.')))}.{zone}"
+    return f"{'.'.join(reversed(ip_obj.exploded.replace(':', '')))}.{zone}"
+
+
+class DNSBLEngine:
+    """Concurrent, caching DNSBL lookups"""
+
+    def __init__(self, resolver: Optional[dns.resolver.Resolver] = None, max_workers: int = 64,
+                 cache_size: int = 200000, default_ttl: int = 900,
+                 zone_ttls: Optional[Dict[str, int]] = None):
+        """
+        Initialize DNSBL engine
+
+        Args:
+            resolver: Resolver to query through (default: system resolver, 3s timeout)
+            max_workers: DNS queries in flight at once across all callers
+            cache_size: Cached (target, zone) verdicts (LRU beyond this)
+            default_ttl: Seconds a verdict is cached for zones without their own TTL
+            zone_ttls: Per-zone verdict TTLs in seconds
+        """
+        if resolver is None:
+            resolver = dns.resolver.Resolver()
+            resolver.timeout = 3
+            resolver.lifetime = 5
+
+        self.resolver = resolver
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self.default_ttl = default_ttl
+        self.zone_ttls = zone_ttls or {}
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='dnsbl')
+        self._lock = threading.Lock()
+        self._cache: 'OrderedDict[Tuple[str, str], Tuple[float, Dict]]' = OrderedDict()
+        self._in_flight: Dict[Tuple[str, str], Future] = {}
+
+        self.stats = {'queries': 0, 'cache_hits': 0, 'shared_lookups': 0, 'errors': 0}
+
+    def _query(self, target: str, zone: str) -> Dict[str, Any]:
+        """Resolve one (target, zone) pair into a verdict"""
+        try:
+            answers = self.resolver.resolve(dnsbl_query_name(target, zone), 'A')
+            return {
+                'listed': True,
+                'response_codes': [str(rdata) for rdata in answers]
+            }
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+            return {'listed': False}
+        except Exception as e:
+            return {
+                'listed': None,
+                'error': str(e)
+            }
+
+    def _run(self, key: Tuple[str, str], future: Future):
+        """Pool task: query, cache the verdict and release waiting callers"""
+        try:
+            verdict = self._query(*key)
+        except BaseException as e:
+            verdict = {'listed': None, 'error': str(e)}
+
+        with self._lock:
+            self._in_flight.pop(key, None)
+            self.stats['queries'] += 1
+            if verdict['listed'] is None:
+                self.stats['errors'] += 1
+            else:
+                expires = time.monotonic() + self.zone_ttls.get(key[1], self.default_ttl)
+                self._cache[key] = (expires, verdict)
+                self._cache.move_to_end(key)
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        future.set_result(verdict)
+
+    def submit(self, target: str, zone: str) -> Future:
+        """
+        Start (or join) the lookup of one target in one zone
+
+        Returns:
+            Future resolving to {'listed': True/False/None, ...}; already
+            done when the verdict is cached
+        """
+        key = (target, zone)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                if cached[0] > time.monotonic():
+                    self._cache.move_to_end(key)
+                    self.stats['cache_hits'] += 1
+                    future = Future()
+                    future.set_result(cached[1])
+                    return future
+                del self._cache[key]
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.stats['shared_lookups'] += 1
+                return future
+
+            future = self._in_flight[key] = Future()
+
+        self._executor.submit(self._run, key, future)
+        return future
+
+    def lookup_many(self, pairs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Look up many (target, zone) pairs concurrently
+
+        Returns:
+            Verdict per (target, zone)
+        """
+        futures = {pair: self.submit(*pair) for pair in pairs}
+        return {pair: future.result() for pair, future in futures.items()}
+
+    def check(self, targets: Iterable[str], zones: List[str]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Check every target against every zone
+
+        Args:
+            targets: IP addresses and/or domains
+            zones: DNSBL zones
+
+        Returns:
+            {target: {zone: verdict}}
+        """
+        targets = list(dict.fromkeys(targets))
+        verdicts = self.lookup_many((target, zone) for target in targets for zone in zones)
+        return {target: {zone: verdicts[(target, zone)] for zone in zones} for target in targets}
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Lookup counters and cache size"""
+        with self._lock:
+            return dict(self.stats, cached=len(self._cache), in_flight=len(self._in_flight))
+
+
+# Process-wide engine, created on first use
+_engine_lock = threading.Lock()
+_shared_engine = None
+
+
+def get_dnsbl_engine() -> DNSBLEngine:
+    """
+    Get the process-wide DNSBL engine shared by every checker
+
+    Sized by DNSBL_MAX_WORKERS, DNSBL_CACHE_SIZE and DNSBL_CACHE_TTL;
+    DNSBL_ZONE_TTLS sets per-zone TTLs (e.g. "zen.spamhaus.org=300,bl.spamcop.net=600").
+    """
+    global _shared_engine
+    if _shared_engine is None:
+        with _engine_lock:
+            if _shared_engine is None:
+                zone_ttls = {}
+                for item in os.getenv('DNSBL_ZONE_TTLS', '').split(','):
+                    zone, _, ttl = item.strip().partition('=')
+                    if zone and ttl:
+                        zone_ttls[zone] = int(ttl)
+
+                _shared_engine = DNSBLEngine(
+                    max_workers=int(os.getenv('DNSBL_MAX_WORKERS', '64')),
+                    cache_size=int(os.getenv('DNSBL_CACHE_SIZE', '200000')),
+                    default_ttl=int(os.getenv('DNSBL_CACHE_TTL', '900')),
+                    zone_ttls=zone_ttls
+                )
+    return _shared_engine
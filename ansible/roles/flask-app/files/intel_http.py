@@ -0,0 +1,297 @@
+"""
+Intel HTTP Client for DNS Science
+Shared, pooled HTTP access to external intelligence APIs
+
+Features:
+- One requests.Session per process with keep-alive connection pools
+- Per-provider concurrency caps and token-bucket request quotas
+- TTL response cache keyed by provider and resource: in-process LRU,
+  backed by Redis when REDIS_HOST is set, so every web worker and daemon
+  shares what has already been paid for
+- Concurrent requests for the same resource share one upstream call
+
+Provider limits are configurable per provider through the environment:
+INTEL_<PROVIDER>_RATE (requests/second), INTEL_<PROVIDER>_BURST,
+INTEL_<PROVIDER>_CONCURRENCY and INTEL_<PROVIDER>_TTL (seconds).
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import redis
+except ImportError:  # Redis is optional; the in-process cache still works
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Default limits per provider: requests/second, burst, concurrent requests, cache TTL
+DEFAULT_PROVIDERS = {
+    'ipinfo': {'rate': 10, 'burst': 20, 'concurrency': 8, 'ttl': 86400},
+    'abuseipdb': {'rate': 1, 'burst': 10, 'concurrency': 4, 'ttl': 21600},
+    'ripestat': {'rate': 8, 'burst': 16, 'concurrency': 8, 'ttl': 3600},
+    'bgpview': {'rate': 2, 'burst': 5, 'concurrency': 4, 'ttl': 86400},
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket handing out reservations"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Initialize the bucket
+
+        Args:
+            rate: Refill rate in tokens per second
+            burst: Bucket capacity (defaults to one second worth of tokens, min 1)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = float(rate)
+        self.capacity = float(burst) if burst else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """
+        Reserve one token
+
+        Returns:
+            Seconds to wait before using it, or None (nothing reserved) if
+            that would be longer than max_wait
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+            if wait > max_wait:
+                return None
+            self.tokens -= 1
+            return wait
+
+
+class Provider:
+    """Limits for one upstream API"""
+
+    def __init__(self, name: str, rate: float, burst: float, concurrency: int, ttl: int):
+        self.name = name
+        self.ttl = ttl
+        self.bucket = TokenBucket(rate, burst)
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.stats = {'requests': 0, 'memory_hits': 0, 'redis_hits': 0, 'shared': 0,
+                      'throttled': 0, 'errors': 0}
+
+    @classmethod
+    def from_env(cls, name: str, defaults: Dict[str, float]) -> 'Provider':
+        prefix = f"INTEL_{name.upper()}_"
+        return cls(
+            name,
+            rate=float(os.getenv(prefix + 'RATE', defaults['rate'])),
+            burst=float(os.getenv(prefix + 'BURST', defaults['burst'])),
+            concurrency=int(os.getenv(prefix + 'CONCURRENCY', defaults['concurrency'])),
+            ttl=int(os.getenv(prefix + 'TTL', defaults['ttl']))
+        )
+
+
+class IntelHTTPClient:
+    """Pooled, rate-limited, caching JSON client for intelligence providers"""
+
+    def __init__(self, providers: Optional[Dict[str, Dict[str, float]]] = None,
+                 redis_client=None, cache_size: int = 50000, max_wait: float = 10.0,
+                 pool_size: int = 32):
+        """
+        Initialize client
+
+        Args:
+            providers: Limits per provider name (default DEFAULT_PROVIDERS, env overrides)
+            redis_client: Redis connection for the shared cache (None for in-process only)
+            cache_size: Responses kept in the in-process LRU
+            max_wait: Longest a request waits for quota before giving up
+            pool_size: Keep-alive connections kept per host
+        """
+        self.providers = {
+            name: Provider.from_env(name, limits)
+            for name, limits in (providers or DEFAULT_PROVIDERS).items()
+        }
+        self.redis = redis_client
+        self.cache_size = cache_size
+        self.max_wait = max_wait
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(self.providers) * 2, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._lock = threading.Lock()
+        self._cache: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+
+    def _provider(self, name: str) -> Provider:
+        provider = self.providers.get(name)
+        if provider is None:
+            with self._lock:
+                provider = self.providers.setdefault(
+                    name, Provider.from_env(name, {'rate': 5, 'burst': 10, 'concurrency': 4, 'ttl': 3600})
+                )
+        return provider
+
+    def _cache_get(self, key: str, provider: Provider) -> Optional[Any]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._cache.move_to_end(key)
+                    provider.stats['memory_hits'] += 1
+                    return entry[1]
+                del self._cache[key]
+
+        if self.redis is not None:
+            try:
+                cached = self.redis.get(key)
+                if cached is not None:
+                    ttl = self.redis.ttl(key)
+                    data = json.loads(cached)
+                    self._cache_put(key, data, ttl if ttl and ttl > 0 else provider.ttl, shared=False)
+                    provider.stats['redis_hits'] += 1
+                    return data
+            except Exception as e:
+                logger.debug(f"Redis cache read failed for {key}: {e}")
+        return None
+
+    def _cache_put(self, key: str, data: Any, ttl: int, shared: bool = True):
+        with self._lock:
+            self._cache[key] = (time.monotonic() + ttl, data)
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        if shared and self.redis is not None:
+            try:
+                self.redis.setex(key, ttl, json.dumps(data))
+            except Exception as e:
+                logger.debug(f"Redis cache write failed for {key}: {e}")
+
+    def _fetch(self, provider: Provider, url: str, params: Optional[Dict],
+               headers: Optional[Dict], timeout: float) -> Optional[Any]:
+        """One upstream request under the provider's quota and concurrency cap"""
+        wait = provider.bucket.reserve(self.max_wait)
+        if wait is None:
+            provider.stats['throttled'] += 1
+            return None
+        if wait:
+            time.sleep(wait)
+
+        with provider.slots:
+            provider.stats['requests'] += 1
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=timeout)
+                if response.status_code == 200:
+                    return response.json()
+                if response.status_code == 429:
+                    provider.stats['throttled'] += 1
+            except Exception as e:
+                logger.debug(f"{provider.name} request failed: {e}")
+            provider.stats['errors'] += 1
+            return None
+
+    def get_json(self, provider_name: str, resource: str, url: str, params: Optional[Dict] = None,
+                 headers: Optional[Dict] = None, ttl: Optional[int] = None, timeout: float = 5) -> Optional[Any]:
+        """
+        GET a JSON document, served from cache when possible
+
+        Args:
+            provider_name: Provider whose limits apply (ipinfo, ripestat, ...)
+            resource: Cache identity within the provider (e.g. "bgp-state:8.8.8.8");
+                must not include credentials
+            url: Request URL
+            params: Query parameters
+            headers: Request headers
+            ttl: Cache TTL override in seconds (default the provider's)
+            timeout: Request timeout
+
+        Returns:
+            Decoded JSON, or None on non-200 responses, errors or exhausted quota
+            (failures are not cached)
+        """
+        provider = self._provider(provider_name)
+        key = f"intel:{provider_name}:{resource}"
+
+        cached = self._cache_get(key, provider)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+            else:
+                provider.stats['shared'] += 1
+
+        if not owner:
+            return future.result()
+
+        data = None
+        try:
+            data = self._fetch(provider, url, params, headers, timeout)
+            if data is not None:
+                self._cache_put(key, data, ttl or provider.ttl)
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            future.set_result(data)
+        return data
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-provider counters and cache size"""
+        with self._lock:
+            cached = len(self._cache)
+        return {
+            'cached': cached,
+            'redis': self.redis is not None,
+            'providers': {name: dict(provider.stats) for name, provider in self.providers.items()}
+        }
+
+
+# Process-wide client, created on first use
+_client_lock = threading.Lock()
+_shared_client = None
+
+
+def get_intel_client() -> IntelHTTPClient:
+    """
+    Get the process-wide intel HTTP client
+
+    Uses Redis at REDIS_HOST/REDIS_PORT for the shared cache when configured
+    and INTEL_CACHE_SIZE for the in-process LRU.
+    """
+    global _shared_client
+    if _shared_client is None:
+        with _client_lock:
+            if _shared_client is None:
+                redis_client = None
+                if redis is not None and os.getenv('REDIS_HOST'):
+                    redis_client = redis.Redis(
+                        host=os.getenv('REDIS_HOST'),
+                        port=int(os.getenv('REDIS_PORT', '6379')),
+                        decode_responses=True,
+                        socket_timeout=1
+                    )
+                _shared_client = IntelHTTPClient(
+                    redis_client=redis_client,
+                    cache_size=int(os.getenv('INTEL_CACHE_SIZE', '50000'))
+                )
+    return _shared_client
@@ -12,17 +12,20 @@ Features:
 - Route validation (RPKI)
 """
 
-import requests
 import dns.resolver
 import dns.reversename
 import ipaddress
 import json
 import time
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 from datetime import datetime, timedelta
 import concurrent.futures
+import threading
 import os
 
+from dnsbl import DNSBLEngine, get_dnsbl_engine
+from intel_http import IntelHTTPClient, get_intel_client
+
 class IPIntelligenceEngine:
     """IP address intelligence and analysis engine"""
 
@@ -65,21 +68,18 @@ class IPIntelligenceEngine:
         self.resolver.timeout = 3
         self.resolver.lifetime = 5
 
-    def scan_ip(self, ip: str, full_scan: bool = True) -> Dict[str, Any]:
-        """
-        Comprehensive IP address scan
+        # Pooled, rate-limited, caching HTTP client for the intel APIs
+        self.http: IntelHTTPClient = self.config.get('http_client') or get_intel_client()
 
-        Args:
-            ip: IP address to scan
-            full_scan: If True, include all data sources (slower)
+        # DNSBL lookups (process-wide engine with a shared verdict cache by default)
+        self.dnsbl: DNSBLEngine = self.config.get('dnsbl_engine') or get_dnsbl_engine()
 
-        Returns:
-            Dictionary with complete IP intelligence
-        """
-        start_time = time.time()
-        ip_obj = ipaddress.ip_address(ip)
+        # Range scans: addresses scanned at once
+        self.range_concurrency = int(self.config.get('range_concurrency') or os.getenv('IP_RANGE_CONCURRENCY', '16'))
 
-        result = {
+    def _new_result(self, ip: str, ip_obj) -> Dict[str, Any]:
+        """Empty scan result for an address"""
+        return {
             'ip': ip,
             'scan_timestamp': datetime.utcnow().isoformat() + 'Z',
             'ip_version': ip_obj.version,
@@ -96,6 +96,22 @@ class IPIntelligenceEngine:
             'errors': []
         }
 
+    def scan_ip(self, ip: str, full_scan: bool = True) -> Dict[str, Any]:
+        """
+        Comprehensive IP address scan
+
+        Args:
+            ip: IP address to scan
+            full_scan: If True, include all data sources (slower)
+
+        Returns:
+            Dictionary with complete IP intelligence
+        """
+        start_time = time.time()
+        ip_obj = ipaddress.ip_address(ip)
+
+        result = self._new_result(ip, ip_obj)
+
         # Skip scanning private/special IPs
         if ip_obj.is_private or ip_obj.is_loopback or ip_obj.is_multicast:
             result['scan_duration_ms'] = int((time.time() - start_time) * 1000)
@@ -133,23 +149,7 @@ class IPIntelligenceEngine:
             # Collect results
             for key, future in futures.items():
                 try:
-                    data = future.result(timeout=10)
-                    if data:
-                        if key == 'ipinfo':
-                            self._process_ipinfo(result, data)
-                        elif key == 'abuseipdb':
-                            self._process_abuseipdb(result, data)
-                        elif key == 'ripestat_bgp':
-                            self._process_ripestat_bgp(result, data)
-                        elif key == 'bgpview':
-                            self._process_bgpview(result, data)
-                        elif key == 'whois':
-                            self._process_whois(result, data)
-                        elif key == 'rbl':
-                            self._process_rbl(result, data)
-                        elif key == 'ptr':
-                            result['reverse_dns'] = data
-                        result['data_sources'].append(key)
+                    self._apply_source(result, key, future.result(timeout=10))
                 except Exception as e:
                     result['errors'].append({
                         'source': key,
@@ -159,76 +159,89 @@ class IPIntelligenceEngine:
         result['scan_duration_ms'] = int((time.time() - start_time) * 1000)
         return result
 
+    def _apply_source(self, result: Dict, key: str, data: Optional[Dict]):
+        """Merge one data source's response into a scan result"""
+        if not data:
+            return
+
+        if key == 'ipinfo':
+            self._process_ipinfo(result, data)
+        elif key == 'abuseipdb':
+            self._process_abuseipdb(result, data)
+        elif key == 'ripestat_bgp':
+            self._process_ripestat_bgp(result, data)
+        elif key == 'bgpview':
+            self._process_bgpview(result, data)
+        elif key == 'whois':
+            self._process_whois(result, data)
+        elif key == 'rbl':
+            self._process_rbl(result, data)
+        elif key == 'ptr':
+            result['reverse_dns'] = data
+        result['data_sources'].append(key)
+
     def _get_ipinfo_data(self, ip: str) -> Optional[Dict]:
         """Get geolocation and network data from IPinfo.io"""
-        try:
-            url = self.ipinfo_url.format(ip=ip)
-            if self.ipinfo_token:
-                url += f"?token={self.ipinfo_token}"
-
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
-                return response.json()
-        except Exception as e:
-            return None
-        return None
+        params = {'token': self.ipinfo_token} if self.ipinfo_token else None
+        return self.http.get_json('ipinfo', ip, self.ipinfo_url.format(ip=ip), params=params)
 
     def _get_abuseipdb_data(self, ip: str) -> Optional[Dict]:
         """Get threat intelligence from AbuseIPDB"""
-        try:
-            headers = {
-                'Key': self.abuseipdb_key,
-                'Accept': 'application/json'
-            }
-            params = {
-                'ipAddress': ip,
-                'maxAgeInDays': 90,
-                'verbose': ''
-            }
-            response = requests.get(self.abuseipdb_url, headers=headers, params=params, timeout=5)
-            if response.status_code == 200:
-                return response.json()
-        except Exception as e:
-            return None
-        return None
+        headers = {
+            'Key': self.abuseipdb_key,
+            'Accept': 'application/json'
+        }
+        params = {
+            'ipAddress': ip,
+            'maxAgeInDays': 90,
+            'verbose': ''
+        }
+        return self.http.get_json('abuseipdb', ip, self.abuseipdb_url, params=params, headers=headers)
 
     def _get_ripestat_bgp(self, ip: str) -> Optional[Dict]:
         """Get BGP routing data from RIPEstat"""
-        try:
-            url = self.ripestat_url.format(endpoint='bgp-state')
-            params = {'resource': ip}
-            response = requests.get(url, params=params, timeout=5)
-            if response.status_code == 200:
-                return response.json()
-        except Exception as e:
-            return None
-        return None
+        url = self.ripestat_url.format(endpoint='bgp-state')
+        return self.http.get_json('ripestat', f'bgp-state:{ip}', url, params={'resource': ip})
 
     def _get_ripestat_whois(self, ip: str) -> Optional[Dict]:
         """Get WHOIS data from RIPEstat"""
-        try:
-            url = self.ripestat_url.format(endpoint='whois')
-            params = {'resource': ip}
-            response = requests.get(url, params=params, timeout=5)
-            if response.status_code == 200:
-                return response.json()
-        except Exception as e:
-            return None
-        return None
+        url = self.ripestat_url.format(endpoint='whois')
+        return self.http.get_json('ripestat', f'whois:{ip}', url, params={'resource': ip}, ttl=86400)
 
     def _get_bgpview_data(self, ip: str) -> Optional[Dict]:
         """Get BGP data from BGPView"""
-        try:
-            url = f"{self.bgpview_url}/ip/{ip}"
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
-                return response.json()
-        except Exception as e:
-            return None
-        return None
+        return self.http.get_json('bgpview', f'ip:{ip}', f"{self.bgpview_url}/ip/{ip}")
 
     def _check_rbls(self, ip: str) -> Dict[str, Any]:
-        """Check IP against multiple RBL/DNSBL lists"""
+        """Check IP against multiple RBL/DNSBL lists (all lists queried concurrently)"""
+        return self.check_rbls_batch([ip]).get(ip) or self._format_rbl_result({})
+
+    def check_rbls_batch(self, ips: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Check many IPs against every RBL/DNSBL list at once
+
+        All (IP x list) queries go through the DNSBL engine together, sharing
+        its cache and any lookups already in flight for other callers.
+
+        Args:
+            ips: IP addresses (invalid ones get an empty result)
+
+        Returns:
+            _check_rbls()-style result per IP
+        """
+        valid = []
+        for ip in ips:
+            try:
+                ipaddress.ip_address(ip)
+                valid.append(ip)
+            except ValueError:
+                pass
+
+        verdicts = self.dnsbl.check(valid, list(self.rbl_lists.values()))
+        return {ip: self._format_rbl_result(verdicts.get(ip, {})) for ip in ips}
+
+    def _format_rbl_result(self, verdicts: Dict[str, Dict]) -> Dict[str, Any]:
+        """Turn per-zone DNSBL verdicts into the RBL result shape"""
         results = {
             'listed_in': [],
             'not_listed_in': [],
@@ -236,36 +249,19 @@ class IPIntelligenceEngine:
             'details': {}
         }
 
-        # Reverse IP for DNS lookups
-        try:
-            ip_obj = ipaddress.ip_address(ip)
-            reversed_ip = '.'.join(reversed(ip.split('.')))
-        except Exception:
-            return results
-
         for rbl_name, rbl_domain in self.rbl_lists.items():
-            try:
-                query = f"{reversed_ip}.{rbl_domain}"
-                answers = self.resolver.resolve(query, 'A')
+            verdict = verdicts.get(rbl_domain)
+            if verdict is None:
+                continue
 
+            if verdict['listed']:
                 # Listed in RBL
-                response_codes = [str(rdata) for rdata in answers]
                 results['listed_in'].append(rbl_name)
                 results['hit_count'] += 1
-                results['details'][rbl_name] = {
-                    'listed': True,
-                    'response_codes': response_codes
-                }
-            except dns.resolver.NXDOMAIN:
+            elif verdict['listed'] is False:
                 # Not listed (this is good)
                 results['not_listed_in'].append(rbl_name)
-                results['details'][rbl_name] = {'listed': False}
-            except Exception as e:
-                # Query failed
-                results['details'][rbl_name] = {
-                    'listed': None,
-                    'error': str(e)
-                }
+            results['details'][rbl_name] = dict(verdict)
 
         return results
 
@@ -452,11 +448,9 @@ class IPIntelligenceEngine:
 
         try:
             # Get AS info from BGPView
-            url = f"{self.bgpview_url}/asn/{asn}"
-            response = requests.get(url, timeout=5)
+            data = self.http.get_json('bgpview', f'asn:{asn}', f"{self.bgpview_url}/asn/{asn}")
 
-            if response.status_code == 200:
-                data = response.json()
+            if data:
                 if 'data' in data:
                     as_data = data['data']
                     result['as_name'] = as_data.get('name')
@@ -467,11 +461,10 @@ class IPIntelligenceEngine:
                     result['abuse_contacts'] = as_data.get('abuse_contacts', [])
 
             # Get prefixes
-            prefix_url = f"{self.bgpview_url}/asn/{asn}/prefixes"
-            prefix_response = requests.get(prefix_url, timeout=5)
+            prefix_data = self.http.get_json('bgpview', f'asn-prefixes:{asn}',
+                                             f"{self.bgpview_url}/asn/{asn}/prefixes")
 
-            if prefix_response.status_code == 200:
-                prefix_data = prefix_response.json()
+            if prefix_data:
                 if 'data' in prefix_data:
                     ipv4 = prefix_data['data'].get('ipv4_prefixes', [])
                     ipv6 = prefix_data['data'].get('ipv6_prefixes', [])
@@ -482,74 +475,284 @@ class IPIntelligenceEngine:
 
         return result
 
-    def scan_ip_range(self, cidr: str, max_ips: int = 256) -> Dict[str, Any]:
+    def _parse_range(self, cidr: str, max_ips: int):
+        """Parse and size-check a range; raises ValueError with a user-facing message"""
+        try:
+            network = ipaddress.ip_network(cidr, strict=False)
+        except ValueError as e:
+            raise ValueError(f'Invalid CIDR: {str(e)}')
+
+        if network.num_addresses > max_ips:
+            raise ValueError(f'Range too large ({network.num_addresses} IPs). Maximum allowed: {max_ips}')
+        return network
+
+    def _scan_range_member(self, ip_obj, prefix: Optional[Dict]) -> Dict[str, Any]:
+        """
+        Scan one address of a range
+
+        Prefix-level data (BGP, WHOIS) comes from the shared prefix entry;
+        only the per-address sources are queried here.
+        """
+        start_time = time.time()
+        ip = str(ip_obj)
+        result = self._new_result(ip, ip_obj)
+
+        if prefix is None:
+            result['scan_duration_ms'] = int((time.time() - start_time) * 1000)
+            result['note'] = 'Private/special IP - limited scanning'
+            return result
+
+        result['shared_prefix'] = prefix['prefix']
+        for key in ('ripestat_bgp', 'whois'):
+            self._apply_source(result, key, prefix.get(key))
+
+        sources = []
+        if self.ipinfo_token:
+            sources.append(('ipinfo', self._get_ipinfo_data))
+        if self.abuseipdb_key:
+            sources.append(('abuseipdb', self._get_abuseipdb_data))
+        sources += [('rbl', self._check_rbls), ('ptr', self._get_ptr_record)]
+
+        for key, fetch in sources:
+            try:
+                self._apply_source(result, key, fetch(ip))
+            except Exception as e:
+                result['errors'].append({
+                    'source': key,
+                    'error': str(e)
+                })
+
+        result['scan_duration_ms'] = int((time.time() - start_time) * 1000)
+        return result
+
+    def iter_ip_range(self, cidr: str, max_ips: int = 256, concurrency: Optional[int] = None,
+                      prefix_cache: Optional['PrefixDataCache'] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Scan an IP range, yielding each address's result as it completes
+
+        BGP and WHOIS data are resolved once per covering announced prefix
+        and shared by its member addresses; PTR, RBL and the per-address
+        APIs run on a bounded thread pool, with each address's DNSBL queries
+        started on the DNSBL engine as soon as it is queued. At most two results per worker
+        are pending at a time, so memory stays flat for large ranges.
+
+        Args:
+            cidr: CIDR notation (e.g., "192.168.1.0/24")
+            max_ips: Maximum IPs to scan (safety limit)
+            concurrency: Addresses scanned at once (default range_concurrency)
+            prefix_cache: Shared prefix data (default a fresh PrefixDataCache)
+
+        Yields:
+            scan_ip()-style result dictionaries in completion order
+
+        Raises:
+            ValueError: Invalid CIDR or range larger than max_ips
+        """
+        network = self._parse_range(cidr, max_ips)
+        prefix_cache = prefix_cache or PrefixDataCache(self)
+        if not (network.is_private or network.is_loopback or network.is_multicast):
+            prefix_cache.seed(network)
+
+        workers = max(1, concurrency or self.range_concurrency)
+        rbl_zones = list(self.rbl_lists.values())
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        pending = set()
+        try:
+            for ip_obj in network.hosts():
+                prefix = None
+                if not (ip_obj.is_private or ip_obj.is_loopback or ip_obj.is_multicast):
+                    prefix = prefix_cache.lookup(ip_obj)
+                    # Start the DNSBL lookups now; the member's RBL check joins them
+                    for rbl_domain in rbl_zones:
+                        self.dnsbl.submit(str(ip_obj), rbl_domain)
+                pending.add(executor.submit(self._scan_range_member, ip_obj, prefix))
+
+                if len(pending) >= workers * 2:
+                    done, pending = concurrent.futures.wait(
+                        pending, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        yield future.result()
+
+            for future in concurrent.futures.as_completed(pending):
+                yield future.result()
+        finally:
+            # Consumer stopped early (e.g. client disconnected): drop queued scans
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def new_range_summary() -> Dict[str, Any]:
+        """Empty range scan summary"""
+        return {
+            'alive_ips': 0,
+            'threat_ips': 0,
+            'blacklisted_ips': 0,
+            'countries': {},
+            'asns': {}
+        }
+
+    @staticmethod
+    def update_range_summary(summary: Dict[str, Any], scan_result: Dict[str, Any]):
+        """Fold one address's scan result into a range summary"""
+        if scan_result.get('is_private'):
+            return
+
+        summary['alive_ips'] += 1
+
+        # Track threats
+        abuse_confidence = scan_result.get('reputation', {}).get('abuse_confidence', 0)
+        if abuse_confidence >= 75:
+            summary['threat_ips'] += 1
+
+        rbl_hits = scan_result.get('reputation', {}).get('blacklists', {}).get('hit_count', 0)
+        if rbl_hits > 0:
+            summary['blacklisted_ips'] += 1
+
+        # Track countries
+        country = scan_result.get('geolocation', {}).get('country')
+        if country:
+            summary['countries'][country] = summary['countries'].get(country, 0) + 1
+
+        # Track ASNs
+        asn = scan_result.get('network', {}).get('asn') or scan_result.get('bgp', {}).get('origin_asn')
+        if asn:
+            summary['asns'][asn] = summary['asns'].get(asn, 0) + 1
+
+    def scan_ip_range(self, cidr: str, max_ips: int = 256, concurrency: Optional[int] = None) -> Dict[str, Any]:
         """
         Scan an IP range (CIDR)
 
         Args:
             cidr: CIDR notation (e.g., "192.168.1.0/24")
             max_ips: Maximum IPs to scan (safety limit)
+            concurrency: Addresses scanned at once (default range_concurrency)
 
         Returns:
-            Dictionary with range scan results
+            Dictionary with range scan results (in address order)
         """
         try:
-            network = ipaddress.ip_network(cidr, strict=False)
+            network = self._parse_range(cidr, max_ips)
         except ValueError as e:
-            return {'error': f'Invalid CIDR: {str(e)}'}
+            return {'error': str(e)}
 
-        total_ips = network.num_addresses
-        if total_ips > max_ips:
-            return {
-                'error': f'Range too large ({total_ips} IPs). Maximum allowed: {max_ips}'
-            }
+        prefix_cache = PrefixDataCache(self)
+        summary = self.new_range_summary()
+        results = []
+        for scan_result in self.iter_ip_range(cidr, max_ips, concurrency, prefix_cache):
+            results.append(scan_result)
+            self.update_range_summary(summary, scan_result)
 
-        result = {
+        results.sort(key=lambda scan_result: ipaddress.ip_address(scan_result['ip']))
+
+        return {
             'cidr': str(network),
-            'total_ips': total_ips,
-            'scanned_ips': 0,
-            'results': [],
-            'summary': {
-                'alive_ips': 0,
-                'threat_ips': 0,
-                'blacklisted_ips': 0,
-                'countries': {},
-                'asns': {}
-            }
+            'total_ips': network.num_addresses,
+            'scanned_ips': len(results),
+            'results': results,
+            'summary': summary,
+            'prefixes': prefix_cache.describe()
         }
 
-        # Scan each IP
-        for ip in network.hosts():
-            ip_str = str(ip)
-            scan_result = self.scan_ip(ip_str, full_scan=False)
-
-            result['results'].append(scan_result)
-            result['scanned_ips'] += 1
-
-            # Update summary
-            if not scan_result.get('is_private'):
-                result['summary']['alive_ips'] += 1
 
-                # Track threats
-                abuse_confidence = scan_result.get('reputation', {}).get('abuse_confidence', 0)
-                if abuse_confidence >= 75:
-                    result['summary']['threat_ips'] += 1
+class PrefixDataCache:
+    """
+    Prefix-level data shared across the addresses of a range scan
+
+    RIPEstat BGP state for the whole range is fetched once up front to learn
+    the announced prefixes; WHOIS is fetched once per prefix. Addresses not
+    covered by a known prefix trigger one per-address BGP lookup whose
+    prefix then covers its neighbours. Unannounced space is shared per /24
+    (IPv4) or /48 (IPv6) so it does not fall back to per-address lookups.
+    """
+
+    UNANNOUNCED_PREFIX_LENGTH = {4: 24, 6: 48}
+
+    def __init__(self, engine: IPIntelligenceEngine):
+        self.engine = engine
+        self.entries: Dict[Any, Dict] = {}
+        self.prefix_lengths = {4: set(), 6: set()}
+        self.lock = threading.Lock()
+        self.stats = {'bgp_lookups': 0, 'whois_lookups': 0, 'shared_hits': 0}
+
+    def _add(self, prefix, bgp_data: Optional[Dict], announced: bool) -> Dict:
+        entry = self.entries.get(prefix)
+        if entry is None:
+            entry = self.entries[prefix] = {
+                'prefix': str(prefix),
+                'announced': announced,
+                'ripestat_bgp': bgp_data,
+                'whois': None,
+                'whois_fetched': False,
+                'members': 0
+            }
+            self.prefix_lengths[prefix.version].add(prefix.prefixlen)
+        return entry
 
-                rbl_hits = scan_result.get('reputation', {}).get('blacklists', {}).get('hit_count', 0)
-                if rbl_hits > 0:
-                    result['summary']['blacklisted_ips'] += 1
+    def seed(self, network):
+        """Learn every announced prefix overlapping the range with one BGP state query"""
+        self.stats['bgp_lookups'] += 1
+        data = self.engine._get_ripestat_bgp(str(network))
+        routes = ((data or {}).get('data') or {}).get('bgp_state') or []
 
-                # Track countries
-                country = scan_result.get('geolocation', {}).get('country')
-                if country:
-                    result['summary']['countries'][country] = result['summary']['countries'].get(country, 0) + 1
+        for route in routes:
+            try:
+                prefix = ipaddress.ip_network(route.get('target_prefix'), strict=False)
+            except (TypeError, ValueError):
+                continue
+            if prefix.version == network.version and prefix.overlaps(network):
+                # One route per prefix is enough: _process_ripestat_bgp uses the first
+                self._add(prefix, {'data': {'bgp_state': [route]}}, True)
+
+    def _find(self, ip_obj) -> Optional[Dict]:
+        """Longest known prefix covering an address"""
+        for length in sorted(self.prefix_lengths[ip_obj.version], reverse=True):
+            entry = self.entries.get(ipaddress.ip_network((ip_obj, length), strict=False))
+            if entry is not None:
+                return entry
+        return None
 
-                # Track ASNs
-                asn = scan_result.get('network', {}).get('asn')
-                if asn:
-                    result['summary']['asns'][asn] = result['summary']['asns'].get(asn, 0) + 1
+    def lookup(self, ip_obj) -> Dict:
+        """
+        Shared prefix entry for an address, resolving BGP/WHOIS on first use
 
-        return result
+        Returns:
+            Entry with 'prefix', 'ripestat_bgp' and 'whois' data
+        """
+        with self.lock:
+            entry = self._find(ip_obj)
+            if entry is None:
+                self.stats['bgp_lookups'] += 1
+                data = self.engine._get_ripestat_bgp(str(ip_obj))
+                routes = ((data or {}).get('data') or {}).get('bgp_state') or []
+                prefix = None
+                if routes:
+                    try:
+                        prefix = ipaddress.ip_network(routes[0].get('target_prefix'), strict=False)
+                    except (TypeError, ValueError):
+                        prefix = None
+                if prefix is not None and ip_obj in prefix:
+                    entry = self._add(prefix, data, True)
+                else:
+                    length = self.UNANNOUNCED_PREFIX_LENGTH[ip_obj.version]
+                    entry = self._add(ipaddress.ip_network((ip_obj, length), strict=False), data, False)
+            else:
+                self.stats['shared_hits'] += 1
+
+            if not entry['whois_fetched']:
+                # Announced prefixes share their covering WHOIS object; unannounced blocks use the first address
+                self.stats['whois_lookups'] += 1
+                entry['whois'] = self.engine._get_ripestat_whois(entry['prefix'] if entry['announced'] else str(ip_obj))
+                entry['whois_fetched'] = True
+
+            entry['members'] += 1
+            return entry
+
+    def describe(self) -> List[Dict[str, Any]]:
+        """Prefixes that covered scanned addresses"""
+        return [
+            {'prefix': entry['prefix'], 'announced': entry['announced'], 'scanned_ips': entry['members']}
+            for entry in self.entries.values() if entry['members']
+        ]
 
 
 # Convenience functions
@@ -559,10 +762,11 @@ def scan_ip(ip: str, config: Optional[Dict] = None) -> Dict[str, Any]:
     return engine.scan_ip(ip)
 
 
-def scan_ip_range(cidr: str, config: Optional[Dict] = None, max_ips: int = 256) -> Dict[str, Any]:
+def scan_ip_range(cidr: str, config: Optional[Dict] = None, max_ips: int = 256,
+                  concurrency: Optional[int] = None) -> Dict[str, Any]:
     """Scan an IP range"""
     engine = IPIntelligenceEngine(config)
-    return engine.scan_ip_range(cidr, max_ips)
+    return engine.scan_ip_range(cidr, max_ips, concurrency)
 
 
 def get_asn_info(asn: int, config: Optional[Dict] = None) -> Dict[str, Any]:
@@ -8,7 +8,8 @@ Useful for tracking spammers and email security research.
 import dns.resolver
 import requests
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from dnsbl import get_dnsbl_engine
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -74,32 +75,16 @@ class ReputationChecker:
             'errors': []
         }
 
-        # Reverse IP for DNSBL lookup (1.2.3.4 -> 4.3.2.1)
-        reversed_ip = '.'.join(reversed(ip_address.split('.')))
-
-        def check_single_dnsbl(dnsbl):
-            query = f"{reversed_ip}.{dnsbl}"
-            try:
-                self.resolver.resolve(query, 'A')
-                return ('listed', dnsbl)
-            except dns.resolver.NXDOMAIN:
-                return ('clean', dnsbl)
-            except Exception as e:
-                return ('error', dnsbl, str(e))
-
-        # Check all DNSBLs in parallel
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            futures = {executor.submit(check_single_dnsbl, dnsbl): dnsbl
-                      for dnsbl in DNSBLS}
-
-            for future in as_completed(futures):
-                result = future.result()
-                if result[0] == 'listed':
-                    results['listed_in'].append(result[1])
-                elif result[0] == 'clean':
-                    results['clean_in'].append(result[1])
-                else:
-                    results['errors'].append(f"{result[1]}: {result[2]}")
+        # Check all DNSBLs in parallel (shared engine: cached and de-duplicated across callers)
+        verdicts = get_dnsbl_engine().check([ip_address], DNSBLS)[ip_address]
+        for dnsbl in DNSBLS:
+            verdict = verdicts[dnsbl]
+            if verdict['listed']:
+                results['listed_in'].append(dnsbl)
+            elif verdict['listed'] is False:
+                results['clean_in'].append(dnsbl)
+            else:
+                results['errors'].append(f"{dnsbl}: {verdict['error']}")
 
         results['is_blacklisted'] = len(results['listed_in']) > 0
         results['blacklist_count'] = len(results['listed_in'])
@@ -8,8 +8,10 @@ Supports: HTTPS (443), SMTP (25, 587), IMAPS (993), POP3S (995), LDAPS (636)
 import ssl
 import socket
 import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
 from config import Config
 
@@ -37,8 +39,18 @@ class SSLCertificateChecker:
         636: 'ldaps'
     }
 
-    def __init__(self, timeout=10):
+    def __init__(self, timeout=10, concurrent=None, probe_timeout=None, sweep_deadline=None):
+        """
+        Args:
+            timeout: Per-port connect/handshake timeout for sequential checks
+            concurrent: Sweep all ports in parallel (default: Config.SSL_CONCURRENT_SWEEP)
+            probe_timeout: TCP connect timeout used to skip closed/filtered ports in a sweep
+            sweep_deadline: Overall deadline in seconds for a concurrent sweep
+        """
         self.timeout = timeout
+        self.concurrent = Config.SSL_CONCURRENT_SWEEP if concurrent is None else concurrent
+        self.probe_timeout = probe_timeout or Config.SSL_PROBE_TIMEOUT
+        self.sweep_deadline = sweep_deadline or Config.SSL_SWEEP_DEADLINE
 
     def get_certificate(self, hostname: str, port: int, starttls_protocol: Optional[str] = None) -> Optional[Dict]:
         """
@@ -89,6 +101,67 @@ class SSLCertificateChecker:
 
         return None
 
+    def _connect(self, addresses: List[Tuple], port: int, timeout: float) -> socket.socket:
+        """TCP connect to the first reachable address (same order as create_connection)"""
+        last_error = None
+        for family, socktype, proto, _, sockaddr in addresses:
+            sock = socket.socket(family, socktype, proto)
+            sock.settimeout(timeout)
+            try:
+                sock.connect((sockaddr[0], port) + tuple(sockaddr[2:]))
+                return sock
+            except OSError as e:
+                last_error = e
+                sock.close()
+        raise last_error or socket.error(f"No addresses to connect to for port {port}")
+
+    def _fetch_certificate(self, hostname: str, addresses: List[Tuple], port: int,
+                           starttls_protocol: Optional[str], deadline: float) -> Tuple[Optional[bytes], Dict, Optional[str]]:
+        """
+        Probe a port with a short TCP connect, then fetch its certificate on the same socket.
+
+        Returns:
+            (cert_der, cert_dict, skip_reason); skip_reason is set when the port was closed/filtered
+        """
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None, {}, 'deadline'
+
+        try:
+            sock = self._connect(addresses, port, min(self.probe_timeout, remaining))
+        except (socket.timeout, OSError) as e:
+            logger.debug(f"Port probe failed on {hostname}:{port}: {e}")
+            return None, {}, 'closed'
+
+        try:
+            # Port is open: allow the handshake whatever time is left in the sweep
+            sock.settimeout(max(0.1, min(self.timeout, deadline - time.monotonic())))
+
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE  # We want to get cert even if invalid
+
+            if starttls_protocol == 'smtp' and port in [25, 587]:
+                sock = self._smtp_starttls(sock, hostname)
+
+            with context.wrap_socket(sock, server_hostname=hostname) as ssock:
+                cert_der = ssock.getpeercert(binary_form=True)
+                cert_dict = ssock.getpeercert()
+                return cert_der, cert_dict if cert_dict else {}, None
+
+        except socket.timeout:
+            logger.debug(f"Timeout on {hostname}:{port}")
+        except socket.error as e:
+            logger.debug(f"Socket error on {hostname}:{port}: {e}")
+        except ssl.SSLError as e:
+            logger.debug(f"SSL error on {hostname}:{port}: {e}")
+        except Exception as e:
+            logger.debug(f"Error getting certificate from {hostname}:{port}: {e}")
+        finally:
+            sock.close()
+
+        return None, {}, None
+
     def _smtp_starttls(self, sock: socket.socket, hostname: str) -> socket.socket:
         """Perform SMTP STARTTLS handshake"""
         sock.recv(1024)  # Welcome banner
@@ -347,6 +420,9 @@ class SSLCertificateChecker:
         """
         logger.info(f"Checking SSL certificates for {domain}")
 
+        if self.concurrent:
+            return self.sweep_domain(domain)
+
         results = {
             'domain': domain,
             'certificates': [],
@@ -366,20 +442,99 @@ class SSLCertificateChecker:
             cert_info = self.get_certificate(domain, port, starttls_protocol=starttls)
 
             if cert_info:
-                results['certificates'].append(cert_info)
-                results['ports_with_ssl'].append(port)
-                results['total_certificates'] += 1
-
-                # Track expiry issues
-                if cert_info.get('is_expired'):
-                    results['has_expired_certs'] = True
-
-                if cert_info.get('days_until_expiry') is not None:
-                    if 0 < cert_info['days_until_expiry'] < 30:
-                        results['expiring_soon'].append({
-                            'port': port,
-                            'days': cert_info['days_until_expiry']
-                        })
+                self._add_certificate(results, cert_info, port)
+
+        return results
+
+    @staticmethod
+    def _add_certificate(results: Dict, cert_info: Dict, port: int):
+        """Record a port's certificate and its expiry issues in a check_domain() result"""
+        results['certificates'].append(cert_info)
+        results['ports_with_ssl'].append(port)
+        results['total_certificates'] += 1
+
+        # Track expiry issues
+        if cert_info.get('is_expired'):
+            results['has_expired_certs'] = True
+
+        if cert_info.get('days_until_expiry') is not None:
+            if 0 < cert_info['days_until_expiry'] < 30:
+                results['expiring_soon'].append({
+                    'port': port,
+                    'days': cert_info['days_until_expiry']
+                })
+
+    def sweep_domain(self, domain: str) -> Dict:
+        """
+        Check all SSL ports for a domain concurrently under one overall deadline.
+
+        The hostname is resolved once, each port is pre-probed with a short TCP
+        connect so closed or filtered ports are skipped quickly, and a
+        certificate presented on several ports is parsed only once.
+
+        Args:
+            domain: Domain name to check
+
+        Returns:
+            Same structure as check_domain(), plus ports_skipped and deadline_exceeded
+        """
+        results = {
+            'domain': domain,
+            'certificates': [],
+            'ports_checked': list(self.SSL_PORTS.keys()),
+            'ports_with_ssl': [],
+            'ports_skipped': [],
+            'total_certificates': 0,
+            'has_expired_certs': False,
+            'expiring_soon': [],  # Certs expiring in < 30 days
+            'deadline_exceeded': False
+        }
+
+        deadline = time.monotonic() + self.sweep_deadline
+
+        try:
+            addresses = socket.getaddrinfo(domain, None, type=socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            logger.debug(f"Could not resolve {domain}: {e}")
+            results['ports_skipped'] = list(self.SSL_PORTS.keys())
+            return results
+
+        executor = ThreadPoolExecutor(max_workers=len(self.SSL_PORTS),
+                                      thread_name_prefix='ssl-sweep')
+        try:
+            futures = {
+                port: executor.submit(self._fetch_certificate, domain, addresses, port,
+                                      'smtp' if port in [25, 587] else None, deadline)
+                for port in self.SSL_PORTS
+            }
+            _, not_done = wait(futures.values(), timeout=max(0, deadline - time.monotonic()))
+            results['deadline_exceeded'] = bool(not_done)
+        finally:
+            # Stragglers are bounded by the deadline via their socket timeouts
+            executor.shutdown(wait=False)
+
+        parsed_by_der = {}
+        for port in self.SSL_PORTS:
+            future = futures[port]
+            if not future.done():
+                results['ports_skipped'].append(port)
+                continue
+
+            cert_der, cert_dict, skip_reason = future.result()
+            if skip_reason:
+                results['ports_skipped'].append(port)
+            if not cert_der:
+                continue
+
+            # Reuse the parse when the same certificate is served on several ports
+            fingerprint = hashlib.sha256(cert_der).digest()
+            if fingerprint not in parsed_by_der:
+                parsed_by_der[fingerprint] = self._parse_certificate(cert_der, cert_dict, domain, port)
+
+            cert_info = dict(parsed_by_der[fingerprint])
+            cert_info['port'] = port
+            cert_info['service'] = self.SSL_PORTS.get(port, 'unknown')
+            self._add_certificate(results, cert_info, port)
 
         return results
 
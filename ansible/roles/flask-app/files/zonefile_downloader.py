@@ -13,8 +13,14 @@ Free/Public Zone Files:
 import os
 import requests
 import gzip
+import heapq
+import mmap
+import shutil
 import logging
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 
 logging.basicConfig(level=logging.INFO)
@@ -171,67 +177,423 @@ class ZoneFileDownloader:
             return None
 
 
+# Plain zone files larger than this are split across worker processes
+SPLIT_THRESHOLD = 256 * 1024 * 1024
+
+# Unique domains held in memory per sorted on-disk chunk
+DEFAULT_CHUNK_SIZE = 2000000
+
+
+def _is_gzip(zone_file_path):
+    """Detect gzip by magic bytes rather than file extension"""
+    with open(zone_file_path, 'rb') as f:
+        return f.read(2) == b'\x1f\x8b'
+
+
+def _open_zone(zone_file_path):
+    """Open a zone file as text, transparently handling gzip"""
+    if _is_gzip(zone_file_path):
+        return gzip.open(zone_file_path, 'rt', encoding='utf-8', errors='replace')
+    return open(zone_file_path, 'r', encoding='utf-8', errors='replace')
+
+
+def _absolute(name, origin):
+    """Resolve an owner name against $ORIGIN ('@', relative and absolute names)"""
+    if name == '@':
+        return origin
+    if name.endswith('.'):
+        return name
+    return f"{name}.{origin}" if origin else f"{name}."
+
+
+def _strip_comment(line):
+    """Remove a trailing ; comment, ignoring semicolons inside quoted strings"""
+    if '"' not in line:
+        return line.split(';', 1)[0]
+
+    in_quotes = False
+    for i, char in enumerate(line):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == ';' and not in_quotes:
+            return line[:i]
+    return line
+
+
+def _write_sorted_chunk(domains, chunk_dir, index):
+    """Write one sorted chunk of unique domains and return its path"""
+    path = Path(chunk_dir) / f"chunk-{os.getpid()}-{index:05d}.txt"
+    with open(path, 'w') as f:
+        for domain in sorted(domains):
+            f.write(f"{domain}\n")
+    return str(path)
+
+
+def _parse_to_chunks(task):
+    """Process-pool entry point: parse one zone (or byte range) into sorted chunk files"""
+    zone_file_path, start, end, origin, apex, chunk_dir, chunk_size = task
+
+    chunks = []
+    pending = set()
+    for domain in ZoneFileParser.iter_zone_domains(zone_file_path, origin=origin, apex=apex,
+                                                   start=start, end=end):
+        pending.add(domain)
+        if len(pending) >= chunk_size:
+            chunks.append(_write_sorted_chunk(pending, chunk_dir, len(chunks)))
+            pending = set()
+
+    if pending:
+        chunks.append(_write_sorted_chunk(pending, chunk_dir, len(chunks)))
+    return chunks
+
+
 class ZoneFileParser:
     """Parse zone files to extract domain names"""
 
     @staticmethod
-    def parse_zone_file(zone_file_path, output_file=None, limit=None):
+    def detect_origin(zone_file_path):
         """
-        Parse a zone file and extract domain names.
+        Determine the zone apex of a zone file.
+
+        Uses the first $ORIGIN or SOA owner in the first few thousand lines,
+        falling back to the file name (com.zone.gz -> com.).
+
+        Returns:
+            Absolute apex name (e.g. 'com.')
+        """
+        origin = None
+        with _open_zone(zone_file_path) as f:
+            for line in islice(f, 5000):
+                if line.startswith('$ORIGIN'):
+                    parts = line.split()
+                    if len(parts) >= 2:
+                        return _absolute(parts[1].lower(), None)
+                fields = _strip_comment(line).split()
+                if line[:1] not in ('', ' ', '\t', ';', '$') and len(fields) >= 3 and 'soa' in (
+                        field.lower() for field in fields[1:4]):
+                    return _absolute(fields[0].lower(), origin)
+
+        name = Path(zone_file_path).name.lower()
+        for suffix in ('.gz', '.txt', '.zone'):
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
+        return f"{name}." if name else None
+
+    @staticmethod
+    def iter_zone_domains(zone_file_path, origin=None, apex=None, registrable=True,
+                          start=0, end=None, recent_window=100000):
+        """
+        Stream unique domain names from a zone file.
+
+        Owner names are resolved against $ORIGIN ('@' and relative names
+        included). With registrable=True each owner is reduced to the label
+        directly below the zone apex, so NS/DS/glue records collapse onto the
+        delegated domain. Repeats are removed with a bounded window of recent
+        names, so memory stays constant; write_unique_domains() gives exact
+        uniqueness across the whole zone.
 
         Args:
-            zone_file_path: Path to zone file (.zone or .zone.gz)
-            output_file: Optional output file for domain list
-            limit: Optional limit on number of domains to extract
+            zone_file_path: Path to zone file (plain or gzip)
+            origin: $ORIGIN in effect at start (default: the zone apex)
+            apex: Zone apex (default: detect_origin())
+            registrable: Reduce owners to registrable domains under the apex
+            start: Byte offset to start at (plain files only; aligned to the next line)
+            end: Byte offset to stop at (lines starting before end are included)
+            recent_window: Number of recent names remembered for deduplication
+
+        Yields:
+            Domain names without trailing dot, lower-cased
+        """
+        apex = apex or ZoneFileParser.detect_origin(zone_file_path)
+        origin = origin or apex
+        apex_labels = apex.rstrip('.').count('.') + 1 if apex and apex != '.' else 0
+        apex_suffix = f".{apex}" if apex and apex != '.' else '.'
+
+        recent, older = set(), set()
+        last = None
+        depth = 0
+
+        if start or end is not None:
+            f = open(zone_file_path, 'rb')
+            if start:
+                f.seek(start - 1)
+                f.readline()  # Align to the first line starting at or after start
+            position = f.tell()
+
+            def lines():
+                nonlocal position
+                for raw in f:
+                    if end is not None and position >= end:
+                        break
+                    position += len(raw)
+                    yield raw.decode('utf-8', errors='replace')
+        else:
+            f = _open_zone(zone_file_path)
+
+            def lines():
+                return f
+
+        with f:
+            for line in lines():
+                if depth:
+                    # Continuation of a parenthesized record
+                    text = _strip_comment(line)
+                    depth = max(0, depth + text.count('(') - text.count(')'))
+                    continue
+
+                first = line[:1]
+                if not first or first in ' \t\r\n;':
+                    # Blank, comment, or a record for the previous owner
+                    if '(' in line:
+                        text = _strip_comment(line)
+                        depth = max(0, text.count('(') - text.count(')'))
+                    continue
+
+                if first == '$':
+                    parts = _strip_comment(line).split()
+                    if parts[0].upper() == '$ORIGIN' and len(parts) >= 2:
+                        origin = _absolute(parts[1].lower(), origin)
+                    continue
+
+                if '(' in line:
+                    text = _strip_comment(line)
+                    depth = max(0, text.count('(') - text.count(')'))
+
+                name = _absolute(line.split(None, 1)[0].lower(), origin)
+
+                if registrable:
+                    if not name.endswith(apex_suffix):
+                        continue  # Apex itself or out-of-zone name
+                    labels = name.rstrip('.').split('.')
+                    if len(labels) <= apex_labels:
+                        continue
+                    domain = '.'.join(labels[-(apex_labels + 1):])
+                else:
+                    domain = name.rstrip('.')
+                    if '.' not in domain:
+                        continue
+
+                if domain == last or domain in recent or domain in older:
+                    continue
+
+                last = domain
+                recent.add(domain)
+                if len(recent) >= recent_window:
+                    older, recent = recent, set()
+
+                yield domain
+
+    @staticmethod
+    def iter_zone_delegations(zone_file_path, origin=None, apex=None):
+        """
+        Stream the NS delegations of a zone.
+
+        Only NS records owned by a name directly below the zone apex are
+        reported (the delegation itself, not glue or apex NS records).
+
+        Args:
+            zone_file_path: Path to zone file (plain or gzip)
+            origin: Initial $ORIGIN (default: the zone apex)
+            apex: Zone apex (default: detect_origin())
+
+        Yields:
+            (domain, nameserver) tuples without trailing dots, lower-cased
+        """
+        apex = apex or ZoneFileParser.detect_origin(zone_file_path)
+        origin = origin or apex
+        apex_labels = apex.rstrip('.').count('.') + 1 if apex and apex != '.' else 0
+        apex_suffix = f".{apex}" if apex and apex != '.' else '.'
+
+        owner = None
+        depth = 0
+
+        with _open_zone(zone_file_path) as f:
+            for line in f:
+                text = _strip_comment(line) if (';' in line or depth) else line
+                if depth:
+                    depth = max(0, depth + text.count('(') - text.count(')'))
+                    continue
+                if '(' in text:
+                    depth = max(0, text.count('(') - text.count(')'))
+
+                fields = text.split()
+                if not fields:
+                    continue
+
+                if text[0] == '$':
+                    if fields[0].upper() == '$ORIGIN' and len(fields) >= 2:
+                        origin = _absolute(fields[1].lower(), origin)
+                    continue
+
+                if text[0] not in ' \t':
+                    owner = _absolute(fields[0].lower(), origin)
+                    fields = fields[1:]
+
+                # Skip optional TTL and class (in either order) to reach the type
+                i = 0
+                while i < len(fields) and (fields[i][0].isdigit() or fields[i].lower() in ('in', 'ch', 'hs', 'cs')):
+                    i += 1
+                if i + 1 >= len(fields) or fields[i].lower() != 'ns' or not owner:
+                    continue
+
+                if not owner.endswith(apex_suffix) or owner.count('.') != apex_labels + 1:
+                    continue
+
+                yield owner.rstrip('.'), _absolute(fields[i + 1].lower(), origin).rstrip('.')
+
+    @staticmethod
+    def plan_ranges(zone_file_path, parts):
+        """
+        Split a plain zone file into byte ranges for parallel parsing.
+
+        The $ORIGIN in effect at each range start is found with a fast scan
+        of the memory-mapped file for directives.
 
         Returns:
-            List of domain names
+            List of (start, end, origin) tuples
         """
-        logger.info(f"Parsing zone file: {zone_file_path}")
+        apex = ZoneFileParser.detect_origin(zone_file_path)
+        size = os.path.getsize(zone_file_path)
+        if parts <= 1 or size == 0:
+            return [(0, None, apex)]
+
+        directives = []
+        with open(zone_file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            origin = apex
+            offset = mm.find(b'$ORIGIN')
+            while offset != -1:
+                if offset == 0 or mm[offset - 1] == ord('\n'):
+                    line_end = mm.find(b'\n', offset)
+                    fields = mm[offset:line_end if line_end != -1 else size].split()
+                    if len(fields) >= 2:
+                        origin = _absolute(fields[1].decode('utf-8', errors='replace').lower(), origin)
+                        directives.append((offset, origin))
+                offset = mm.find(b'$ORIGIN', offset + 1)
+
+        ranges = []
+        step = size // parts + 1
+        directive_index = 0
+        origin = apex
+        for start in range(0, size, step):
+            while directive_index < len(directives) and directives[directive_index][0] < start:
+                origin = directives[directive_index][1]
+                directive_index += 1
+            ranges.append((start, min(start + step, size), origin))
+        return ranges
+
+    @staticmethod
+    def merge_sorted_chunks(chunk_paths, output_file):
+        """
+        Merge sorted chunk files into one sorted, duplicate-free file.
 
-        domains = []
+        Returns:
+            Number of unique domains written
+        """
+        files = [open(path, 'r') for path in chunk_paths]
         count = 0
+        last = None
+        try:
+            with open(output_file, 'w') as out:
+                for line in heapq.merge(*files):
+                    if line != last:
+                        out.write(line)
+                        count += 1
+                        last = line
+        finally:
+            for f in files:
+                f.close()
+        return count
+
+    @staticmethod
+    def write_unique_domains(zone_files, output_file, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Parse zone files into one sorted, exactly deduplicated domain list.
+
+        Each zone (or byte range of a large plain zone) is parsed in a worker
+        process that spills sorted chunks of at most chunk_size domains to
+        disk; the chunks are then merged. Memory stays bounded regardless of
+        zone size.
+
+        Returns:
+            Number of unique domains written
+        """
+        workers = workers or os.cpu_count() or 1
+        output_path = Path(output_file)
+        chunk_dir = tempfile.mkdtemp(prefix='zonechunks-', dir=output_path.parent)
 
         try:
-            # Handle gzip files
-            if str(zone_file_path).endswith('.gz'):
-                open_func = gzip.open
-                mode = 'rt'
+            tasks = []
+            for zone_file in zone_files:
+                apex = ZoneFileParser.detect_origin(zone_file)
+                if not _is_gzip(zone_file) and os.path.getsize(zone_file) > SPLIT_THRESHOLD:
+                    for start, end, origin in ZoneFileParser.plan_ranges(zone_file, workers):
+                        tasks.append((str(zone_file), start, end, origin, apex, chunk_dir, chunk_size))
+                else:
+                    tasks.append((str(zone_file), 0, None, None, apex, chunk_dir, chunk_size))
+
+            chunk_paths = []
+            if workers > 1 and len(tasks) > 1:
+                with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+                    for chunks in executor.map(_parse_to_chunks, tasks):
+                        chunk_paths.extend(chunks)
             else:
-                open_func = open
-                mode = 'r'
+                for task in tasks:
+                    chunk_paths.extend(_parse_to_chunks(task))
 
-            with open_func(zone_file_path, mode) as f:
-                for line in f:
-                    line = line.strip()
+            logger.info(f"Merging {len(chunk_paths)} sorted chunks into {output_file}")
+            return ZoneFileParser.merge_sorted_chunks(chunk_paths, output_file)
 
-                    # Skip comments and empty lines
-                    if not line or line.startswith(';'):
-                        continue
+        finally:
+            shutil.rmtree(chunk_dir, ignore_errors=True)
 
-                    # Parse zone file format
-                    # Format: domain.tld IN NS nameserver
-                    # We want just the domain part
-                    parts = line.split()
+    @staticmethod
+    def iter_domain_batches(zone_file_path, batch_size=10000, **kwargs):
+        """
+        Stream domains in lists of batch_size for bulk inserts into the DB.
 
-                    if len(parts) >= 1:
-                        domain = parts[0].lower()
+        Yields:
+            Lists of domain names
+        """
+        domains = ZoneFileParser.iter_zone_domains(zone_file_path, **kwargs)
+        while True:
+            batch = list(islice(domains, batch_size))
+            if not batch:
+                return
+            yield batch
 
-                        # Remove trailing dot
-                        if domain.endswith('.'):
-                            domain = domain[:-1]
+    @staticmethod
+    def parse_zone_file(zone_file_path, output_file=None, limit=None, workers=None):
+        """
+        Parse a zone file and extract domain names.
 
-                        # Filter out invalid domains
-                        if domain and '.' in domain:
-                            domains.append(domain)
-                            count += 1
+        Args:
+            zone_file_path: Path to zone file (.zone or .zone.gz)
+            output_file: Optional output file for domain list
+            limit: Optional limit on number of domains to extract
+            workers: Worker processes for large plain files when writing output_file
 
-                            if limit and count >= limit:
-                                break
+        Returns:
+            List of unique registrable domain names (empty when written to
+            output_file without a limit, which is streamed to disk instead)
+        """
+        logger.info(f"Parsing zone file: {zone_file_path}")
 
-                            # Progress indicator
-                            if count % 100000 == 0:
-                                logger.info(f"Parsed {count:,} domains...")
+        try:
+            if output_file and not limit:
+                count = ZoneFileParser.write_unique_domains([zone_file_path], output_file, workers=workers)
+                logger.info(f"✓ Saved {count:,} unique domains to {output_file}")
+                return []
+
+            domains = []
+            for domain in ZoneFileParser.iter_zone_domains(zone_file_path):
+                domains.append(domain)
+
+                if limit and len(domains) >= limit:
+                    break
+
+                # Progress indicator
+                if len(domains) % 100000 == 0:
+                    logger.info(f"Parsed {len(domains):,} domains...")
 
             logger.info(f"✓ Extracted {len(domains):,} domains from {zone_file_path}")
 
@@ -249,30 +611,194 @@ class ZoneFileParser:
             return []
 
     @staticmethod
-    def parse_all_zones(zone_dir="zonefiles", output_file="all_domains.txt"):
-        """Parse all zone files in a directory"""
-        zone_dir = Path(zone_dir)
+    def parse_all_zones(zone_dir="zonefiles", output_file="all_domains.txt", workers=None):
+        """
+        Parse all zone files in a directory into one sorted unique domain list.
+
+        Returns:
+            Number of unique domains saved
+        """
+        zone_files = sorted(Path(zone_dir).glob("*.zone*"))
+        logger.info(f"Processing {len(zone_files)} zone files with {workers or os.cpu_count()} workers...")
+
+        count = ZoneFileParser.write_unique_domains(zone_files, output_file, workers=workers)
+
+        logger.info(f"✓ Complete! {count:,} domains saved to {output_file}")
+        return count
+
+
+
+def _write_delegation_chunk(delegations, chunk_dir, index):
+    """Write one chunk of domain -> nameservers sorted by domain and return its path"""
+    path = Path(chunk_dir) / f"delegations-{os.getpid()}-{index:05d}.tsv"
+    with open(path, 'w') as f:
+        for domain in sorted(delegations):
+            f.write(f"{domain}\t{','.join(sorted(delegations[domain]))}\n")
+    return str(path)
+
+
+def _read_index(f):
+    """Yield (domain, nameservers tuple) from an open snapshot index or chunk"""
+    for line in f:
+        domain, _, nameservers = line.rstrip('\n').partition('\t')
+        yield domain, tuple(nameservers.split(',')) if nameservers else ()
+
+
+class ZoneSnapshotStore:
+    """
+    Per-TLD snapshot indexes for diffing successive zone downloads.
+
+    Each index is a gzip file of "domain<TAB>ns1,ns2" lines sorted by domain,
+    so a new snapshot is compared to the previous one with a single streaming
+    merge. Only added and removed delegations and NS changes come out, which
+    is all discovery and enrichment need to see after the first download.
+    """
+
+    def __init__(self, snapshot_dir="zonefiles/snapshots", chunk_size=DEFAULT_CHUNK_SIZE):
+        self.snapshot_dir = Path(snapshot_dir)
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size
+
+    def index_path(self, tld):
+        return self.snapshot_dir / f"{tld.strip('.').lower()}.idx.gz"
+
+    def delta_path(self, tld):
+        return self.snapshot_dir / f"{tld.strip('.').lower()}.delta.tsv"
+
+    def build_index(self, zone_file_path, index_file):
+        """
+        Build a sorted snapshot index from a zone file in bounded memory.
+
+        Delegations are collected in chunks of at most chunk_size domains,
+        spilled to sorted files and merged, combining the NS sets of a domain
+        that spans chunks.
+
+        Returns:
+            Number of delegated domains in the index
+        """
+        index_path = Path(index_file)
+        chunk_dir = tempfile.mkdtemp(prefix='zoneindex-', dir=index_path.parent)
+
+        try:
+            chunk_paths = []
+            pending = {}
+            for domain, nameserver in ZoneFileParser.iter_zone_delegations(zone_file_path):
+                nameservers = pending.get(domain)
+                if nameservers is None:
+                    if len(pending) >= self.chunk_size:
+                        chunk_paths.append(_write_delegation_chunk(pending, chunk_dir, len(chunk_paths)))
+                        pending = {}
+                    nameservers = pending[domain] = set()
+                nameservers.add(nameserver)
+            if pending:
+                chunk_paths.append(_write_delegation_chunk(pending, chunk_dir, len(chunk_paths)))
+
+            files = [open(path, 'r') for path in chunk_paths]
+            count = 0
+            try:
+                with gzip.open(index_path, 'wt', encoding='utf-8', compresslevel=1) as out:
+                    current, nameservers = None, set()
+                    for domain, chunk_nameservers in heapq.merge(*(_read_index(f) for f in files),
+                                                                 key=lambda item: item[0]):
+                        if domain != current:
+                            if current is not None:
+                                out.write(f"{current}\t{','.join(sorted(nameservers))}\n")
+                                count += 1
+                            current, nameservers = domain, set()
+                        nameservers.update(chunk_nameservers)
+                    if current is not None:
+                        out.write(f"{current}\t{','.join(sorted(nameservers))}\n")
+                        count += 1
+            finally:
+                for f in files:
+                    f.close()
+            return count
+
+        finally:
+            shutil.rmtree(chunk_dir, ignore_errors=True)
+
+    @staticmethod
+    def iter_index(index_file):
+        """Stream (domain, nameservers tuple) from a snapshot index (empty if missing)"""
+        if not index_file or not os.path.exists(index_file):
+            return
+        with gzip.open(index_file, 'rt', encoding='utf-8') as f:
+            yield from _read_index(f)
 
-        all_domains = set()  # Use set to deduplicate
+    @staticmethod
+    def diff_indexes(old_index, new_index):
+        """
+        Streaming merge-diff of two sorted snapshot indexes.
 
-        for zone_file in zone_dir.glob("*.zone*"):
-            logger.info(f"Processing {zone_file.name}...")
+        Yields:
+            (change, domain, old_nameservers, new_nameservers) where change is
+            'added', 'removed' or 'ns_changed'
+        """
+        sentinel = (None, ())
+        old_entries = ZoneSnapshotStore.iter_index(old_index)
+        new_entries = ZoneSnapshotStore.iter_index(new_index)
+        old_domain, old_ns = next(old_entries, sentinel)
+        new_domain, new_ns = next(new_entries, sentinel)
+
+        while old_domain is not None or new_domain is not None:
+            if new_domain is None or (old_domain is not None and old_domain < new_domain):
+                yield 'removed', old_domain, old_ns, ()
+                old_domain, old_ns = next(old_entries, sentinel)
+            elif old_domain is None or new_domain < old_domain:
+                yield 'added', new_domain, (), new_ns
+                new_domain, new_ns = next(new_entries, sentinel)
+            else:
+                if old_ns != new_ns:
+                    yield 'ns_changed', new_domain, old_ns, new_ns
+                old_domain, old_ns = next(old_entries, sentinel)
+                new_domain, new_ns = next(new_entries, sentinel)
 
-            domains = ZoneFileParser.parse_zone_file(zone_file)
-            all_domains.update(domains)
+    @staticmethod
+    def iter_delta(delta_file):
+        """Stream (change, domain, old_nameservers, new_nameservers) from a delta file"""
+        with open(delta_file, 'r') as f:
+            for line in f:
+                change, domain, old_ns, new_ns = line.rstrip('\n').split('\t')
+                yield (change, domain,
+                       tuple(old_ns.split(',')) if old_ns else (),
+                       tuple(new_ns.split(',')) if new_ns else ())
+
+    def update(self, tld, zone_file_path, delta_file=None):
+        """
+        Index a new zone snapshot, diff it against the previous one and make it current.
 
-            logger.info(f"Total unique domains: {len(all_domains):,}")
+        The first snapshot of a TLD reports every delegation as added.
 
-        # Save consolidated list
-        logger.info(f"Saving {len(all_domains):,} unique domains to {output_file}")
+        Args:
+            tld: TLD the zone belongs to
+            zone_file_path: New zone file (plain or gzip)
+            delta_file: Where to write the delta (default: <snapshot_dir>/<tld>.delta.tsv)
 
-        with open(output_file, 'w') as f:
-            for domain in sorted(all_domains):
-                f.write(f"{domain}\n")
+        Returns:
+            Dict with the delta file path, domain count and per-change counts
+        """
+        index_file = self.index_path(tld)
+        new_index = index_file.with_name(index_file.name + '.new')
+        delta_file = Path(delta_file) if delta_file else self.delta_path(tld)
+        baseline = not index_file.exists()
+
+        logger.info(f"Indexing .{tld} snapshot {zone_file_path}...")
+        domains = self.build_index(zone_file_path, new_index)
+
+        counts = {'added': 0, 'removed': 0, 'ns_changed': 0}
+        tmp_delta = delta_file.with_name(delta_file.name + '.tmp')
+        with open(tmp_delta, 'w') as out:
+            for change, domain, old_ns, new_ns in self.diff_indexes(index_file, new_index):
+                out.write(f"{change}\t{domain}\t{','.join(old_ns)}\t{','.join(new_ns)}\n")
+                counts[change] += 1
 
-        logger.info(f"✓ Complete! {len(all_domains):,} domains saved")
-        return list(all_domains)
+        os.replace(tmp_delta, delta_file)
+        os.replace(new_index, index_file)
 
+        logger.info(f"✓ .{tld}: {domains:,} delegations{' (baseline)' if baseline else ''}, "
+                    f"+{counts['added']:,} -{counts['removed']:,} ~{counts['ns_changed']:,} NS changes")
+        return {'tld': tld, 'delta_file': str(delta_file), 'domains': domains,
+                'baseline': baseline, **counts}
 
 def main():
     """CLI for zone file operations"""
@@ -293,6 +819,7 @@ EXAMPLES:
   %(prog)s download
   %(prog)s parse com.zone.gz
   %(prog)s parse-all
+  %(prog)s diff com.zone.gz --tld com
         """,
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
@@ -311,11 +838,20 @@ EXAMPLES:
     parse_parser.add_argument('zonefile', help='Zone file to parse')
     parse_parser.add_argument('-o', '--output', help='Output domain list file')
     parse_parser.add_argument('-l', '--limit', type=int, help='Limit number of domains')
+    parse_parser.add_argument('-w', '--workers', type=int, help='Worker processes (default: CPU count)')
 
     # Parse all zones
     parse_all_parser = subparsers.add_parser('parse-all', help='Parse all zone files')
     parse_all_parser.add_argument('-d', '--dir', default='zonefiles', help='Zone file directory')
     parse_all_parser.add_argument('-o', '--output', default='all_domains.txt', help='Output file')
+    parse_all_parser.add_argument('-w', '--workers', type=int, help='Worker processes (default: CPU count)')
+
+    # Diff a zone snapshot against the previous one
+    diff_parser = subparsers.add_parser('diff', help='Diff a zone file against the previous snapshot')
+    diff_parser.add_argument('zonefile', help='New zone file')
+    diff_parser.add_argument('--tld', help='TLD (default: zone apex)')
+    diff_parser.add_argument('-s', '--snapshots', default='zonefiles/snapshots', help='Snapshot index directory')
+    diff_parser.add_argument('-o', '--output', help='Delta output file')
 
     args = parser.parse_args()
 
@@ -348,15 +884,21 @@ EXAMPLES:
         ZoneFileParser.parse_zone_file(
             args.zonefile,
             output_file=args.output,
-            limit=args.limit
+            limit=args.limit,
+            workers=args.workers
         )
 
     elif args.command == 'parse-all':
         ZoneFileParser.parse_all_zones(
             zone_dir=args.dir,
-            output_file=args.output
+            output_file=args.output,
+            workers=args.workers
         )
 
+    elif args.command == 'diff':
+        tld = args.tld or ZoneFileParser.detect_origin(args.zonefile).strip('.')
+        ZoneSnapshotStore(args.snapshots).update(tld, args.zonefile, delta_file=args.output)
+
 
 if __name__ == '__main__':
     main()
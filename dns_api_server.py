@@ -4,17 +4,21 @@ RESTful API Server for DNS Cache Validator
 Provides HTTP API for programmatic access to DNS validation
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import json
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Dict, List
 
 # Import main validator
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from dns_cache_validator import DNSCacheValidator
+from dns_cache_validator import DNSCacheValidator, SCAN_ENGINES
+from dns_result_analyzer import StreamingAnalyzer
+from dns_result_records import results_to_dicts
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
@@ -22,15 +26,27 @@ CORS(app)  # Enable CORS for all routes
 # Global validator instance
 validator = None
 
+# Domain scans allowed to run at once across all bulk requests
+bulk_concurrency = 4
+bulk_slots = threading.BoundedSemaphore(bulk_concurrency)
 
-def init_validator(config_file='dns_resolvers.json'):
+
+def init_validator(config_file='dns_resolvers.json', engine='threaded', max_workers=50,
+                   rate_limit=None, resolver_rate_limit=None, provider_rate_limit=None,
+                   bulk_domain_concurrency=4):
     """Initialize global validator instance"""
-    global validator
+    global validator, bulk_concurrency, bulk_slots
+    bulk_concurrency = max(1, bulk_domain_concurrency)
+    bulk_slots = threading.BoundedSemaphore(bulk_concurrency)
     validator = DNSCacheValidator(
         config_file=config_file,
         timeout=5,
-        max_workers=50,
-        retry_count=2
+        max_workers=max_workers,
+        retry_count=2,
+        rate_limit=rate_limit,
+        engine=engine,
+        per_resolver_rate_limit=resolver_rate_limit,
+        per_provider_rate_limit=provider_rate_limit
     )
 
 
@@ -40,7 +56,8 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'timestamp': datetime.utcnow().isoformat(),
-        'resolvers_loaded': len(validator.resolvers) if validator else 0
+        'resolvers_loaded': len(validator.resolvers) if validator else 0,
+        'engine': validator.engine if validator else None
     })
 
 
@@ -52,12 +69,14 @@ def list_resolvers():
     Query parameters:
     - country: Filter by country code (e.g., US,CA)
     - region: Filter by region (e.g., europe,asia)
+    - continent: Filter by continent (e.g., Europe,Asia)
     - tier: Filter by tier (e.g., tier1,tier2)
     - tags: Filter by tags (e.g., public,security)
     """
     try:
         countries = request.args.get('country', '').split(',') if request.args.get('country') else None
         regions = request.args.get('region', '').split(',') if request.args.get('region') else None
+        continents = request.args.get('continent', '').split(',') if request.args.get('continent') else None
         tiers = request.args.get('tier', '').split(',') if request.args.get('tier') else None
         tags = request.args.get('tags', '').split(',') if request.args.get('tags') else None
 
@@ -65,7 +84,8 @@ def list_resolvers():
             countries=countries,
             regions=regions,
             tiers=tiers,
-            tags=tags
+            tags=tags,
+            continents=continents
         )
 
         return jsonify({
@@ -89,9 +109,13 @@ def validate_domain():
         "type_id": 1,  # optional, custom record type ID
         "countries": ["US", "CA"],  # optional
         "regions": ["europe", "asia"],  # optional
+        "continents": ["Europe"],  # optional
         "tiers": ["tier1"],  # optional
         "tags": ["public"],  # optional
-        "limit": 50  # optional, limit number of resolvers
+        "limit": 50,  # optional, limit number of resolvers
+        "engine": "async",  # optional, threaded or async (default: server setting)
+        "live": true,  # optional, stream NDJSON progress lines while scanning
+        "progress_interval": 1.0  # optional, seconds between live progress lines
     }
 
     Response:
@@ -99,6 +123,10 @@ def validate_domain():
         "results": [...],
         "analysis": {...}
     }
+
+    With "live": true the response is application/x-ndjson: one
+    {"type": "progress", ...} line per interval with live consistency,
+    then a final {"type": "result", ...} line with the full response above.
     """
     try:
         data = request.get_json()
@@ -117,57 +145,113 @@ def validate_domain():
         if not validator.validate_record_type(record_type, type_id):
             return jsonify({'error': 'Invalid record type'}), 400
 
+        engine = data.get('engine')
+        if engine is not None and engine not in SCAN_ENGINES:
+            return jsonify({'error': f"engine must be one of: {', '.join(SCAN_ENGINES)}"}), 400
+
         # Filter resolvers
         filtered = validator.filter_resolvers(
             countries=data.get('countries'),
             regions=data.get('regions'),
             tiers=data.get('tiers'),
-            tags=data.get('tags')
+            tags=data.get('tags'),
+            continents=data.get('continents')
         )
 
         if data.get('limit'):
             filtered = filtered[:data['limit']]
 
-        # Perform scan
-        results = validator.validate_domain_scan(
-            domain,
-            record_type,
-            filtered,
-            type_id=type_id
-        )
+        analyzer = StreamingAnalyzer(total_expected=len(filtered))
 
-        # Analyze results
-        analysis = validator.analyze_results(results)
+        def run_scan():
+            results = validator.validate_domain_scan(
+                domain,
+                record_type,
+                filtered,
+                type_id=type_id,
+                engine=engine,
+                analyzer=analyzer
+            )
 
-        # Detect stale resolvers
-        stale_resolvers = validator.detect_stale_resolvers(results, analysis)
+            # Analysis was built incrementally while results arrived
+            analysis = analyzer.snapshot()
 
-        return jsonify({
-            'domain': domain,
-            'record_type': record_type,
-            'timestamp': datetime.utcnow().isoformat(),
-            'total_resolvers': len(filtered),
-            'results': results,
-            'analysis': analysis,
-            'stale_resolvers': stale_resolvers
-        })
+            # Detect stale resolvers
+            stale_resolvers = validator.detect_stale_resolvers(results, analysis)
+
+            return {
+                'domain': domain,
+                'record_type': record_type,
+                'timestamp': datetime.utcnow().isoformat(),
+                'total_resolvers': len(filtered),
+                'results': results_to_dicts(results),
+                'analysis': analysis,
+                'stale_resolvers': stale_resolvers
+            }
+
+        if data.get('live'):
+            try:
+                interval = float(data.get('progress_interval', 1.0))
+            except (TypeError, ValueError):
+                return jsonify({'error': 'progress_interval must be a number'}), 400
+            return Response(
+                stream_with_context(_stream_live_scan(run_scan, analyzer, interval)),
+                mimetype='application/x-ndjson'
+            )
+
+        return jsonify(run_scan())
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+def _stream_live_scan(run_scan, analyzer: StreamingAnalyzer, interval: float):
+    """Run a scan in a worker thread, yielding NDJSON progress lines until it finishes."""
+    outcome = {}
+
+    def worker():
+        try:
+            outcome['result'] = run_scan()
+        except Exception as e:
+            outcome['error'] = str(e)
+
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+
+    while thread.is_alive():
+        thread.join(timeout=max(0.05, interval))
+        if thread.is_alive():
+            yield json.dumps({'type': 'progress', **analyzer.progress()}) + '\n'
+
+    if 'error' in outcome:
+        yield json.dumps({'type': 'error', 'error': outcome['error']}) + '\n'
+    else:
+        yield json.dumps({'type': 'result', **outcome['result']}, default=str) + '\n'
+
+
 @app.route('/api/v1/bulk-validate', methods=['POST'])
 def bulk_validate():
     """
     Validate multiple domains.
 
+    Domains are scanned concurrently. All bulk requests share one server-wide
+    budget of concurrent domain scans (--bulk-concurrency); a request may ask
+    for less with "concurrency".
+
     Request body (JSON):
     {
         "domains": ["example.com", "example.org"],
         "record_type": "A",  # optional
         "countries": ["US"],  # optional
+        "engine": "async",  # optional, threaded or async
+        "concurrency": 2,  # optional, domains scanned at once for this request
+        "stream": true,  # optional, stream one NDJSON line per domain as it completes
         ...
     }
+
+    With "stream": true the response is application/x-ndjson: one
+    {"type": "domain", "index": ..., "domain": ..., ...} line per domain in
+    completion order, then a final {"type": "summary", ...} line.
     """
     try:
         data = request.get_json()
@@ -182,41 +266,61 @@ def bulk_validate():
         record_type = data.get('record_type', 'A')
         type_id = data.get('type_id')
 
+        engine = data.get('engine')
+        if engine is not None and engine not in SCAN_ENGINES:
+            return jsonify({'error': f"engine must be one of: {', '.join(SCAN_ENGINES)}"}), 400
+
+        try:
+            concurrency = int(data.get('concurrency', bulk_concurrency))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'concurrency must be an integer'}), 400
+        if concurrency < 1:
+            return jsonify({'error': 'concurrency must be at least 1'}), 400
+        concurrency = min(concurrency, bulk_concurrency)
+
         # Filter resolvers once
         filtered = validator.filter_resolvers(
             countries=data.get('countries'),
             regions=data.get('regions'),
             tiers=data.get('tiers'),
-            tags=data.get('tags')
+            tags=data.get('tags'),
+            continents=data.get('continents')
         )
 
         if data.get('limit'):
             filtered = filtered[:data['limit']]
 
-        # Validate each domain
-        all_results = []
-        for domain in domains:
+        def scan(domain: str) -> Dict:
             if not validator.validate_domain(domain):
-                all_results.append({
-                    'domain': domain,
-                    'error': 'Invalid domain name'
-                })
-                continue
-
-            results = validator.validate_domain_scan(
-                domain,
-                record_type,
-                filtered,
-                type_id=type_id
+                return {'domain': domain, 'error': 'Invalid domain name'}
+
+            # Hold a server-wide slot for the duration of the scan
+            with bulk_slots:
+                analyzer = StreamingAnalyzer(total_expected=len(filtered))
+                results = validator.validate_domain_scan(
+                    domain,
+                    record_type,
+                    filtered,
+                    type_id=type_id,
+                    engine=engine,
+                    analyzer=analyzer
+                )
+
+            return {
+                'domain': domain,
+                'results': results_to_dicts(results),
+                'analysis': analyzer.snapshot()
+            }
+
+        if data.get('stream'):
+            return Response(
+                stream_with_context(_stream_bulk_scan(domains, scan, concurrency)),
+                mimetype='application/x-ndjson'
             )
 
-            analysis = validator.analyze_results(results)
-
-            all_results.append({
-                'domain': domain,
-                'results': results,
-                'analysis': analysis
-            })
+        all_results = [None] * len(domains)
+        for index, domain_result in _iter_bulk_scan(domains, scan, concurrency):
+            all_results[index] = domain_result
 
         return jsonify({
             'timestamp': datetime.utcnow().isoformat(),
@@ -228,6 +332,40 @@ def bulk_validate():
         return jsonify({'error': str(e)}), 500
 
 
+def _iter_bulk_scan(domains: List[str], scan, concurrency: int):
+    """Scan domains on a thread pool, yielding (index, domain result) as each completes."""
+    executor = ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(domains))))
+    try:
+        futures = {executor.submit(scan, domain): index for index, domain in enumerate(domains)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                yield index, future.result()
+            except Exception as e:
+                yield index, {'domain': domains[index], 'error': str(e)}
+    finally:
+        # Client went away or we finished: drop scans that have not started
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _stream_bulk_scan(domains: List[str], scan, concurrency: int):
+    """Yield one NDJSON line per completed domain, then a summary line."""
+    completed = failed = 0
+    for index, domain_result in _iter_bulk_scan(domains, scan, concurrency):
+        completed += 1
+        if 'error' in domain_result:
+            failed += 1
+        yield json.dumps({'type': 'domain', 'index': index, **domain_result}, default=str) + '\n'
+
+    yield json.dumps({
+        'type': 'summary',
+        'timestamp': datetime.utcnow().isoformat(),
+        'total_domains': len(domains),
+        'completed': completed,
+        'failed': failed
+    }) + '\n'
+
+
 @app.route('/api/v1/stats', methods=['GET'])
 def get_stats():
     """Get statistics about loaded resolvers"""
@@ -264,7 +402,9 @@ def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
 
 
-def run_server(host='0.0.0.0', port=5000, config_file='dns_resolvers.json', debug=False):
+def run_server(host='0.0.0.0', port=5000, config_file='dns_resolvers.json', debug=False,
+               engine='threaded', max_workers=50, rate_limit=None,
+               resolver_rate_limit=None, provider_rate_limit=None, bulk_domain_concurrency=4):
     """
     Run the API server.
 
@@ -273,10 +413,19 @@ def run_server(host='0.0.0.0', port=5000, config_file='dns_resolvers.json', debu
         port: Port to listen on
         config_file: DNS resolvers config file
         debug: Enable debug mode
+        engine: Default query engine (threaded or async)
+        max_workers: Concurrent queries per scan (threads, or in-flight queries for async)
+        rate_limit: Global query rate limit in QPS, shared by all requests
+        resolver_rate_limit: Per-resolver query rate limit in QPS
+        provider_rate_limit: Per-provider query rate limit in QPS
+        bulk_domain_concurrency: Domain scans run at once across all bulk requests
     """
-    init_validator(config_file)
+    init_validator(config_file, engine, max_workers, rate_limit,
+                   resolver_rate_limit, provider_rate_limit, bulk_domain_concurrency)
     print(f"DNS Cache Validator API Server")
     print(f"Loaded {len(validator.resolvers)} DNS resolvers")
+    print(f"Default query engine: {engine} ({max_workers} concurrent)")
+    print(f"Bulk validation: {bulk_concurrency} concurrent domain scans")
     print(f"Starting server on http://{host}:{port}")
     print(f"\nAPI Endpoints:")
     print(f"  GET  /api/v1/health         - Health check")
@@ -297,6 +446,15 @@ if __name__ == '__main__':
     parser.add_argument('--port', type=int, default=5000, help='Port to listen on')
     parser.add_argument('--config', default='dns_resolvers.json', help='DNS resolvers config file')
     parser.add_argument('--debug', action='store_true', help='Enable debug mode')
+    parser.add_argument('--engine', default='threaded', choices=SCAN_ENGINES,
+                        help='Default query engine (requests may override with "engine")')
+    parser.add_argument('--workers', type=int, default=50,
+                        help='Concurrent queries per scan (threads, or in-flight queries for async)')
+    parser.add_argument('--rate-limit', type=float, help='Global query rate limit (QPS)')
+    parser.add_argument('--resolver-rate-limit', type=float, help='Per-resolver query rate limit (QPS)')
+    parser.add_argument('--provider-rate-limit', type=float, help='Per-provider query rate limit (QPS)')
+    parser.add_argument('--bulk-concurrency', type=int, default=4,
+                        help='Domain scans run at once across all bulk-validate requests')
 
     args = parser.parse_args()
 
@@ -304,5 +462,11 @@ if __name__ == '__main__':
         host=args.host,
         port=args.port,
         config_file=args.config,
-        debug=args.debug
+        debug=args.debug,
+        engine=args.engine,
+        max_workers=args.workers,
+        rate_limit=args.rate_limit,
+        resolver_rate_limit=args.resolver_rate_limit,
+        provider_rate_limit=args.provider_rate_limit,
+        bulk_domain_concurrency=args.bulk_concurrency
     )
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Asyncio raw-UDP query engine for the DNS Cache Validator
+Sends pre-rendered wire-format queries from a small pool of shared UDP sockets
+and demultiplexes responses by (source IP, query ID), so a single event loop
+can keep thousands of resolver probes in flight.
+"""
+
+import asyncio
+import random
+import socket
+import struct
+import time
+from itertools import cycle
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
+
+import dns.asyncquery
+import dns.exception
+import dns.flags
+import dns.message
+import dns.rcode
+
+from dns_rate_limiter import RateLimiter
+
+
+# Receive buffer requested for each pooled socket; bursts of replies from
+# hundreds of resolvers easily overflow the kernel default.
+SOCKET_RCVBUF = 4 * 1024 * 1024
+
+# Largest UDP payload we advertise via EDNS0.
+EDNS_PAYLOAD = 1232
+
+
+class _PooledDatagramProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol that hands replies to the owning engine."""
+
+    def __init__(self, engine: 'AsyncUDPQueryEngine'):
+        self.engine = engine
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr):
+        self.engine._dispatch(data, addr[0])
+
+    def error_received(self, exc):
+        # ICMP errors (port unreachable etc.) carry no query ID; the pending
+        # query will simply time out.
+        pass
+
+
+class AsyncUDPQueryEngine:
+    """Shared-socket asyncio DNS query engine."""
+
+    def __init__(
+        self,
+        timeout: float = 5,
+        retry_count: int = 2,
+        max_in_flight: int = 1000,
+        socket_count: int = 4,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
+        """
+        Initialize the async query engine.
+
+        Args:
+            timeout: Per-attempt query timeout in seconds
+            retry_count: Total attempts per resolver (same semantics as the threaded engine)
+            max_in_flight: Maximum number of queries awaiting a reply at once
+            socket_count: Number of UDP sockets per address family in the pool
+            rate_limiter: Shared rate limiter (None for unlimited)
+        """
+        self.timeout = timeout
+        self.retry_count = max(1, retry_count)
+        self.max_in_flight = max_in_flight
+        self.socket_count = max(1, socket_count)
+        self.rate_limiter = rate_limiter
+
+        self._pending: Dict[Tuple[str, int], asyncio.Future] = {}
+        self._transports: Dict[int, list] = {}
+        self._socket_cycle: Dict[int, cycle] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pool_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    async def open(self):
+        """Bind the engine to the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._pool_lock = asyncio.Lock()
+
+    def close(self):
+        """Close all pooled sockets and fail any queries still pending."""
+        for transports in self._transports.values():
+            for transport in transports:
+                transport.close()
+        self._transports.clear()
+        self._socket_cycle.clear()
+
+        for future in self._pending.values():
+            if not future.done():
+                future.cancel()
+        self._pending.clear()
+
+    async def _get_transport(self, family: int):
+        """Return the next pooled transport for an address family, creating the pool lazily."""
+        if family not in self._transports:
+            async with self._pool_lock:
+                if family not in self._transports:
+                    await self._open_pool(family)
+
+        return next(self._socket_cycle[family])
+
+    async def _open_pool(self, family: int):
+        """Create the shared UDP sockets for one address family."""
+        transports = []
+        for _ in range(self.socket_count):
+            sock = socket.socket(family, socket.SOCK_DGRAM)
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF)
+            except OSError:
+                pass
+            sock.setblocking(False)
+            sock.bind(('::', 0) if family == socket.AF_INET6 else ('0.0.0.0', 0))
+            transport, _ = await self._loop.create_datagram_endpoint(
+                lambda: _PooledDatagramProtocol(self), sock=sock
+            )
+            transports.append(transport)
+        self._transports[family] = transports
+        self._socket_cycle[family] = cycle(transports)
+
+    def _dispatch(self, data: bytes, source_ip: str):
+        """Route a received datagram to the query waiting on (source IP, query ID)."""
+        if len(data) < 12:
+            return
+
+        query_id = struct.unpack('!H', data[:2])[0]
+        future = self._pending.pop((source_ip, query_id), None)
+        if future is None:
+            return  # Late, duplicate or unsolicited reply
+
+        if not future.done():
+            future.set_result((data, time.time()))
+
+    def _allocate_query_id(self, resolver_ip: str) -> int:
+        """Pick a random query ID not currently in flight to this resolver."""
+        while True:
+            query_id = random.randint(0, 0xFFFF)
+            if (resolver_ip, query_id) not in self._pending:
+                return query_id
+
+    @staticmethod
+    def render_query(domain: str, rdtype: Union[str, int]) -> Tuple[dns.message.Message, bytes]:
+        """
+        Render a query once to wire format.
+
+        Returns:
+            Tuple of (query message, wire bytes); the ID is patched per send
+        """
+        query = dns.message.make_query(domain, rdtype, use_edns=0, payload=EDNS_PAYLOAD)
+        return query, query.to_wire()
+
+    async def _send_once(
+        self,
+        query: dns.message.Message,
+        wire: bytes,
+        resolver_ip: str
+    ) -> Tuple[bytes, float]:
+        """Send one UDP query and wait for the matching reply."""
+        family = socket.AF_INET6 if ':' in resolver_ip else socket.AF_INET
+        transport = await self._get_transport(family)
+
+        query_id = self._allocate_query_id(resolver_ip)
+        key = (resolver_ip, query_id)
+        future = self._loop.create_future()
+        self._pending[key] = future
+
+        try:
+            transport.sendto(struct.pack('!H', query_id) + wire[2:], (resolver_ip, 53))
+            return await asyncio.wait_for(future, timeout=self.timeout)
+        finally:
+            self._pending.pop(key, None)
+
+    async def _query_attempt(
+        self,
+        query: dns.message.Message,
+        wire: bytes,
+        resolver_ip: str
+    ) -> Dict:
+        """Run a single attempt against one resolver and classify the outcome."""
+        outcome = {
+            'success': False,
+            'answers': [],
+            'error': None,
+            'response_time': None,
+            'ttl': None
+        }
+
+        try:
+            start_time = time.time()
+            data, received_at = await self._send_once(query, wire, resolver_ip)
+            response = dns.message.from_wire(data, ignore_trailing=True)
+
+            if response.flags & dns.flags.TC:
+                # Truncated: retry this one over TCP like dnspython's resolver does
+                response = await dns.asyncquery.tcp(query, resolver_ip, timeout=self.timeout)
+                received_at = time.time()
+
+            # The wire ID was patched per send, so match on QR flag and question only
+            if not (response.flags & dns.flags.QR) or response.question != query.question:
+                outcome['error'] = 'Mismatched response'
+                return outcome
+
+            response_time = (received_at - start_time) * 1000  # Convert to ms
+            rcode = response.rcode()
+
+            if rcode == dns.rcode.NXDOMAIN:
+                outcome['error'] = 'NXDOMAIN'
+            elif rcode != dns.rcode.NOERROR:
+                outcome['error'] = 'No Nameservers'
+            else:
+                chain = response.resolve_chaining()
+                if chain.answer is None:
+                    outcome['error'] = 'No Answer'
+                else:
+                    outcome['success'] = True
+                    outcome['answers'] = [str(rdata) for rdata in chain.answer]
+                    outcome['response_time'] = round(response_time, 2)
+                    outcome['ttl'] = chain.answer.ttl
+
+        except (asyncio.TimeoutError, dns.exception.Timeout):
+            outcome['error'] = 'Timeout'
+
+        except Exception as e:
+            outcome['error'] = str(e)
+
+        return outcome
+
+    async def query(
+        self,
+        query: dns.message.Message,
+        wire: bytes,
+        resolver_ip: str,
+        provider: Optional[str] = None
+    ) -> Dict:
+        """
+        Query one resolver with retry logic and exponential backoff.
+
+        Returns:
+            Dict with success, answers, error, response_time, ttl and attempt
+        """
+        attempt = 1
+        while True:
+            # Wait for rate-limit tokens before taking an in-flight slot
+            if self.rate_limiter:
+                await self.rate_limiter.acquire_async(resolver_ip, provider)
+
+            async with self._semaphore:
+                outcome = await self._query_attempt(query, wire, resolver_ip)
+
+            outcome['attempt'] = attempt
+            if outcome['success'] or attempt >= self.retry_count:
+                return outcome
+
+            await asyncio.sleep((2 ** attempt) * 0.5)  # 0.5s, 1s, 2s, etc.
+            attempt += 1
+
+    async def scan(
+        self,
+        domain: str,
+        resolver_ips: List[str],
+        rdtype: Union[str, int] = 'A',
+        providers: Optional[List[Optional[str]]] = None
+    ) -> AsyncIterator[Tuple[int, Dict]]:
+        """
+        Query a domain on many resolvers concurrently.
+
+        providers optionally names each resolver's provider for per-provider rate limits.
+
+        Yields:
+            (resolver index, outcome) tuples in completion order
+        """
+        query, wire = self.render_query(domain, rdtype)
+
+        async def run(index: int, resolver_ip: str):
+            provider = providers[index] if providers else None
+            return index, await self.query(query, wire, resolver_ip, provider)
+
+        tasks = [asyncio.ensure_future(run(i, ip)) for i, ip in enumerate(resolver_ips)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def query_all(
+        self,
+        domain: str,
+        resolver_ips: List[str],
+        rdtype: Union[str, int] = 'A',
+        on_outcome: Optional[Callable[[int, Dict], None]] = None,
+        providers: Optional[List[Optional[str]]] = None
+    ) -> List[Dict]:
+        """
+        Synchronous wrapper around scan() for callers without an event loop.
+
+        Args:
+            domain: Domain to query
+            resolver_ips: Resolver IP addresses
+            rdtype: Record type name or numeric type ID
+            on_outcome: Optional callback invoked with (index, outcome) as each resolver completes
+            providers: Optional provider name per resolver for per-provider rate limits
+
+        Returns:
+            List of outcomes in the same order as resolver_ips
+        """
+        outcomes: List[Optional[Dict]] = [None] * len(resolver_ips)
+
+        async def runner():
+            async with self:
+                async for index, outcome in self.scan(domain, resolver_ips, rdtype, providers):
+                    outcomes[index] = outcome
+                    if on_outcome:
+                        on_outcome(index, outcome)
+
+        asyncio.run(runner())
+        return outcomes
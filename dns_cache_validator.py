@@ -26,6 +26,12 @@ from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 import hashlib
 
+from dns_async_engine import AsyncUDPQueryEngine
+from dns_rate_limiter import RateLimiter
+from dns_result_analyzer import StreamingAnalyzer
+from dns_resolver_index import ResolverIndex
+from dns_result_records import QueryResult, ResolverTable, results_to_dicts
+
 
 # Define regions and their country mappings
 REGIONS = {
@@ -82,6 +88,9 @@ VALID_RECORD_TYPES = {
     'ANY', 'AXFR', 'IXFR', 'OPT'
 }
 
+# Query engines available to validate_domain_scan()
+SCAN_ENGINES = ('threaded', 'async')
+
 
 class DNSCacheValidator:
     """Production-grade DNS cache validator with comprehensive features."""
@@ -94,7 +103,11 @@ class DNSCacheValidator:
         retry_count: int = 2,
         rate_limit: Optional[float] = None,
         log_file: Optional[str] = None,
-        log_level: str = 'INFO'
+        log_level: str = 'INFO',
+        engine: str = 'threaded',
+        udp_sockets: int = 4,
+        per_resolver_rate_limit: Optional[float] = None,
+        per_provider_rate_limit: Optional[float] = None
     ):
         """
         Initialize the DNS Cache Validator.
@@ -104,17 +117,35 @@ class DNSCacheValidator:
             timeout: DNS query timeout in seconds
             max_workers: Maximum concurrent queries
             retry_count: Number of retries for failed queries
-            rate_limit: Rate limit in queries per second (None for unlimited)
+            rate_limit: Global rate limit in queries per second (None for unlimited)
             log_file: Path to log file (None for console only)
             log_level: Logging level (DEBUG, INFO, WARNING, ERROR)
+            engine: Query engine ('threaded' or 'async')
+            udp_sockets: Shared UDP sockets per address family for the async engine
+            per_resolver_rate_limit: Rate limit per resolver IP in queries per second
+            per_provider_rate_limit: Rate limit per provider in queries per second
         """
+        if engine not in SCAN_ENGINES:
+            raise ValueError(f"Unknown engine '{engine}' (choose from {', '.join(SCAN_ENGINES)})")
+
         self.config_file = config_file
         self.timeout = timeout
         self.max_workers = max_workers
         self.retry_count = retry_count
         self.rate_limit = rate_limit
+        self.engine = engine
+        self.udp_sockets = udp_sockets
         self.resolvers = []
-        self.query_timestamps = []  # For rate limiting
+        self.resolver_table = ResolverTable()
+        self.resolver_index = ResolverIndex([])
+        self.region_ids: Dict[str, Set[int]] = {}
+
+        # Shared by every worker thread and by the async engine
+        self.rate_limiter = RateLimiter(
+            global_qps=rate_limit,
+            per_resolver_qps=per_resolver_rate_limit,
+            per_provider_qps=per_provider_rate_limit
+        )
 
         # Setup logging
         self._setup_logging(log_file, log_level)
@@ -154,6 +185,10 @@ class DNSCacheValidator:
             with open(self.config_file, 'r') as f:
                 data = json.load(f)
                 self.resolvers = data.get('resolvers', [])
+            # Results reference resolver metadata by index instead of copying it
+            self.resolver_table = ResolverTable()
+            self.resolver_table.extend(self.resolvers)
+            self._build_resolver_index()
             self.logger.info(f"Loaded {len(self.resolvers)} DNS resolvers from config")
         except FileNotFoundError:
             self.logger.error(f"Config file '{self.config_file}' not found")
@@ -162,23 +197,20 @@ class DNSCacheValidator:
             self.logger.error(f"Invalid JSON in '{self.config_file}': {e}")
             sys.exit(1)
 
-    def _apply_rate_limit(self):
-        """Apply rate limiting if configured."""
-        if not self.rate_limit:
-            return
-
-        current_time = time.time()
-        # Remove timestamps older than 1 second
-        self.query_timestamps = [ts for ts in self.query_timestamps if current_time - ts < 1.0]
-
-        # If we've hit the rate limit, sleep
-        if len(self.query_timestamps) >= self.rate_limit:
-            sleep_time = 1.0 - (current_time - self.query_timestamps[0])
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-                self.query_timestamps = []
+    def _build_resolver_index(self):
+        """Precompute attribute -> resolver id sets used by filter_resolvers()."""
+        self.resolver_index = ResolverIndex(self.resolvers)
+        self.region_ids = {
+            region: self.resolver_index.ids_for('country', countries)
+            for region, countries in REGIONS.items()
+        }
 
-        self.query_timestamps.append(time.time())
+    def _apply_rate_limit(self, resolver_info: Optional[Dict] = None):
+        """Apply global, per-resolver and per-provider rate limits if configured."""
+        if resolver_info is None:
+            self.rate_limiter.acquire()
+        else:
+            self.rate_limiter.acquire(resolver_info['ip'], resolver_info.get('provider'))
 
     def validate_domain(self, domain: str) -> bool:
         """
@@ -237,68 +269,79 @@ class DNSCacheValidator:
         countries: Optional[List[str]] = None,
         regions: Optional[List[str]] = None,
         tiers: Optional[List[str]] = None,
-        tags: Optional[List[str]] = None
+        tags: Optional[List[str]] = None,
+        continents: Optional[List[str]] = None
     ) -> List[Dict]:
         """
         Filter resolvers based on criteria.
 
+        Criteria are resolved against the index built by load_resolvers(), so
+        the cost is proportional to the matching resolvers, not the inventory.
+
         Args:
             countries: List of country names or codes
             regions: List of region names
             tiers: List of tier levels
             tags: List of tags
+            continents: List of continent names
 
         Returns:
-            Filtered list of resolvers
+            Filtered list of resolvers (in config order)
         """
-        filtered = self.resolvers.copy()
+        index = self.resolver_index
+        if index.resolvers is not self.resolvers:
+            # resolvers was replaced after loading; keep the index in step
+            self._build_resolver_index()
+            index = self.resolver_index
+
+        selected: Optional[Set[int]] = None
+
+        def narrow(ids: Set[int]) -> Set[int]:
+            return ids if selected is None else selected & ids
 
         # Filter by country
         if countries:
             # Normalize country codes to full names
-            normalized_countries = []
-            for c in countries:
-                c_upper = c.upper()
-                if c_upper in COUNTRY_CODE_MAP:
-                    normalized_countries.append(COUNTRY_CODE_MAP[c_upper])
-                else:
-                    normalized_countries.append(c)
-
-            filtered = [
-                r for r in filtered
-                if r.get('country') in normalized_countries or
-                   r.get('country_code') in countries
-            ]
-            self.logger.info(f"Filtered to {len(filtered)} resolvers in countries: {', '.join(countries)}")
+            normalized_countries = [COUNTRY_CODE_MAP.get(c.upper(), c) for c in countries]
+            selected = narrow(
+                index.ids_for('country', normalized_countries) | index.ids_for('country_code', countries)
+            )
+            self.logger.info(f"Filtered to {len(selected)} resolvers in countries: {', '.join(countries)}")
 
         # Filter by region
         if regions:
-            region_countries = set()
+            region_ids: Optional[Set[int]] = None
             for region in regions:
-                region_lower = region.lower()
-                if region_lower in REGIONS:
-                    region_countries.update(REGIONS[region_lower])
-                else:
+                ids = self.region_ids.get(region.lower())
+                if ids is None:
                     self.logger.warning(f"Unknown region: {region}")
+                    continue
+                region_ids = ids if region_ids is None else region_ids | ids
+
+            if region_ids is not None:
+                selected = narrow(region_ids)
+                self.logger.info(f"Filtered to {len(selected)} resolvers in regions: {', '.join(regions)}")
 
-            if region_countries:
-                filtered = [r for r in filtered if r.get('country') in region_countries]
-                self.logger.info(f"Filtered to {len(filtered)} resolvers in regions: {', '.join(regions)}")
+        # Filter by continent
+        if continents:
+            selected = narrow(index.ids_for('continent', continents))
+            self.logger.info(f"Filtered to {len(selected)} resolvers in continents: {', '.join(continents)}")
 
         # Filter by tier
         if tiers:
-            filtered = [r for r in filtered if r.get('tier') in tiers]
-            self.logger.info(f"Filtered to {len(filtered)} resolvers in tiers: {', '.join(tiers)}")
+            selected = narrow(index.ids_for('tier', tiers))
+            self.logger.info(f"Filtered to {len(selected)} resolvers in tiers: {', '.join(tiers)}")
 
         # Filter by tags
         if tags:
-            filtered = [
-                r for r in filtered
-                if any(tag in r.get('tags', []) for tag in tags)
-            ]
-            self.logger.info(f"Filtered to {len(filtered)} resolvers with tags: {', '.join(tags)}")
+            selected = narrow(index.ids_for('tags', tags))
+            self.logger.info(f"Filtered to {len(selected)} resolvers with tags: {', '.join(tags)}")
 
-        return filtered
+        return index.select(selected)
+
+    def _new_result(self, resolver_info: Dict, attempt: int = 1) -> QueryResult:
+        """Build an empty query result referencing the resolver's interned metadata."""
+        return QueryResult(self.resolver_table, self.resolver_table.intern(resolver_info), attempt)
 
     def query_resolver(
         self,
@@ -307,7 +350,7 @@ class DNSCacheValidator:
         record_type: str = 'A',
         attempt: int = 1,
         type_id: Optional[int] = None
-    ) -> Dict:
+    ) -> QueryResult:
         """
         Query a single DNS resolver for a domain with retry logic.
 
@@ -318,34 +361,17 @@ class DNSCacheValidator:
             attempt: Current attempt number
 
         Returns:
-            Dict with query results
+            QueryResult (dict-style access; to_dict() for serialization)
         """
         # Apply rate limiting
-        self._apply_rate_limit()
+        self._apply_rate_limit(resolver_info)
 
         resolver = dns.resolver.Resolver()
         resolver.nameservers = [resolver_info['ip']]
         resolver.timeout = self.timeout
         resolver.lifetime = self.timeout
 
-        result = {
-            'resolver_ip': resolver_info['ip'],
-            'country': resolver_info.get('country', 'Unknown'),
-            'country_code': resolver_info.get('country_code', ''),
-            'region': resolver_info.get('region', ''),
-            'continent': resolver_info.get('continent', ''),
-            'provider': resolver_info.get('provider', 'Unknown'),
-            'city': resolver_info.get('city', ''),
-            'tier': resolver_info.get('tier', ''),
-            'tags': resolver_info.get('tags', []),
-            'success': False,
-            'answers': [],
-            'error': None,
-            'response_time': None,
-            'ttl': None,
-            'timestamp': datetime.utcnow().isoformat(),
-            'attempt': attempt
-        }
+        result = self._new_result(resolver_info, attempt)
 
         try:
             start_time = time.time()
@@ -481,8 +507,10 @@ class DNSCacheValidator:
         record_type: str = 'A',
         resolvers: Optional[List[Dict]] = None,
         progress_callback: Optional[callable] = None,
-        type_id: Optional[int] = None
-    ) -> List[Dict]:
+        type_id: Optional[int] = None,
+        engine: Optional[str] = None,
+        analyzer: Optional[StreamingAnalyzer] = None
+    ) -> List[QueryResult]:
         """
         Validate a domain across multiple DNS resolvers.
 
@@ -491,18 +519,28 @@ class DNSCacheValidator:
             record_type: DNS record type
             resolvers: List of resolvers to query (None for all)
             progress_callback: Optional callback for progress updates
+            engine: Query engine override ('threaded' or 'async', None for default)
+            analyzer: Optional StreamingAnalyzer fed with each result as it completes
 
         Returns:
-            List of query results
+            List of compact QueryResult records
         """
         resolvers_to_query = resolvers if resolvers else self.resolvers
+        engine = engine or self.engine
         results = []
 
         self.logger.info(
             f"Querying {len(resolvers_to_query)} DNS resolvers for {domain} "
             f"({record_type} records)"
         )
-        self.logger.info(f"Timeout: {self.timeout}s | Max concurrent: {self.max_workers}")
+        self.logger.info(
+            f"Timeout: {self.timeout}s | Max concurrent: {self.max_workers} | Engine: {engine}"
+        )
+
+        if engine == 'async':
+            return self._validate_domain_scan_async(
+                domain, record_type, resolvers_to_query, progress_callback, type_id, analyzer
+            )
 
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             future_to_resolver = {
@@ -516,171 +554,73 @@ class DNSCacheValidator:
                 results.append(result)
                 completed += 1
 
+                if analyzer:
+                    analyzer.add(result)
+
                 if progress_callback:
                     progress_callback(completed, len(resolvers_to_query))
 
         return results
 
-    def analyze_results(self, results: List[Dict]) -> Dict:
+    def _validate_domain_scan_async(
+        self,
+        domain: str,
+        record_type: str,
+        resolvers_to_query: List[Dict],
+        progress_callback: Optional[callable] = None,
+        type_id: Optional[int] = None,
+        analyzer: Optional[StreamingAnalyzer] = None
+    ) -> List[QueryResult]:
         """
-        Analyze query results and generate comprehensive statistics.
+        Run validate_domain_scan() on the asyncio raw-UDP engine.
 
-        Returns:
-            Dict with detailed analysis data
+        max_workers caps the number of queries in flight instead of threads.
         """
-        analysis = {
-            'total_queries': len(results),
-            'successful': 0,
-            'failed': 0,
-            'by_country': defaultdict(lambda: {
-                'success': 0, 'failed': 0, 'answers': set(), 'avg_response_time': 0,
-                'response_times': []
-            }),
-            'by_region': defaultdict(lambda: {
-                'success': 0, 'failed': 0, 'answers': set()
-            }),
-            'by_continent': defaultdict(lambda: {
-                'success': 0, 'failed': 0, 'answers': set()
-            }),
-            'unique_answers': defaultdict(lambda: {
-                'count': 0,
-                'first_seen': None,
-                'last_seen': None,
-                'resolvers': [],
-                'countries': set()
-            }),
-            'errors': defaultdict(int),
-            'avg_response_time': 0,
-            'median_response_time': 0,
-            'fastest_resolver': None,
-            'slowest_resolver': None,
-            'consistency_score': 0.0,
-            'propagation_lag': None
-        }
-
-        response_times = []
-        answer_timestamps = {}
-
-        for result in results:
-            country = result['country']
-            region = result.get('region', 'Unknown')
-            continent = result.get('continent', 'Unknown')
-
-            if result['success']:
-                analysis['successful'] += 1
-                analysis['by_country'][country]['success'] += 1
-                analysis['by_region'][region]['success'] += 1
-                analysis['by_continent'][continent]['success'] += 1
+        engine = AsyncUDPQueryEngine(
+            timeout=self.timeout,
+            retry_count=self.retry_count,
+            max_in_flight=self.max_workers,
+            socket_count=self.udp_sockets,
+            rate_limiter=self.rate_limiter
+        )
+        results = []
 
-                # Track unique answers with timestamps
-                for answer in result['answers']:
-                    answer_data = analysis['unique_answers'][answer]
-                    answer_data['count'] += 1
-                    answer_data['resolvers'].append(result['resolver_ip'])
-                    answer_data['countries'].add(country)
-
-                    timestamp = datetime.fromisoformat(result['timestamp'])
-                    if answer_data['first_seen'] is None:
-                        answer_data['first_seen'] = timestamp
-                    else:
-                        answer_data['first_seen'] = min(answer_data['first_seen'], timestamp)
-
-                    if answer_data['last_seen'] is None:
-                        answer_data['last_seen'] = timestamp
-                    else:
-                        answer_data['last_seen'] = max(answer_data['last_seen'], timestamp)
-
-                    analysis['by_country'][country]['answers'].add(answer)
-                    analysis['by_region'][region]['answers'].add(answer)
-                    analysis['by_continent'][continent]['answers'].add(answer)
-
-                # Track response times
-                if result['response_time']:
-                    response_times.append(result['response_time'])
-                    analysis['by_country'][country]['response_times'].append(result['response_time'])
-
-                    if not analysis['fastest_resolver'] or \
-                       result['response_time'] < analysis['fastest_resolver']['response_time']:
-                        analysis['fastest_resolver'] = result
-
-                    if not analysis['slowest_resolver'] or \
-                       result['response_time'] > analysis['slowest_resolver']['response_time']:
-                        analysis['slowest_resolver'] = result
-            else:
-                analysis['failed'] += 1
-                analysis['by_country'][country]['failed'] += 1
-                analysis['by_region'][region]['failed'] += 1
-                analysis['by_continent'][continent]['failed'] += 1
-                if result['error']:
-                    analysis['errors'][result['error']] += 1
-
-        # Calculate average and median response times
-        if response_times:
-            analysis['avg_response_time'] = round(sum(response_times) / len(response_times), 2)
-            sorted_times = sorted(response_times)
-            mid = len(sorted_times) // 2
-            if len(sorted_times) % 2 == 0:
-                analysis['median_response_time'] = round(
-                    (sorted_times[mid - 1] + sorted_times[mid]) / 2, 2
-                )
-            else:
-                analysis['median_response_time'] = round(sorted_times[mid], 2)
-
-        # Calculate per-country average response times
-        for country_data in analysis['by_country'].values():
-            if country_data['response_times']:
-                country_data['avg_response_time'] = round(
-                    sum(country_data['response_times']) / len(country_data['response_times']), 2
-                )
+        def on_outcome(index: int, outcome: Dict):
+            result = self._new_result(resolvers_to_query[index], outcome['attempt'])
+            result.update(outcome)
+            results.append(result)
 
-        # Calculate consistency score (0-1, where 1 is perfectly consistent)
-        if analysis['successful'] > 0:
-            most_common_answer_count = max(
-                (data['count'] for data in analysis['unique_answers'].values()),
-                default=0
-            )
-            analysis['consistency_score'] = round(
-                most_common_answer_count / analysis['successful'], 3
-            )
+            if analyzer:
+                analyzer.add(result)
 
-        # Calculate propagation lag
-        if len(analysis['unique_answers']) > 1:
-            timestamps = [
-                (answer, data['first_seen'], data['last_seen'])
-                for answer, data in analysis['unique_answers'].items()
-                if data['first_seen'] and data['last_seen']
-            ]
-            if timestamps:
-                earliest = min(ts[1] for ts in timestamps)
-                latest = max(ts[2] for ts in timestamps)
-                lag = (latest - earliest).total_seconds()
-                analysis['propagation_lag'] = {
-                    'seconds': lag,
-                    'earliest': earliest.isoformat(),
-                    'latest': latest.isoformat(),
-                    'answers': {ts[0]: {'first': ts[1].isoformat(), 'last': ts[2].isoformat()}
-                               for ts in timestamps}
-                }
+            if progress_callback:
+                progress_callback(len(results), len(resolvers_to_query))
 
-        # Convert sets to lists for JSON serialization
-        for country_data in analysis['by_country'].values():
-            country_data['answers'] = list(country_data['answers'])
-            del country_data['response_times']  # Remove raw data
+        query_type = type_id if type_id is not None else record_type
+        engine.query_all(
+            domain,
+            [resolver['ip'] for resolver in resolvers_to_query],
+            query_type,
+            on_outcome,
+            providers=[resolver.get('provider') for resolver in resolvers_to_query]
+        )
 
-        for region_data in analysis['by_region'].values():
-            region_data['answers'] = list(region_data['answers'])
+        return results
 
-        for continent_data in analysis['by_continent'].values():
-            continent_data['answers'] = list(continent_data['answers'])
+    def analyze_results(self, results: List[Dict]) -> Dict:
+        """
+        Analyze query results and generate comprehensive statistics.
 
-        for answer_data in analysis['unique_answers'].values():
-            answer_data['countries'] = list(answer_data['countries'])
-            if answer_data['first_seen']:
-                answer_data['first_seen'] = answer_data['first_seen'].isoformat()
-            if answer_data['last_seen']:
-                answer_data['last_seen'] = answer_data['last_seen'].isoformat()
+        For live analysis during a scan, pass a StreamingAnalyzer to
+        validate_domain_scan() and call its snapshot() instead.
 
-        return analysis
+        Returns:
+            Dict with detailed analysis data
+        """
+        analyzer = StreamingAnalyzer(total_expected=len(results))
+        for result in results:
+            analyzer.add(result)
+        return analyzer.snapshot()
 
     def detect_stale_resolvers(self, results: List[Dict], analysis: Dict) -> List[Dict]:
         """
@@ -709,7 +649,7 @@ class DNSCacheValidator:
                     'resolver_ip': result['resolver_ip'],
                     'provider': result['provider'],
                     'country': result['country'],
-                    'answers': result['answers'],
+                    'answers': list(result['answers']),
                     'timestamp': result['timestamp']
                 })
 
@@ -891,7 +831,7 @@ class DNSCacheValidator:
                 'tool_version': '2.0.0'
             },
             'analysis': analysis,
-            'results': results
+            'results': results_to_dicts(results)
         }
 
         with open(output_file, 'w') as f:
@@ -943,7 +883,7 @@ class DNSCacheValidator:
             'timestamp': datetime.utcnow().isoformat(),
             'domain': domain,
             'record_type': record_type,
-            'results': results,
+            'results': results_to_dicts(results),
             'analysis': analysis,
             'checksum': self._calculate_checksum(results)
         }
@@ -1060,6 +1000,21 @@ def print_progress(completed: int, total: int):
         print()
 
 
+def make_live_progress(analyzer: StreamingAnalyzer):
+    """Build a progress callback that also shows live consistency from the analyzer."""
+    def live_progress(completed: int, total: int):
+        live = analyzer.progress()
+        percentage = (completed / total) * 100
+        print(f'\rProgress: {percentage:5.1f}% ({completed}/{total}) | '
+              f'OK: {live["successful"]} Failed: {live["failed"]} | '
+              f'Answers: {live["unique_answers"]} | '
+              f'Consistency: {live["consistency_score"]:.1%} | '
+              f'Median: {live["median_response_time"]}ms', end='', flush=True)
+        if completed == total:
+            print()
+    return live_progress
+
+
 def validate_config_file(config_file: str) -> Tuple[bool, List[str], Dict]:
     """
     Validate DNS resolver configuration file.
@@ -1195,15 +1150,24 @@ def validate_cli_args(args):
     if args.retry_count > 10:
         errors.append("Retry count should not exceed 10")
 
-    # Validate workers
+    # Validate workers (async engine workers are in-flight queries, not threads)
+    max_workers = 10000 if args.engine == 'async' else 500
     if args.workers <= 0:
         errors.append("Workers must be positive")
-    if args.workers > 500:
-        errors.append("Workers should not exceed 500")
+    if args.workers > max_workers:
+        errors.append(f"Workers should not exceed {max_workers} with the {args.engine} engine")
+
+    # Validate UDP socket pool size
+    if args.udp_sockets <= 0:
+        errors.append("UDP sockets must be positive")
 
-    # Validate rate limit
+    # Validate rate limits
     if args.rate_limit is not None and args.rate_limit <= 0:
         errors.append("Rate limit must be positive")
+    if args.resolver_rate_limit is not None and args.resolver_rate_limit <= 0:
+        errors.append("Per-resolver rate limit must be positive")
+    if args.provider_rate_limit is not None and args.provider_rate_limit <= 0:
+        errors.append("Per-provider rate limit must be positive")
 
     # Validate limit
     if args.limit is not None and args.limit <= 0:
@@ -1259,6 +1223,13 @@ Examples:
   # Production monitoring
   %(prog)s example.com --summary --cache current.json --log-file dns.log
   %(prog)s example.com --region europe --workers 100 --timeout 3 --detailed
+  %(prog)s example.com --engine async --live
+
+  # High-throughput async engine (thousands of probes/sec on one core)
+  %(prog)s example.com --engine async --workers 2000 --udp-sockets 8
+
+  # Stay under public resolver abuse thresholds
+  %(prog)s example.com --rate-limit 500 --resolver-rate-limit 5 --provider-rate-limit 50
 
   # Advanced filtering
   %(prog)s example.com --tier tier1 --region north_america --detailed
@@ -1327,9 +1298,20 @@ Exit Codes:
     # Performance options
     perf_group = parser.add_argument_group('Performance Options')
     perf_group.add_argument('-w', '--workers', type=int, default=50, metavar='N',
-                            help='Maximum concurrent queries (default: 50, max: 500)')
+                            help='Maximum concurrent queries (default: 50, max: 500 with the threaded '
+                                 'engine, 10000 with --engine async)')
     perf_group.add_argument('--rate-limit', type=float, metavar='QPS',
-                            help='Rate limit in queries per second (no limit by default)')
+                            help='Global rate limit in queries per second (no limit by default)')
+    perf_group.add_argument('--resolver-rate-limit', type=float, metavar='QPS',
+                            help='Rate limit per resolver IP in queries per second (no limit by default)')
+    perf_group.add_argument('--provider-rate-limit', type=float, metavar='QPS',
+                            help='Rate limit per provider in queries per second (no limit by default)')
+    perf_group.add_argument('--engine', default='threaded', choices=SCAN_ENGINES,
+                            help='Query engine: threaded (one Resolver per query) or async '
+                                 '(shared raw-UDP sockets; --workers caps queries in flight, '
+                                 'max 10000) (default: threaded)')
+    perf_group.add_argument('--udp-sockets', type=int, default=4, metavar='N',
+                            help='Shared UDP sockets for the async engine (default: 4)')
 
     # Output options
     output_group = parser.add_argument_group('Output Options')
@@ -1341,6 +1323,8 @@ Exit Codes:
     output_mode.add_argument('-d', '--detailed', action='store_true',
                              help='Show detailed results by country (mutually exclusive with --summary)')
 
+    output_group.add_argument('--live', action='store_true',
+                              help='Show live success/consistency/median latency while scanning')
     output_group.add_argument('--show-errors', action='store_true',
                               help='Show error details in detailed view')
     output_group.add_argument('--show-stale', action='store_true',
@@ -1413,7 +1397,11 @@ Exit Codes:
         retry_count=args.retry_count,
         rate_limit=args.rate_limit,
         log_file=args.log_file,
-        log_level=args.log_level
+        log_level=args.log_level,
+        engine=args.engine,
+        udp_sockets=args.udp_sockets,
+        per_resolver_rate_limit=args.resolver_rate_limit,
+        per_provider_rate_limit=args.provider_rate_limit
     )
 
     # Get type_id if provided
@@ -1468,21 +1456,23 @@ Exit Codes:
                 display_type = f"Type ID {type_id}" if type_id else f"{args.record_type} records"
                 print(f"\nQuerying {len(filtered_resolvers)} DNS resolvers for {domain} "
                       f"({display_type})...")
-                print(f"Timeout: {args.timeout}s | Max concurrent: {args.workers}")
+                print(f"Timeout: {args.timeout}s | Max concurrent: {args.workers} | Engine: {args.engine}")
                 print("-" * 80)
 
+                analyzer = StreamingAnalyzer(total_expected=len(filtered_resolvers))
                 results = validator.validate_domain_scan(
                     domain,
                     args.record_type,
                     filtered_resolvers,
-                    progress_callback=print_progress,
-                    type_id=type_id
+                    progress_callback=make_live_progress(analyzer) if args.live else print_progress,
+                    type_id=type_id,
+                    analyzer=analyzer
                 )
 
                 print("-" * 80)
 
-                # Analyze results
-                analysis = validator.analyze_results(results)
+                # Analysis was built incrementally while results arrived
+                analysis = analyzer.snapshot()
 
                 # Print summary
                 output_mode = 'summary' if args.summary else 'default'
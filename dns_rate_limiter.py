@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Token-bucket rate limiting for DNS query engines
+Provides a thread-safe limiter with a global budget plus per-resolver and
+per-provider budgets, usable from both threaded and asyncio callers.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+
+class TokenBucket:
+    """Thread-safe token bucket using reservations.
+
+    Callers reserve a token under the lock and are told how long to wait
+    before using it, so sleeping never happens while the lock is held and
+    concurrent callers are spaced out exactly at the configured rate.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Refill rate in tokens per second
+            burst: Bucket capacity (defaults to one second worth of tokens, min 1)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = float(rate)
+        self.capacity = float(burst) if burst else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Reserve tokens, allowing the balance to go negative.
+
+        Returns:
+            Seconds the caller must wait before the reservation is usable
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= tokens
+
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class RateLimiter:
+    """Composite limiter with global, per-resolver and per-provider buckets."""
+
+    def __init__(
+        self,
+        global_qps: Optional[float] = None,
+        per_resolver_qps: Optional[float] = None,
+        per_provider_qps: Optional[float] = None,
+        burst: Optional[float] = None
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            global_qps: Total queries per second across all resolvers (None for unlimited)
+            per_resolver_qps: Queries per second to any single resolver IP (None for unlimited)
+            per_provider_qps: Queries per second to any single provider (None for unlimited)
+            burst: Bucket capacity for every bucket (None for one second worth)
+        """
+        self.global_qps = global_qps
+        self.per_resolver_qps = per_resolver_qps
+        self.per_provider_qps = per_provider_qps
+        self.burst = burst
+
+        self.global_bucket = TokenBucket(global_qps, burst) if global_qps else None
+        self.resolver_buckets: Dict[str, TokenBucket] = {}
+        self.provider_buckets: Dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """True if any limit is configured."""
+        return bool(self.global_qps or self.per_resolver_qps or self.per_provider_qps)
+
+    def _bucket(self, buckets: Dict[str, TokenBucket], key: str, rate: float) -> TokenBucket:
+        """Return the bucket for a key, creating it on first use."""
+        bucket = buckets.get(key)
+        if bucket is None:
+            with self._buckets_lock:
+                bucket = buckets.get(key)
+                if bucket is None:
+                    bucket = buckets[key] = TokenBucket(rate, self.burst)
+        return bucket
+
+    def reserve(self, resolver_ip: Optional[str] = None, provider: Optional[str] = None) -> float:
+        """
+        Reserve one query against every applicable bucket.
+
+        Args:
+            resolver_ip: Resolver the query is sent to
+            provider: Provider operating the resolver
+
+        Returns:
+            Seconds to wait before sending the query
+        """
+        delay = 0.0
+
+        if self.global_bucket:
+            delay = max(delay, self.global_bucket.reserve())
+
+        if self.per_resolver_qps and resolver_ip:
+            bucket = self._bucket(self.resolver_buckets, resolver_ip, self.per_resolver_qps)
+            delay = max(delay, bucket.reserve())
+
+        if self.per_provider_qps and provider:
+            bucket = self._bucket(self.provider_buckets, provider, self.per_provider_qps)
+            delay = max(delay, bucket.reserve())
+
+        return delay
+
+    def acquire(self, resolver_ip: Optional[str] = None, provider: Optional[str] = None):
+        """Block the calling thread until a query may be sent."""
+        if not self.enabled:
+            return
+
+        delay = self.reserve(resolver_ip, provider)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, resolver_ip: Optional[str] = None, provider: Optional[str] = None):
+        """Suspend the calling coroutine until a query may be sent."""
+        if not self.enabled:
+            return
+
+        delay = self.reserve(resolver_ip, provider)
+        if delay > 0:
+            await asyncio.sleep(delay)
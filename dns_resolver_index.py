@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Inverted resolver index for the DNS Cache Validator
+Maps resolver attributes (country, country_code, region, continent, tier,
+tag) to sets of resolver ids (positions in the resolver list) so filters are
+answered by set union/intersection instead of rescanning every resolver.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set
+
+
+# Resolver fields indexed by exact value
+INDEXED_FIELDS = ('country', 'country_code', 'region', 'continent', 'tier')
+
+
+class ResolverIndex:
+    """Attribute -> resolver id sets, built once per resolver list."""
+
+    def __init__(self, resolvers: List[Dict]):
+        """
+        Build the index.
+
+        Args:
+            resolvers: Resolver dicts; ids are their positions in this list
+        """
+        self.resolvers = resolvers
+        self.fields: Dict[str, Dict[str, Set[int]]] = {field: {} for field in INDEXED_FIELDS}
+        self.tags: Dict[str, Set[int]] = {}
+
+        for resolver_id, resolver in enumerate(resolvers):
+            for field in INDEXED_FIELDS:
+                value = resolver.get(field)
+                if value is not None:
+                    self.fields[field].setdefault(value, set()).add(resolver_id)
+            for tag in resolver.get('tags', []):
+                self.tags.setdefault(tag, set()).add(resolver_id)
+
+    def __len__(self):
+        return len(self.resolvers)
+
+    def ids_for(self, field: str, values: Iterable[str]) -> Set[int]:
+        """Union of resolver ids whose field equals any of the values."""
+        index = self.tags if field == 'tags' else self.fields[field]
+        ids: Set[int] = set()
+        for value in values:
+            ids.update(index.get(value, ()))
+        return ids
+
+    def select(self, ids: Optional[Set[int]]) -> List[Dict]:
+        """Resolvers for a set of ids in original list order (all resolvers for None)."""
+        if ids is None:
+            return self.resolvers.copy()
+        return [self.resolvers[resolver_id] for resolver_id in sorted(ids)]
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Streaming result analysis for the DNS Cache Validator
+Aggregates query results incrementally as they complete, so partial analyses
+are available mid-scan and large sweeps never have to be buffered.
+"""
+
+import copy
+import math
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class LatencySketch:
+    """Streaming quantile sketch for response times.
+
+    Values are kept exactly up to exact_limit samples (so small scans report
+    exact medians). Beyond that they collapse into logarithmic buckets with
+    bounded relative error, giving O(log range) memory for any number of
+    samples.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, exact_limit: int = 1024):
+        """
+        Initialize the sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of reported quantiles once bucketed
+            exact_limit: Number of samples kept exactly before switching to buckets
+        """
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.exact_limit = exact_limit
+
+        self.exact: Optional[List[float]] = []
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _bucket_index(self, value: float) -> int:
+        return math.ceil(math.log(max(value, 1e-9)) / self.log_gamma)
+
+    def _bucket_value(self, index: int) -> float:
+        # Midpoint (in relative terms) of the bucket's (gamma^(i-1), gamma^i] range
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def add(self, value: float):
+        """Add one sample."""
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+        if self.exact is not None:
+            self.exact.append(value)
+            if len(self.exact) > self.exact_limit:
+                for exact_value in self.exact:
+                    index = self._bucket_index(exact_value)
+                    self.buckets[index] = self.buckets.get(index, 0) + 1
+                self.exact = None
+            return
+
+        index = self._bucket_index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the q-quantile (0 <= q <= 1).
+
+        Exact (with midpoint interpolation for the median) while samples are
+        still held exactly, within relative_accuracy afterwards.
+        """
+        if not self.count:
+            return 0.0
+
+        if self.exact is not None:
+            ordered = sorted(self.exact)
+            position = q * (len(ordered) - 1)
+            lower = int(math.floor(position))
+            upper = int(math.ceil(position))
+            return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+
+def _copy_result(result):
+    """Detach a stored result from the scan (compact records become plain dicts)."""
+    if result is None:
+        return None
+    if hasattr(result, 'to_dict'):
+        return result.to_dict()
+    return copy.copy(result)
+
+
+def _location_stats() -> Dict:
+    return {'success': 0, 'failed': 0, 'answers': set()}
+
+
+class StreamingAnalyzer:
+    """Incremental equivalent of DNSCacheValidator.analyze_results().
+
+    Thread-safe: results may be added from the scan thread (or event loop)
+    while another thread takes snapshots.
+    """
+
+    def __init__(self, total_expected: Optional[int] = None):
+        """
+        Initialize the analyzer.
+
+        Args:
+            total_expected: Number of results the scan will produce (for progress reporting)
+        """
+        self.total_expected = total_expected
+        self.lock = threading.Lock()
+
+        self.total_queries = 0
+        self.successful = 0
+        self.failed = 0
+        self.by_country: Dict[str, Dict] = {}
+        self.by_region: Dict[str, Dict] = {}
+        self.by_continent: Dict[str, Dict] = {}
+        self.unique_answers: Dict[str, Dict] = {}
+        self.errors: Dict[str, int] = {}
+        self.latency = LatencySketch()
+        self.country_latency: Dict[str, List[float]] = {}  # [sum, count] per country
+        self.fastest_resolver = None
+        self.slowest_resolver = None
+        self.most_common_count = 0
+
+    def add(self, result: Dict):
+        """Fold one query result into the running analysis."""
+        country = result['country']
+        region = result.get('region', 'Unknown')
+        continent = result.get('continent', 'Unknown')
+
+        with self.lock:
+            self.total_queries += 1
+
+            country_data = self.by_country.get(country)
+            if country_data is None:
+                country_data = self.by_country[country] = _location_stats()
+            region_data = self.by_region.get(region)
+            if region_data is None:
+                region_data = self.by_region[region] = _location_stats()
+            continent_data = self.by_continent.get(continent)
+            if continent_data is None:
+                continent_data = self.by_continent[continent] = _location_stats()
+
+            if not result['success']:
+                self.failed += 1
+                country_data['failed'] += 1
+                region_data['failed'] += 1
+                continent_data['failed'] += 1
+                if result['error']:
+                    self.errors[result['error']] = self.errors.get(result['error'], 0) + 1
+                return
+
+            self.successful += 1
+            country_data['success'] += 1
+            region_data['success'] += 1
+            continent_data['success'] += 1
+
+            # ISO-8601 timestamps from the same clock order correctly as strings
+            timestamp = result['timestamp']
+            for answer in result['answers']:
+                answer_data = self.unique_answers.get(answer)
+                if answer_data is None:
+                    answer_data = self.unique_answers[answer] = {
+                        'count': 0,
+                        'first_seen': timestamp,
+                        'last_seen': timestamp,
+                        'resolvers': [],
+                        'countries': set()
+                    }
+                answer_data['count'] += 1
+                answer_data['resolvers'].append(result['resolver_ip'])
+                answer_data['countries'].add(country)
+                if timestamp < answer_data['first_seen']:
+                    answer_data['first_seen'] = timestamp
+                if timestamp > answer_data['last_seen']:
+                    answer_data['last_seen'] = timestamp
+                self.most_common_count = max(self.most_common_count, answer_data['count'])
+
+                country_data['answers'].add(answer)
+                region_data['answers'].add(answer)
+                continent_data['answers'].add(answer)
+
+            # Track response times
+            response_time = result['response_time']
+            if response_time:
+                self.latency.add(response_time)
+                country_latency = self.country_latency.setdefault(country, [0.0, 0])
+                country_latency[0] += response_time
+                country_latency[1] += 1
+
+                if not self.fastest_resolver or response_time < self.fastest_resolver['response_time']:
+                    self.fastest_resolver = result
+                if not self.slowest_resolver or response_time > self.slowest_resolver['response_time']:
+                    self.slowest_resolver = result
+
+    def consistency_score(self) -> float:
+        """Share of successful queries that returned the most common answer."""
+        if not self.successful:
+            return 0.0
+        return round(self.most_common_count / self.successful, 3)
+
+    def progress(self) -> Dict:
+        """Cheap O(1) live summary for progress reporting mid-scan."""
+        with self.lock:
+            return {
+                'completed': self.total_queries,
+                'total': self.total_expected,
+                'successful': self.successful,
+                'failed': self.failed,
+                'unique_answers': len(self.unique_answers),
+                'consistency_score': self.consistency_score(),
+                'median_response_time': round(self.latency.quantile(0.5), 2)
+            }
+
+    def snapshot(self) -> Dict:
+        """
+        Build a full analysis from the results seen so far.
+
+        Returns:
+            Dict in the same format as DNSCacheValidator.analyze_results()
+        """
+        with self.lock:
+            analysis = {
+                'total_queries': self.total_queries,
+                'successful': self.successful,
+                'failed': self.failed,
+                'by_country': {},
+                'by_region': {},
+                'by_continent': {},
+                'unique_answers': {},
+                'errors': dict(self.errors),
+                'avg_response_time': 0,
+                'median_response_time': 0,
+                'fastest_resolver': _copy_result(self.fastest_resolver),
+                'slowest_resolver': _copy_result(self.slowest_resolver),
+                'consistency_score': self.consistency_score(),
+                'propagation_lag': None
+            }
+
+            if self.latency.count:
+                analysis['avg_response_time'] = round(self.latency.mean, 2)
+                analysis['median_response_time'] = round(self.latency.quantile(0.5), 2)
+
+            for country, data in self.by_country.items():
+                latency_sum, latency_count = self.country_latency.get(country, (0.0, 0))
+                analysis['by_country'][country] = {
+                    'success': data['success'],
+                    'failed': data['failed'],
+                    'answers': list(data['answers']),
+                    'avg_response_time': round(latency_sum / latency_count, 2) if latency_count else 0
+                }
+
+            for source, target in ((self.by_region, analysis['by_region']),
+                                   (self.by_continent, analysis['by_continent'])):
+                for key, data in source.items():
+                    target[key] = {
+                        'success': data['success'],
+                        'failed': data['failed'],
+                        'answers': list(data['answers'])
+                    }
+
+            for answer, data in self.unique_answers.items():
+                analysis['unique_answers'][answer] = {
+                    'count': data['count'],
+                    'first_seen': data['first_seen'],
+                    'last_seen': data['last_seen'],
+                    'resolvers': list(data['resolvers']),
+                    'countries': list(data['countries'])
+                }
+
+        # Calculate propagation lag (only the two extremes need parsing)
+        if len(analysis['unique_answers']) > 1:
+            answers = analysis['unique_answers']
+            earliest = min(data['first_seen'] for data in answers.values())
+            latest = max(data['last_seen'] for data in answers.values())
+            lag = (datetime.fromisoformat(latest) - datetime.fromisoformat(earliest)).total_seconds()
+            analysis['propagation_lag'] = {
+                'seconds': lag,
+                'earliest': earliest,
+                'latest': latest,
+                'answers': {answer: {'first': data['first_seen'], 'last': data['last_seen']}
+                            for answer, data in answers.items()}
+            }
+
+        return analysis
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Compact query result records for the DNS Cache Validator
+Each result stores only its per-query fields in __slots__ and refers to the
+resolver's metadata (country, provider, tags, ...) by index into a shared,
+interned resolver table. Results are converted to plain dicts only when they
+are serialized.
+"""
+
+import sys
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+
+# Resolver metadata fields and their defaults, in result dict order
+RESOLVER_FIELDS = (
+    ('resolver_ip', None),
+    ('country', 'Unknown'),
+    ('country_code', ''),
+    ('region', ''),
+    ('continent', ''),
+    ('provider', 'Unknown'),
+    ('city', ''),
+    ('tier', ''),
+    ('tags', ()),
+)
+
+# Per-query fields stored on each record
+QUERY_FIELDS = ('success', 'answers', 'error', 'response_time', 'ttl', 'timestamp', 'attempt')
+
+RESULT_FIELDS = tuple(name for name, _ in RESOLVER_FIELDS) + QUERY_FIELDS
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class ResolverTable:
+    """Interned resolver metadata shared by all results of a validator."""
+
+    def __init__(self):
+        self.entries: List[tuple] = []
+        self._index_by_id: Dict[int, int] = {}
+        self._sources: List[Dict] = []  # keeps source dicts alive so their id()s stay unique
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def intern(self, resolver_info: Dict) -> int:
+        """
+        Return the table index for a resolver config dict, adding it on first use.
+
+        Args:
+            resolver_info: Resolver dict as loaded from the config file
+
+        Returns:
+            Index into the table
+        """
+        index = self._index_by_id.get(id(resolver_info))
+        if index is not None:
+            return index
+
+        with self._lock:
+            index = self._index_by_id.get(id(resolver_info))
+            if index is None:
+                index = self._add(resolver_info)
+        return index
+
+    def _add(self, resolver_info: Dict) -> int:
+        entry = []
+        for name, default in RESOLVER_FIELDS:
+            value = resolver_info['ip'] if name == 'resolver_ip' else resolver_info.get(name, default)
+            if name == 'tags':
+                value = tuple(_intern(tag) for tag in value)
+            entry.append(_intern(value))
+
+        index = len(self.entries)
+        self.entries.append(tuple(entry))
+        self._sources.append(resolver_info)
+        self._index_by_id[id(resolver_info)] = index
+        return index
+
+    def extend(self, resolvers: Iterable[Dict]):
+        """Intern every resolver in a list."""
+        for resolver_info in resolvers:
+            self.intern(resolver_info)
+
+
+_RESOLVER_FIELD_INDEX = {name: i for i, (name, _) in enumerate(RESOLVER_FIELDS)}
+
+
+class QueryResult:
+    """Slotted result of one resolver query with dict-style read/write access.
+
+    Reads of 'answers' and 'tags' return tuples; to_dict() turns them back
+    into lists for serialization.
+    """
+
+    __slots__ = ('table', 'resolver_index') + QUERY_FIELDS
+
+    def __init__(self, table: ResolverTable, resolver_index: int, attempt: int = 1,
+                 timestamp: Optional[str] = None):
+        self.table = table
+        self.resolver_index = resolver_index
+        self.success = False
+        self.answers = ()
+        self.error = None
+        self.response_time = None
+        self.ttl = None
+        self.timestamp = timestamp or datetime.utcnow().isoformat()
+        self.attempt = attempt
+
+    def __getitem__(self, key: str):
+        field_index = _RESOLVER_FIELD_INDEX.get(key)
+        if field_index is not None:
+            return self.table.entries[self.resolver_index][field_index]
+        if key in QUERY_FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value):
+        if key not in QUERY_FIELDS:
+            raise KeyError(f"{key} is resolver metadata or unknown and cannot be set on a result")
+        if key == 'answers':
+            value = tuple(value)
+        setattr(self, key, value)
+
+    def __contains__(self, key) -> bool:
+        return key in RESULT_FIELDS
+
+    def __iter__(self):
+        return iter(RESULT_FIELDS)
+
+    def __repr__(self):
+        return f"QueryResult({self.to_dict()!r})"
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return RESULT_FIELDS
+
+    def update(self, values: Dict):
+        for key, value in values.items():
+            self[key] = value
+
+    def to_dict(self) -> Dict:
+        """Expand to the classic 16-key result dict (serialization boundary only)."""
+        result = {key: self[key] for key in RESULT_FIELDS}
+        result['tags'] = list(result['tags'])
+        result['answers'] = list(result['answers'])
+        return result
+
+
+def results_to_dicts(results: Iterable) -> List[Dict]:
+    """Convert QueryResult records (or already-plain dicts) to dicts for JSON output."""
+    return [result.to_dict() if isinstance(result, QueryResult) else result for result in results]